@@ -5,14 +5,19 @@ from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from config import Config
 from flask_cors import CORS
+from .routing import RoutingSession
 
-db = SQLAlchemy()
+# Los SELECT de requests GET van a las réplicas configuradas (ver app/routing.py)
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
 jwt = JWTManager()
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    # orjson cuando está instalado, con la misma salida que el json de la stdlib
+    from .json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
     CORS(app, resources={r"/api/*": {"origins": "*"}})
 
     # Inicializar extensiones
@@ -20,8 +25,55 @@ def create_app():
     migrate.init_app(app, db)
     jwt.init_app(app)
 
+    # Métricas Prometheus (/api/metrics): latencia por ruta, consultas SQL y bcrypt
+    from .metrics import metrics
+    metrics.init_app(app)
+
+    # Presupuesto de consultas por vista, detector de N+1 y log de consultas lentas
+    from .querywatch import querywatch
+    querywatch.init_app(app)
+
+    # Hashing bcrypt en un pool acotado (costo configurable con BCRYPT_ROUNDS)
+    from .passwords import passwords
+    passwords.init_app(app)
+
+    # Rate limiting de login/registro (token bucket por IP y por email)
+    from .ratelimit import ratelimit
+    ratelimit.init_app(app)
+
+    # Caché de respuestas públicas (se invalida al confirmar cada commit)
+    from .cache import cache
+    cache.init_app(app)
+
+    # Revocación de JWT al cambiar role/is_active (sin consulta por request)
+    from .revocation import revocation
+    revocation.init_app(app)
+
+    # Caché de usuarios por id para los endpoints autenticados
+    from .identity import users
+    users.init_app(app)
+
+    # Compresión gzip/br negociada con Accept-Encoding
+    from .compression import compression
+    compression.init_app(app)
+
+    # Búsqueda de texto (FULLTEXT en MySQL, índice en memoria en desarrollo)
+    from .search import search_index
+    search_index.init_app(app)
+
+    # Contadores materializados de /api/stats (registra los listeners)
+    from . import stats
+
     # Registrar rutas (importa después de init para evitar ciclos)
     from .routes import register_routes
     register_routes(app)
 
+    # Token y roles por endpoint (tabla de app/authz.py, validada contra las rutas)
+    from .authz import authz
+    authz.init_app(app)
+
+    # Comandos de mantenimiento (flask <comando>)
+    from .commands import register_commands
+    register_commands(app)
+
     return app
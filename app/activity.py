@@ -0,0 +1,162 @@
+# app/activity.py
+"""
+Actividad por post: comment_count (comentarios visibles) y last_comment_at
+(fecha del último comentario visible), guardados en la fila del post para
+mostrarlos y ordenar el feed (?sort=activity|comments) sin COUNT/MAX sobre
+comentarios.
+
+Se mantienen con listeners de mapper sobre la conexión del flush (como los
+contadores de app/stats.py), así que el post se actualiza en la misma
+transacción que el comentario que lo cambia: altas, bajas (también en cascada
+al borrar un Post o un Usuario), cambios de is_visible y de post_id. Los
+inserts Core en lote llaman a record_bulk_comments y `flask comments-reconcile`
+recalcula todo desde las tablas (reconcile).
+
+Los UPDATE no tocan posts.updated_at: un comentario nuevo no es un cambio del
+post para la sincronización incremental ni para su Last-Modified.
+"""
+from flask import request
+from sqlalchemy import case, event, func, inspect, or_
+from sqlalchemy.orm import Session, object_session
+
+from app import db
+from app.models import Post, Comentario
+from app.pagination import Keyset
+
+posts = Post.__table__
+comentarios = Comentario.__table__
+
+# ?sort= del feed -> keyset (cada uno con su índice: ix_posts_published_*)
+POST_SORTS = {
+    "recent": Keyset(Post.fecha_creacion, Post.id, descending=True),
+    "activity": Keyset(Post.last_comment_at, Post.id, descending=True, nullable=True),  # sin comentarios al final
+    "comments": Keyset(Post.comment_count, Post.id, descending=True),
+}
+
+# Campos de ?fields= que cambian con cada comentario
+ACTIVITY_FIELDS = {"comment_count", "last_comment_at"}
+
+
+class InvalidSort(ValueError):
+    """Se pidió un ?sort= que el feed no tiene."""
+
+
+def parse_sort() -> Keyset:
+    sort = request.args.get("sort", "recent")
+    if sort not in POST_SORTS:
+        raise InvalidSort(f"sort inválido: {sort} (opciones: {', '.join(POST_SORTS)})")
+    return POST_SORTS[sort]
+
+
+def activity_cache_tags(**kwargs):
+    """Tags para @cache.cached: ordenar o mostrar la actividad hace depender la respuesta de los comentarios."""
+    campos = {f.strip() for f in request.args.get("fields", "").split(",")}
+    if request.args.get("sort") in ("activity", "comments") or campos & ACTIVITY_FIELDS:
+        return ["comments"]
+    return []
+
+
+# =========================
+#        Escritura
+# =========================
+def _ultimo_visible(post_id):
+    """MAX(fecha_creacion) de los comentarios visibles (índice ix_comentarios_post_visible_fecha)."""
+    return (db.select(func.max(comentarios.c.fecha_creacion))
+            .where(comentarios.c.post_id == post_id, comentarios.c.is_visible == True)
+            .scalar_subquery())
+
+
+def _sumar(connection, post_id, delta: int, fecha=None):
+    """
+    comment_count += delta. En un alta last_comment_at sube a fecha si es
+    posterior; en una baja se recalcula (el comentario borrado pudo ser el último).
+    """
+    if delta > 0:
+        last = posts.c.last_comment_at if fecha is None else case(
+            (or_(posts.c.last_comment_at.is_(None), posts.c.last_comment_at < fecha), fecha),
+            else_=posts.c.last_comment_at)
+    else:
+        last = _ultimo_visible(post_id)
+    connection.execute(posts.update().where(posts.c.id == post_id).values(
+        comment_count=posts.c.comment_count + delta, last_comment_at=last,
+        updated_at=posts.c.updated_at,   # sin el onupdate de la columna
+    ))
+
+
+@event.listens_for(Session, "before_flush")
+def _posts_borrados(session, flush_context, instances):
+    # Session.delete ya aplicó la cascada: acá están el post y sus comentarios
+    session.info["posts_borrados"] = {p.id for p in session.deleted if isinstance(p, Post)}
+
+
+@event.listens_for(Comentario.is_visible, "set", active_history=True)
+@event.listens_for(Comentario.post_id, "set", active_history=True)
+def _cargar_anterior(target, value, oldvalue, initiator):
+    # active_history: el valor anterior queda en la historia aunque estuviera expirado
+    pass
+
+
+@event.listens_for(Comentario, "after_insert")
+def _on_insert(mapper, connection, target):
+    if target.is_visible:
+        _sumar(connection, target.post_id, +1, target.fecha_creacion)
+
+
+@event.listens_for(Comentario, "after_delete")
+def _on_delete(mapper, connection, target):
+    session = object_session(target)
+    if session is not None and target.post_id in session.info.get("posts_borrados", ()):
+        return   # el post se borra en el mismo flush
+    if target.is_visible:
+        _sumar(connection, target.post_id, -1)
+
+
+@event.listens_for(Comentario, "after_update")
+def _on_update(mapper, connection, target):
+    attrs = inspect(target).attrs
+    visible, post_id = attrs.is_visible.history, attrs.post_id.history
+    if not (visible.has_changes() or post_id.has_changes() or attrs.fecha_creacion.history.has_changes()):
+        return
+    antes_visible = visible.deleted[0] if visible.deleted else target.is_visible
+    antes_post = post_id.deleted[0] if post_id.deleted else target.post_id
+    if antes_visible:
+        _sumar(connection, antes_post, -1)
+    if target.is_visible:
+        _sumar(connection, target.post_id, +1, target.fecha_creacion)
+
+
+def record_bulk_comments(post_id: int, rows):
+    """Equivalente a after_insert para los inserts Core en lote (app/bulk.py)."""
+    visibles = [r for r in rows if r.get("is_visible", True)]
+    if visibles:
+        fecha = max((r["fecha_creacion"] for r in visibles if r.get("fecha_creacion")), default=None)
+        _sumar(db.session.connection(), post_id, len(visibles), fecha)
+
+
+# =========================
+#      Reconciliación
+# =========================
+def reconcile(batch: int = 10000) -> int:
+    """
+    Recalcula comment_count y last_comment_at de todos los posts desde
+    comentarios, por rangos de id (una transacción por rango). Devuelve
+    cuántos posts estaban desfasados.
+    """
+    count = (db.select(func.count()).select_from(comentarios)
+             .where(comentarios.c.post_id == posts.c.id, comentarios.c.is_visible == True)
+             .scalar_subquery())
+    last = _ultimo_visible(posts.c.id)
+    corregidos = 0
+    desde = db.session.scalar(db.select(func.min(posts.c.id)))
+    hasta = db.session.scalar(db.select(func.max(posts.c.id)))
+    while desde is not None and desde <= hasta:
+        result = db.session.execute(
+            posts.update()
+            .where(posts.c.id >= desde, posts.c.id < desde + batch,
+                   or_(posts.c.comment_count != count, posts.c.last_comment_at.is_distinct_from(last)))
+            .values(comment_count=count, last_comment_at=last, updated_at=posts.c.updated_at)
+        )
+        db.session.commit()
+        corregidos += result.rowcount
+        desde += batch
+    return corregidos
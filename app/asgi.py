@@ -0,0 +1,202 @@
+# app/asgi.py
+"""
+Modo ASGI para el tráfico público de lectura (uvicorn asgi:app).
+
+Los GET de posts, detalle de post, comentarios y categorías se resuelven en el
+event loop con el motor asyncio de SQLAlchemy (una conexión por consulta, sin
+hilo de worker bloqueado mientras espera a la base o a un cliente lento).
+Responden con los mismos ETag/Last-Modified que las vistas (y 304 ante
+If-None-Match, sin serializar). Todo lo demás, y cualquier caso que no sea el
+200 público (errores de validación, 404, borradores que requieren JWT,
+?include=, ?updated_since=, ?fields=, un ?sort= inválido), se delega a la app
+Flask de siempre a través de WsgiToAsgi: la autenticación y los mensajes de
+error son exactamente los mismos porque los resuelve el mismo código.
+
+Reutiliza los modelos, los encoders de app/serializers.py, el keyset de
+app/pagination.py y el proveedor JSON de Flask, así que el cuerpo de la
+respuesta es byte a byte igual al de la vista WSGI.
+
+Requiere `asgiref`, un servidor ASGI (`uvicorn`) y el driver async del motor
+(`aiomysql` para MySQL, `aiosqlite` para SQLite).
+"""
+import random
+import re
+import time
+from urllib.parse import parse_qs
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from config import engine_options
+from app import db
+from app.compression import compression, encoded_etag
+from app.conditional import last_modified, matched, rows_etag, validator_headers
+from app.metrics import metrics
+from app.models import Post, Comentario, Categoria, post_categoria
+from app.pagination import InvalidCursor, page_response, parse_limit
+from app.serializers import post_encoder, comentario_encoder, categoria_encoder
+from app.activity import POST_SORTS
+
+# driver sync -> driver async
+ASYNC_DRIVERS = {
+    "mysql+pymysql": "mysql+aiomysql",
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_url(url: str) -> str:
+    scheme, sep, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+
+class AsyncReadApp:
+    """App ASGI: lecturas públicas async y el resto delegado a la app Flask."""
+
+    def __init__(self, flask_app):
+        from asgiref.wsgi import WsgiToAsgi  # dependencia opcional (solo modo ASGI)
+
+        self.flask_app = flask_app
+        self.wsgi = WsgiToAsgi(flask_app)
+        config = flask_app.config
+        # Las lecturas van a las réplicas si hay (igual que RoutingSession en WSGI)
+        urls = config.get("DATABASE_REPLICA_URLS") or [config["SQLALCHEMY_DATABASE_URI"]]
+        self.engines = [create_async_engine(async_url(u), **engine_options(u)) for u in urls]
+        # (regex, regla de Flask para las métricas, handler)
+        self.routes = [
+            (re.compile(r"/api/posts"), "/api/posts", self.post_list),
+            (re.compile(r"/api/posts/(\d+)"), "/api/posts/<int:post_id>", self.post_detail),
+            (re.compile(r"/api/posts/(\d+)/comments"), "/api/posts/<int:post_id>/comments", self.comment_list),
+            (re.compile(r"/api/categories"), "/api/categories", self.category_list),
+        ]
+
+    # ---- ASGI ----
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+        if scope["type"] == "http" and scope["method"] == "GET":
+            for pattern, rule, handler in self.routes:
+                m = pattern.fullmatch(scope["path"])
+                if m:
+                    start = time.perf_counter()
+                    query = parse_qs(scope["query_string"].decode("latin-1"), keep_blank_values=True)
+                    args = {k: v[0] for k, v in query.items()}
+                    result = await handler(args, *map(int, m.groups()))
+                    if result is not None:
+                        status = await self._send_json(scope, send, *result)
+                        metrics.request_latency.observe(time.perf_counter() - start, rule, "GET")
+                        metrics.requests.inc(1, rule, "GET", status)
+                        return
+                    break
+        await self.wsgi(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                for engine in self.engines:
+                    await engine.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _send_json(self, scope, send, build, rows, *extra):
+        """Igual que conditional_json (+ compresión): 304 sin llamar a build() o el JSON con validadores."""
+        request_headers = dict(scope["headers"])
+        etag = rows_etag(rows, *extra)
+        modified = last_modified(getattr(r, "updated_at", None) for r in rows)
+        tag = matched(request_headers.get(b"if-none-match", b"").decode("latin-1"), etag)
+        vary = [b"Accept-Encoding"]
+        if tag is not None:
+            # werkzeug quita Last-Modified (header de entidad) de los 304: igual acá
+            status, body = 304, b""
+            headers = [(b"etag", f'"{tag}"'.encode())]
+        else:
+            with self.flask_app.app_context():
+                body = self.flask_app.json.response(build()).get_data()
+            status = 200
+            validators = validator_headers(etag, modified)
+            coding = None
+            if len(body) >= compression.min_size:
+                coding = compression.negotiate(request_headers.get(b"accept-encoding", b"").decode("latin-1"))
+            headers = [(b"content-type", b"application/json")]
+            if coding is not None:
+                body = compression.compress(body, coding)
+                validators["ETag"] = encoded_etag(validators["ETag"], coding)
+                headers.append((b"content-encoding", coding.encode()))
+            headers.append((b"content-length", str(len(body)).encode()))
+            headers += [(k.lower().encode(), v.encode()) for k, v in validators.items()]
+        origin = request_headers.get(b"origin")
+        # mismo criterio que flask-cors con origins="*"
+        if origin:
+            headers.append((b"access-control-allow-origin", origin))
+            vary.append(b"Origin")
+        else:
+            headers.append((b"access-control-allow-origin", b"*"))
+        headers.append((b"vary", b", ".join(vary)))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+        return status
+
+    async def _fetch(self, stmt):
+        async with random.choice(self.engines).connect() as conn:
+            return (await conn.execute(stmt)).all()
+
+    # ---- Handlers: devuelven (build, filas, *extra) como conditional_json o None para delegar en Flask ----
+    async def post_list(self, args):
+        category = args.get("category")
+        keyset = POST_SORTS.get(args.get("sort", "recent"))
+        if {"include", "updated_since", "fields"} & args.keys() or keyset is None \
+                or (category is not None and not (category.isascii() and category.isdigit())):
+            return None
+        try:
+            limit = parse_limit(args, self.flask_app.config)
+            stmt = post_encoder.select(*keyset.columns).where(Post.is_published == True)
+            if category is not None:
+                stmt = stmt.join(post_categoria, post_categoria.c.post_id == Post.id)\
+                           .where(post_categoria.c.categoria_id == int(category))
+            stmt = keyset.apply(stmt, limit, args.get("cursor"))
+        except InvalidCursor:
+            return None
+        items, next_cursor = keyset.split(await self._fetch(stmt), limit)
+        return lambda: page_response(post_encoder.dump_many(items), next_cursor), items, next_cursor, post_encoder.names
+
+    async def post_detail(self, args, post_id):
+        if {"include", "fields"} & args.keys():
+            return None
+        rows = await self._fetch(post_encoder.select().where(Post.id == post_id, Post.is_published == True))
+        return (lambda: post_encoder.dump(rows[0]), rows, post_encoder.names) if rows else None
+
+    async def comment_list(self, args, post_id):
+        if {"updated_since", "fields"} & args.keys():
+            return None
+        if not await self._fetch(db.select(Post.id).where(Post.id == post_id)):
+            return None
+        rows = await self._fetch(
+            comentario_encoder.select()
+            .where(Comentario.post_id == post_id, Comentario.is_visible == True)
+            .order_by(Comentario.fecha_creacion.asc())
+        )
+        return lambda: comentario_encoder.dump_many(rows), rows, comentario_encoder.names
+
+    async def category_list(self, args):
+        if "fields" in args:
+            return None
+        rows = await self._fetch(categoria_encoder.select().order_by(Categoria.nombre.asc()))
+        counts = None
+        if args.get("with_counts"):
+            counts = dict(await self._fetch(
+                db.select(post_categoria.c.categoria_id, func.count())
+                .join(Post, Post.id == post_categoria.c.post_id)
+                .where(Post.is_published == True)
+                .group_by(post_categoria.c.categoria_id)
+            ))
+
+        def build():
+            items = categoria_encoder.dump_many(rows)
+            if counts is not None:
+                for cat in items:
+                    cat["post_count"] = counts.get(cat["id"], 0)
+            return items
+        return build, rows, sorted(counts.items()) if counts is not None else None, categoria_encoder.names
@@ -0,0 +1,130 @@
+# app/authz.py
+"""
+Autorización centralizada: un principal por request y una tabla de reglas.
+
+- El JWT se decodifica y valida una sola vez por request (current_principal):
+  el resultado queda en g como un Principal (id como int y role), y las vistas
+  lo leen de ahí en vez de volver a llamar a get_jwt()/int(get_jwt_identity()).
+- RULES dice, por (endpoint, método), si hace falta token, qué roles pueden
+  entrar y qué roles pasan por encima del chequeo de autoría. Se compila al
+  arrancar (init_app, después de registrar las rutas) y falla si nombra un
+  endpoint o método que no existe; en cada request el chequeo es un dict.get.
+- La regla de rol se aplica en un before_request, antes de la vista (y fuera de
+  su @query_budget); la de autoría necesita el recurso, así que la vista llama a
+  can_modify(owner_id) después de cargarlo, con su propio mensaje de 403.
+
+Los endpoints que no están en RULES son públicos (no se mira el token).
+"""
+from typing import NamedTuple, Optional
+
+from flask import g, jsonify, request
+from flask_jwt_extended import get_jwt, verify_jwt_in_request
+
+ADMIN = ("admin",)
+STAFF = ("moderator", "admin")
+
+
+class Principal(NamedTuple):
+    """Quién hace el request, según el JWT ya validado."""
+    id: int
+    role: Optional[str]
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role == "admin"
+
+    @classmethod
+    def from_claims(cls, claims: dict) -> "Principal":
+        try:
+            uid = int(claims["sub"])
+        except (TypeError, ValueError):
+            uid = claims["sub"]
+        return cls(uid, claims.get("role"))
+
+
+class Rule(NamedTuple):
+    """roles=None: cualquier usuario autenticado. bypass: roles que pueden tocar recursos ajenos."""
+    roles: Optional[tuple] = None
+    bypass: tuple = ()
+
+
+AUTHENTICATED = Rule()
+
+# endpoint -> {método: regla} (los endpoints son los nombres de app/routes.py)
+RULES = {
+    "me": {"GET": AUTHENTICATED},
+    "post_list": {"POST": AUTHENTICATED},
+    "post_batch": {"POST": AUTHENTICATED},
+    "post_detail": {"PUT": Rule(bypass=ADMIN), "DELETE": Rule(bypass=ADMIN)},
+    "comment_list": {"POST": AUTHENTICATED},
+    "comment_batch": {"POST": AUTHENTICATED},
+    "comment_delete": {"DELETE": Rule(bypass=STAFF)},
+    "comment_update": {"PUT": Rule(bypass=STAFF)},
+    "category_list": {"POST": Rule(STAFF)},
+    "category_batch": {"POST": Rule(STAFF)},
+    "category_detail": {"PUT": Rule(STAFF), "DELETE": Rule(ADMIN)},
+    "user_list": {"GET": Rule(ADMIN)},
+    "user_detail": {"GET": Rule(bypass=ADMIN), "PATCH": Rule(ADMIN), "DELETE": Rule(ADMIN)},
+    "stats": {"GET": Rule(STAFF)},
+    "cache_stats": {"GET": Rule(ADMIN)},
+    "reviews_all": {"GET": Rule(STAFF)},
+}
+
+
+def current_principal(optional: bool = False) -> Optional[Principal]:
+    """
+    El Principal del request (valida el JWT la primera vez que se pide).
+    Con optional=True devuelve None si no vino token, como
+    verify_jwt_in_request(optional=True).
+    """
+    principal = g.get("principal")
+    if principal is None:
+        verify_jwt_in_request(optional=optional)
+        claims = get_jwt()
+        principal = g.principal = Principal.from_claims(claims) if claims else None
+    return principal
+
+
+class Authorization:
+
+    def __init__(self):
+        self.rules = {}
+
+    def init_app(self, app):
+        """Compila RULES contra el url_map (llamar después de register_routes)."""
+        methods = {}
+        for url_rule in app.url_map.iter_rules():
+            methods.setdefault(url_rule.endpoint, set()).update(url_rule.methods or ())
+        rules = {}
+        for endpoint, por_metodo in RULES.items():
+            for method, rule in por_metodo.items():
+                if method not in methods.get(endpoint, ()):
+                    raise RuntimeError(f"Regla de autorización para una ruta inexistente: {method} {endpoint}")
+                rules[(endpoint, method)] = rule
+        self.rules = rules
+        app.before_request(self._enforce)
+        app.extensions["authz"] = self
+
+    def rule(self) -> Optional[Rule]:
+        method = "GET" if request.method == "HEAD" else request.method
+        return self.rules.get((request.endpoint, method))
+
+    def _enforce(self):
+        # g puede sobrevivir al request (un app context empujado a mano): el principal no
+        g.pop("principal", None)
+        rule = self.rule()
+        if rule is None:
+            return None
+        principal = current_principal()
+        if rule.roles is not None and principal.role not in rule.roles:
+            return jsonify({"msg": "No tenés permiso para realizar esta acción."}), 403
+        return None
+
+    def can_modify(self, owner_id) -> bool:
+        """Autor del recurso o un rol del bypass de la regla del endpoint actual."""
+        principal = current_principal()
+        rule = self.rule() or AUTHENTICATED
+        return principal.id == owner_id or principal.role in rule.bypass
+
+
+authz = Authorization()
@@ -0,0 +1,210 @@
+# app/bulk.py
+from datetime import datetime
+
+from flask import current_app
+from marshmallow import ValidationError
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.cache import cache
+from app.models import Post, Comentario, Categoria, post_categoria, extracto_de
+from app.schemas import post_schema, comentario_schema, categoria_schema
+from app.search import search_index, POST, COMMENT
+from app.stats import record_bulk_insert
+from app.activity import record_bulk_comments
+
+
+class InvalidBatch(ValueError):
+    """El cuerpo no es una lista no vacía o supera BATCH_MAX_ITEMS."""
+
+
+def _check_batch(items):
+    if isinstance(items, dict):
+        items = items.get("items")
+    if not isinstance(items, list) or not items:
+        raise InvalidBatch("Se espera una lista no vacía (o {\"items\": [...]}).")
+    max_items = current_app.config.get("BATCH_MAX_ITEMS", 1000)
+    if len(items) > max_items:
+        raise InvalidBatch(f"El lote admite como máximo {max_items} elementos.")
+    return items
+
+
+def _chunks(rows):
+    size = current_app.config.get("BATCH_CHUNK_SIZE", 500)
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def _validate(items, schema, errors, extra=None):
+    """Carga cada elemento con el schema; los errores quedan indexados por posición."""
+    valid = []
+    for i, raw in enumerate(items):
+        if not isinstance(raw, dict):
+            errors[i] = {"_schema": ["Se espera un objeto."]}
+            continue
+        raw = dict(raw)
+        extras = extra(i, raw) if extra else None
+        if i in errors:
+            continue
+        try:
+            valid.append((i, schema.load(raw), extras))
+        except ValidationError as err:
+            errors[i] = err.messages
+    return valid
+
+
+def _returning():
+    """True si el motor devuelve los ids de un executemany en orden (SQLite, MariaDB)."""
+    return db.engine.dialect.insert_executemany_returning_sort_by_parameter_order
+
+
+def _insert(table, rows):
+    """executemany; devuelve los ids en orden, o None por fila si el motor no los informa."""
+    if _returning():
+        stmt = db.insert(table).returning(table.c.id, sort_by_parameter_order=True)
+        return list(db.session.execute(stmt, rows).scalars())
+    db.session.execute(db.insert(table), rows)
+    return [None] * len(rows)
+
+
+def _reindex(kind, rows, ids, texto, visible):
+    """Actualiza el índice de búsqueda (los inserts Core no disparan los eventos ORM)."""
+    if None in ids:
+        search_index.reset()
+        return
+    search_index.apply([((kind, id_), texto(r)) for r, id_ in zip(rows, ids) if visible(r)])
+
+
+# =========================
+#          Posts
+# =========================
+def bulk_create_posts(items, uid: int):
+    """
+    Valida con PostSchema y crea los posts válidos en transacciones por chunk.
+    Cada elemento puede traer "categorias": [ids], que se vinculan con un único
+    insert en post_categoria por chunk. Devuelve (creados, errores).
+    """
+    items = _check_batch(items)
+    errors = {}
+
+    pedidas = {c for raw in items if isinstance(raw, dict)
+               for c in (raw.get("categorias") or []) if isinstance(c, int)}
+    existentes = set(db.session.scalars(
+        db.select(Categoria.id).where(Categoria.id.in_(pedidas))
+    )) if pedidas else set()
+
+    def categorias(i, raw):
+        cats = raw.pop("categorias", None) or []
+        if not isinstance(cats, list) or not all(isinstance(c, int) for c in cats):
+            errors[i] = {"categorias": ["Debe ser una lista de ids."]}
+        elif set(cats) - existentes:
+            errors[i] = {"categorias": [f"No existen: {sorted(set(cats) - existentes)}"]}
+        return sorted(set(cats))
+
+    valid = _validate(items, post_schema, errors, categorias)
+    creados = 0
+    table = Post.__table__
+    for chunk in _chunks(valid):
+        rows = []
+        for _, data, _cats in chunk:
+            ahora = datetime.now()
+            rows.append({
+                "titulo": data["titulo"], "contenido": data["contenido"], "usuario_id": uid,
+                "is_published": data.get("is_published", True),
+                "fecha_creacion": ahora, "updated_at": ahora, "extracto": extracto_de(data["contenido"]),
+            })
+
+        if _returning():
+            ids = _insert(table, rows)
+        else:
+            # MySQL: executemany sin ids; los posts con categorías van de a uno para conocer su id
+            ids = [None] * len(rows)
+            sueltos = [r for r, (_, _, cats) in zip(rows, chunk) if not cats]
+            if sueltos:
+                db.session.execute(db.insert(table), sueltos)
+            for k, (_, _, cats) in enumerate(chunk):
+                if cats:
+                    ids[k] = db.session.execute(db.insert(table).values(**rows[k])).inserted_primary_key[0]
+
+        links = [{"post_id": ids[k], "categoria_id": c}
+                 for k, (_, _, cats) in enumerate(chunk) for c in cats]
+        if links:
+            db.session.execute(post_categoria.insert(), links)
+
+        record_bulk_insert(Post, rows)
+        db.session.commit()
+        creados += len(rows)
+        _reindex(POST, rows, ids, lambda r: f"{r['titulo']} {r['contenido']}", lambda r: r["is_published"])
+
+    if creados:
+        cache.invalidate("posts:list")
+    return creados, errors
+
+
+# =========================
+#        Comentarios
+# =========================
+def bulk_create_comments(post_id: int, items, uid: int):
+    items = _check_batch(items)
+    errors = {}
+    valid = _validate(items, comentario_schema, errors)
+    creados = 0
+    for chunk in _chunks(valid):
+        ahora = datetime.now()
+        rows = [{
+            "texto": data["texto"], "usuario_id": uid, "post_id": post_id,
+            "is_visible": True, "fecha_creacion": ahora, "updated_at": ahora,
+        } for _, data, _ in chunk]
+        ids = _insert(Comentario.__table__, rows)
+        record_bulk_insert(Comentario, rows)
+        record_bulk_comments(post_id, rows)
+        db.session.commit()
+        creados += len(rows)
+        _reindex(COMMENT, rows, ids, lambda r: r["texto"], lambda r: True)
+
+    if creados:
+        cache.invalidate(f"comments:{post_id}", "comments")
+    return creados, errors
+
+
+# =========================
+#        Categorías
+# =========================
+def bulk_create_categories(items):
+    items = _check_batch(items)
+    errors = {}
+    valid = _validate(items, categoria_schema, errors)
+
+    nombres = [data["nombre"] for _, data, _ in valid]
+    existentes = set(db.session.scalars(
+        db.select(Categoria.nombre).where(Categoria.nombre.in_(nombres))
+    )) if nombres else set()
+    rows, vistos = [], set()
+    for i, data, _ in valid:
+        if data["nombre"] in existentes or data["nombre"] in vistos:
+            errors[i] = {"nombre": ["La categoría ya existe"]}
+            continue
+        vistos.add(data["nombre"])
+        rows.append((i, {"nombre": data["nombre"]}))
+
+    creados = 0
+    for chunk in _chunks(rows):
+        try:
+            db.session.execute(db.insert(Categoria), [row for _, row in chunk])
+            db.session.commit()
+            creados += len(chunk)
+        except IntegrityError:
+            # otro request creó alguno de estos nombres después de la lectura:
+            # se reintenta de a una (savepoint) y las repetidas van a errores
+            db.session.rollback()
+            for i, row in chunk:
+                try:
+                    with db.session.begin_nested():
+                        db.session.execute(db.insert(Categoria), row)
+                    creados += 1
+                except IntegrityError:
+                    errors[i] = {"nombre": ["La categoría ya existe"]}
+            db.session.commit()
+    if creados:
+        cache.invalidate("categories")
+    return creados, errors
@@ -0,0 +1,271 @@
+# app/cache.py
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import Response, current_app, g, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import db
+from app.compression import compression
+from app.conditional import VALIDATOR_HEADERS, matched
+from app.models import Usuario, Post, Comentario, Categoria
+
+
+# =========================
+#        Backends
+# =========================
+class MemoryBackend:
+    """LRU + TTL en memoria del proceso. También sirve de reemplazo local del backend compartido."""
+
+    def __init__(self, maxsize: int = 1024, ttl: int = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()   # key -> (expira_en, valor)
+        self._counters = {}          # versiones de tags: nunca se desalojan
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def counters(self, keys):
+        with self._lock:
+            return [self._counters.get(k, 0) for k in keys]
+
+    def incr(self, key):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._counters.clear()
+
+
+class RedisBackend:
+    """Backend compartido entre workers (requiere el paquete `redis`)."""
+
+    def __init__(self, url: str, ttl: int = 60, prefix: str = "blog:cache:"):
+        import redis  # dependencia opcional
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=self.ttl)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def counters(self, keys):
+        if not keys:
+            return []
+        return [int(v or 0) for v in self.client.mget([self.prefix + k for k in keys])]
+
+    def incr(self, key):
+        self.client.incr(self.prefix + key)
+
+    def clear(self):
+        for key in self.client.scan_iter(self.prefix + "*"):
+            self.client.delete(key)
+
+
+# =========================
+#      Cache de respuestas
+# =========================
+class ResponseCache:
+    """
+    Cachea respuestas GET públicas. Cada entrada depende de uno o más tags
+    (p. ej. "post:3"); la clave incluye la versión actual de cada tag, así que
+    invalidar un tag es incrementar su versión y las entradas viejas quedan
+    inalcanzables hasta que las desaloje el LRU/TTL.
+
+    Cada entrada es (cuerpo, status, mimetype, validadores, comprimidos): el
+    cuerpo sin comprimir y, por codificación negociada, los bytes comprimidos
+    la primera vez que alguien los pidió (no se recomprime en cada hit).
+
+    La invalidación corre en el after_commit del primario; un GET que llega
+    justo después puede leer una réplica que todavía no tiene la escritura.
+    Esa respuesta no se guarda si alguno de sus tags se invalidó hace menos
+    de CACHE_REPLICA_LAG segundos (si no, quedaría vieja todo el TTL).
+    """
+
+    def __init__(self):
+        self.backend = None
+        self.replica_lag = 5
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        kind = app.config.get("CACHE_BACKEND", "memory")
+        ttl = app.config.get("CACHE_TTL", 60)
+        if kind == "memory":
+            self.backend = MemoryBackend(app.config.get("CACHE_MAXSIZE", 1024), ttl)
+        elif kind == "redis":
+            self.backend = RedisBackend(app.config["CACHE_REDIS_URL"], ttl)
+        else:
+            self.backend = None
+        self.replica_lag = app.config.get("CACHE_REPLICA_LAG", 5)
+        app.extensions["response_cache"] = self
+
+    def _key(self, tags):
+        versions = self.backend.counters([f"v:{t}" for t in tags])
+        args = "&".join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+        stamp = ",".join(f"{t}@{v}" for t, v in zip(tags, versions))
+        return f"resp:{request.path}?{args}|{stamp}"
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def cached(self, *tags):
+        """
+        Decorador para métodos get. Los tags se formatean con los kwargs de la
+        URL; un tag también puede ser una función(**kwargs) que devuelve tags.
+        """
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                if self.backend is None:
+                    return fn(*args, **kwargs)
+                resolved = []
+                for t in tags:
+                    resolved.extend(t(**kwargs) if callable(t) else [t.format(**kwargs)])
+                key = self._key(resolved)
+                hit = self.backend.get(key)
+                if hit is not None:
+                    self._count(True)
+                    body, status, mimetype, *rest = hit
+                    headers = dict(rest[0]) if rest else {}
+                    encoded = rest[1] if len(rest) > 1 else {}
+                    etag = headers.get("ETag", "").strip('"')
+                    tag = matched(request.headers.get("If-None-Match"), etag) if etag else None
+                    if tag is not None:
+                        return Response(status=304, headers={**headers, "ETag": f'"{tag}"'})
+                    known = len(encoded)
+                    coding, data = compression.encode_cached(mimetype, body, encoded)
+                    if len(encoded) != known:
+                        # primera vez con esta codificación: se guarda para los próximos hits
+                        self.backend.set(key, (body, status, mimetype, rest[0] if rest else [], encoded))
+                    return self._response(data, status, mimetype, headers, coding)
+
+                self._count(False)
+                resp = current_app.make_response(fn(*args, **kwargs))
+                if resp.status_code == 200 and not resp.is_streamed and not g.get("cache_skip") \
+                        and not self._maybe_stale(resolved):
+                    body, encoded = resp.get_data(), {}
+                    validators = [(h, resp.headers[h]) for h in VALIDATOR_HEADERS if h in resp.headers]
+                    coding, data = compression.encode_cached(resp.mimetype, body, encoded)
+                    self.backend.set(key, (body, resp.status_code, resp.mimetype, validators, encoded))
+                    if coding is not None:
+                        resp.set_data(data)
+                        compression.mark(resp, coding)
+                return resp
+            return wrapper
+        return decorator
+
+    def _maybe_stale(self, tags) -> bool:
+        """True si la respuesta salió de una réplica y algún tag se invalidó hace menos de replica_lag."""
+        if self.replica_lag <= 0 or "db_replica" not in db.session.info:
+            return False
+        desde = time.time() - self.replica_lag
+        return any((self.backend.get(f"t:{t}") or 0) > desde for t in tags)
+
+    @staticmethod
+    def _response(data, status, mimetype, headers, coding):
+        resp = Response(data, status=status, mimetype=mimetype, headers=headers)
+        return compression.mark(resp, coding) if coding else resp
+
+    @staticmethod
+    def skip():
+        """Marca la respuesta actual como no cacheable (p. ej. vistas de admin)."""
+        g.cache_skip = True
+
+    def invalidate(self, *tags):
+        if self.backend is None:
+            return
+        ahora = time.time()
+        for t in tags:
+            self.backend.incr(f"v:{t}")
+            if self.replica_lag > 0:
+                self.backend.set(f"t:{t}", ahora)   # para _maybe_stale, en todos los workers
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__ if self.backend else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+cache = ResponseCache()
+
+
+# =========================
+#  Invalidación por commit
+# =========================
+# Se juntan los tags afectados en cada flush y se invalidan recién cuando el
+# commit se confirma (un rollback los descarta). Así se cubren también los
+# borrados en cascada y cualquier escritura que no pase por las vistas.
+def _tags_for(obj):
+    if isinstance(obj, Post):
+        return ("posts:list", f"post:{obj.id}")
+    if isinstance(obj, Comentario):
+        return (f"comments:{obj.post_id}", "comments")
+    if isinstance(obj, Categoria):
+        return ("categories",)
+    if isinstance(obj, Usuario):
+        return ("users",)
+    return ()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_tags(session, flush_context):
+    pending = session.info.setdefault("cache_tags", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        pending.update(_tags_for(obj))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    tags = session.info.pop("cache_tags", None)
+    if tags:
+        cache.invalidate(*tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("cache_tags", None)
@@ -0,0 +1,127 @@
+# app/commands.py
+from datetime import datetime
+
+import click
+
+from app import db, sync, activity
+from app.models import Usuario, UserCredentials, Post, Comentario, Categoria
+from app.stats import reconcile, read_stats
+from app.search import search_index
+
+
+# =========================
+#   Consultas frecuentes
+# =========================
+# Armadas con los mismos helpers que usan las vistas (mismos filtros, orden y
+# limit + 1 del keyset), así el plan que se revisa es el que corre de verdad.
+# También las corre tests/test_explain.py.
+def hot_queries():
+    from app.activity import POST_SORTS
+    from app.search import MySQLFulltextBackend
+    from app.serializers import post_encoder, comentario_encoder, categoria_encoder, usuario_encoder
+    from app.views import (
+        published_posts_stmt, posts_changes_stmt, visible_comments_stmt, comments_changes_stmt
+    )
+
+    limit = 20
+    desde = datetime(2025, 1, 1)
+    queries = {
+        f"posts.feed_{sort}": keyset.apply(published_posts_stmt(post_encoder, keyset), limit)
+        for sort, keyset in POST_SORTS.items()
+    }
+    queries.update({
+        "posts.by_category": POST_SORTS["recent"].apply(
+                        published_posts_stmt(post_encoder, POST_SORTS["recent"], 1), limit),
+        "posts.detail": post_encoder.select(Post.is_published, Post.updated_at).where(Post.id == 1),
+        "posts.sync": sync.POSTS_SYNC_KEYSET.apply(
+                        sync.post_changes_filter(posts_changes_stmt(post_encoder), desde), limit),
+        "posts.sync_deleted": sync.post_tombstones(desde),
+        "comments.by_post": visible_comments_stmt(comentario_encoder, 1),
+        "comments.sync": sync.COMMENTS_SYNC_KEYSET.apply(
+                        sync.comment_changes_filter(comments_changes_stmt(comentario_encoder), 1, desde), limit),
+        "comments.sync_deleted": sync.comment_tombstones(1, desde),
+        "categories.list": categoria_encoder.select().order_by(Categoria.nombre.asc()),
+        "users.list": usuario_encoder.select().order_by(Usuario.created_at.desc()),
+        "reviews.all": comentario_encoder.select().order_by(Comentario.fecha_creacion.desc()),
+        "login.by_email": db.select(Usuario).where(Usuario.email == "x@mail.com"),
+        "login.credentials": db.select(UserCredentials).where(UserCredentials.user_id == 1),
+        "stats.week_fraction": db.select(db.func.count()).select_from(Post)
+                        .where(Post.fecha_creacion >= datetime(2025, 1, 1, 12), Post.fecha_creacion < datetime(2025, 1, 2)),
+    })
+    if db.engine.dialect.name == "mysql":
+        # el índice en memoria (SQLite) no hace SQL
+        queries["search"] = MySQLFulltextBackend.SQL.bindparams(q="python", limit=limit + 1, offset=0)
+    return queries
+
+
+def explain(stmt):
+    """Devuelve (líneas del plan, motivo de falla o None) según el motor."""
+    engine = db.engine
+    compiled = stmt.compile(dialect=engine.dialect)
+    if compiled.positional:
+        params = tuple(compiled.params[k] for k in compiled.positiontup)
+    else:
+        params = compiled.params
+
+    with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled), params).all()
+            plan = [r[-1] for r in rows]
+            for line in plan:
+                if line.startswith("SCAN") and "USING" not in line:
+                    return plan, "recorrido completo de tabla"
+                if "TEMP B-TREE" in line:
+                    return plan, "ordenamiento sin índice"
+            return plan, None
+
+        result = conn.exec_driver_sql("EXPLAIN " + str(compiled), params)
+        rows = [dict(zip(result.keys(), r)) for r in result.all()]
+        plan = [f"{r.get('table')}: type={r.get('type')} key={r.get('key')} extra={r.get('Extra')}"
+                for r in rows]
+        for r in rows:
+            if r.get("type") == "ALL":
+                return plan, "recorrido completo de tabla"
+            if "filesort" in (r.get("Extra") or ""):
+                return plan, "ordenamiento sin índice"
+        return plan, None
+
+
+def register_commands(app):
+    @app.cli.command("explain-check")
+    def explain_check():
+        """Corre EXPLAIN sobre las consultas frecuentes y falla si alguna no usa índice."""
+        fallas = 0
+        for nombre, stmt in hot_queries().items():
+            plan, problema = explain(stmt)
+            estado = "OK" if problema is None else f"FALLA ({problema})"
+            click.echo(f"{nombre:<20} {estado}")
+            for line in plan:
+                click.echo(f"    {line}")
+            fallas += problema is not None
+        if fallas:
+            raise click.ClickException(f"{fallas} consulta(s) sin índice.")
+
+    @app.cli.command("stats-reconcile")
+    def stats_reconcile():
+        """Reconstruye los contadores de /api/stats desde las tablas."""
+        reconcile()
+        click.echo(f"✅ Contadores reconstruidos: {read_stats(include_week=True)}")
+
+    @app.cli.command("comments-reconcile")
+    @click.option("--batch", type=int, default=10000, help="Posts por transacción.")
+    def comments_reconcile(batch):
+        """Recalcula comment_count y last_comment_at de los posts desde los comentarios."""
+        click.echo(f"✅ {activity.reconcile(batch)} post(s) con contadores de comentarios corregidos.")
+
+    @app.cli.command("search-rebuild")
+    def search_rebuild():
+        """Reconstruye el índice de búsqueda (backfill)."""
+        search_index.rebuild()
+        click.echo(f"✅ Índice de búsqueda reconstruido ({type(search_index.backend).__name__}).")
+
+    @app.cli.command("sync-prune")
+    @click.option("--days", type=int, default=None, help="Retención en días (default: SYNC_TOMBSTONE_DAYS).")
+    def sync_prune(days):
+        """Borra los tombstones más viejos que la retención de la sincronización incremental."""
+        days = days if days is not None else app.config["SYNC_TOMBSTONE_DAYS"]
+        click.echo(f"✅ {sync.prune(days)} tombstone(s) de más de {days} días borrados.")
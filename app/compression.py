@@ -0,0 +1,135 @@
+# app/compression.py
+"""
+Compresión de respuestas negociada con Accept-Encoding (gzip y, si está
+instalado el paquete brotli, br).
+
+- Solo tipos de texto (JSON, NDJSON, text/*) y cuerpos de al menos
+  COMPRESS_MIN_SIZE bytes; las respuestas en streaming se comprimen al vuelo,
+  con un flush cada COMPRESS_STREAM_FLUSH bytes de entrada para que el cliente
+  siga recibiendo filas.
+- Toda respuesta comprimible lleva Vary: Accept-Encoding, y el ETag fuerte de
+  la variante comprimida lleva el sufijo de la codificación ("abc-gzip"): los
+  bytes son otros, así que el validador también.
+- La caché de respuestas (app/cache.py) guarda los bytes ya comprimidos de cada
+  codificación y los reutiliza en los hits (ver encode_cached).
+"""
+import zlib
+
+from flask import request
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:  # dependencia opcional
+    brotli = None
+
+COMPRESSIBLE = ("application/json", "application/x-ndjson")
+
+# wbits=31: formato gzip con mtime 0 (la misma entrada da siempre los mismos bytes)
+GZIP_WBITS = 31
+
+
+def compressible(mimetype) -> bool:
+    return bool(mimetype) and (mimetype in COMPRESSIBLE or mimetype.startswith("text/"))
+
+
+def encoded_etag(etag: str, coding: str) -> str:
+    """'"abc"' -> '"abc-gzip"' (respeta el prefijo W/)."""
+    if not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{coding}"'
+
+
+class Compression:
+    def __init__(self):
+        self.min_size = 1024
+        self.level = 6
+        self.stream_flush = 64 * 1024
+        self.codings = ("gzip",)
+
+    def init_app(self, app):
+        self.min_size = app.config.get("COMPRESS_MIN_SIZE", 1024)
+        self.level = app.config.get("COMPRESS_LEVEL", 6)
+        self.stream_flush = app.config.get("COMPRESS_STREAM_FLUSH", 64 * 1024)
+        pedidas = app.config.get("COMPRESS_ENCODINGS", ("br", "gzip"))
+        self.codings = tuple(c for c in pedidas if c == "gzip" or (c == "br" and brotli is not None))
+        app.after_request(self.after_request)
+        app.extensions["compression"] = self
+
+    # ---- negociación ----
+    def negotiate(self, accept_encoding: str):
+        """Codificación a usar según el header Accept-Encoding (o None)."""
+        if not accept_encoding or not self.codings:
+            return None
+        return parse_accept_header(accept_encoding).best_match(self.codings)
+
+    def compress(self, body: bytes, coding: str) -> bytes:
+        if coding == "br":
+            return brotli.compress(body, quality=min(self.level, 11))
+        c = zlib.compressobj(self.level, zlib.DEFLATED, GZIP_WBITS)
+        return c.compress(body) + c.flush()
+
+    def _stream(self, chunks, coding: str):
+        if coding == "br":
+            c = brotli.Compressor(quality=min(self.level, 11))
+            compress, flush, finish = c.process, c.flush, c.finish
+        else:
+            c = zlib.compressobj(self.level, zlib.DEFLATED, GZIP_WBITS)
+            compress, flush, finish = c.compress, lambda: c.flush(zlib.Z_SYNC_FLUSH), c.flush
+        pendiente = 0
+        for chunk in chunks:
+            out = compress(chunk)
+            pendiente += len(chunk)
+            if pendiente >= self.stream_flush:
+                out += flush()
+                pendiente = 0
+            if out:
+                yield out
+        yield finish()
+
+    # ---- respuesta ----
+    def mark(self, response, coding: str):
+        """Headers de una respuesta cuyo cuerpo ya está codificado con coding."""
+        response.headers["Content-Encoding"] = coding
+        if "ETag" in response.headers:
+            response.headers["ETag"] = encoded_etag(response.headers["ETag"], coding)
+        response.vary.add("Accept-Encoding")
+        return response
+
+    def encode_cached(self, mimetype, body: bytes, encoded: dict):
+        """
+        (coding, bytes) para servir un cuerpo cacheado, o (None, body). Comprime
+        una sola vez por codificación y deja el resultado en encoded para que
+        la caché lo guarde junto con el cuerpo original.
+        """
+        if not compressible(mimetype) or len(body) < self.min_size:
+            return None, body
+        coding = self.negotiate(request.headers.get("Accept-Encoding"))
+        if coding is None:
+            return None, body
+        if coding not in encoded:
+            encoded[coding] = self.compress(body, coding)
+        return coding, encoded[coding]
+
+    def after_request(self, response):
+        if not compressible(response.mimetype) or response.direct_passthrough:
+            return response
+        response.vary.add("Accept-Encoding")
+        if "Content-Encoding" in response.headers or not 200 <= response.status_code < 300 \
+                or response.status_code == 204 or request.method == "HEAD":
+            return response
+        coding = self.negotiate(request.headers.get("Accept-Encoding"))
+        if coding is None:
+            return response
+        if response.is_streamed:
+            response.response = self._stream(response.iter_encoded(), coding)
+            response.headers.pop("Content-Length", None)
+            return self.mark(response, coding)
+        body = response.get_data()
+        if len(body) < self.min_size:
+            return response
+        response.set_data(self.compress(body, coding))
+        return self.mark(response, coding)
+
+
+compression = Compression()
@@ -0,0 +1,102 @@
+# app/conditional.py
+"""
+GET condicional: ETag fuerte + Last-Modified, y 304 ante If-None-Match.
+
+El ETag sale de las filas que arman la respuesta (todas sus columnas), no del
+cuerpo: se puede responder 304 sin pasar por el encoder ni por el JSON. Como
+las columnas determinan el JSON byte a byte, el ETag es fuerte. Solo se evalúa
+If-None-Match; If-Modified-Since se ignora porque en los listados un borrado
+no mueve el Last-Modified.
+
+Las variantes comprimidas (app/compression.py) llevan el mismo ETag con el
+sufijo de la codificación ("abc-gzip"); un If-None-Match con cualquiera de las
+variantes vale como coincidencia y el 304 devuelve la que mandó el cliente.
+"""
+import hashlib
+from datetime import timezone
+
+from flask import jsonify, request, Response
+from werkzeug.http import http_date, parse_etags
+
+# Cambiar si cambia el formato del JSON para las mismas filas (invalida los ETag viejos)
+ETAG_VERSION = "2"
+
+# Headers que se guardan junto con el cuerpo en la caché de respuestas
+VALIDATOR_HEADERS = ("ETag", "Last-Modified")
+
+
+def etag_for(*parts) -> str:
+    """ETag (sin comillas) de cualquier estructura con repr estable: filas, dicts, cursores."""
+    h = hashlib.sha1(ETAG_VERSION.encode())
+    for part in parts:
+        h.update(repr(part).encode())
+        h.update(b"\x1f")
+    return h.hexdigest()[:32]
+
+
+def rows_etag(rows, *extra) -> str:
+    return etag_for([tuple(r) for r in rows], *extra)
+
+
+def last_modified(values):
+    """El mayor datetime no nulo de values (o None)."""
+    values = [v for v in values if v is not None]
+    return max(values) if values else None
+
+
+def matched(if_none_match, etag: str):
+    """
+    El ETag (sin comillas) del header If-None-Match (texto crudo o None) que
+    corresponde a etag o a una de sus variantes comprimidas, o None.
+    """
+    if not if_none_match:
+        return None
+    etags = parse_etags(if_none_match)
+    if etags.star_tag:
+        return etag
+    for tag in etags.as_set():
+        if tag == etag or tag.startswith(etag + "-"):
+            return tag
+    return None
+
+
+def matches(if_none_match, etag: str) -> bool:
+    """True si el header If-None-Match (texto crudo o None) incluye etag o una variante."""
+    return matched(if_none_match, etag) is not None
+
+
+def validator_headers(etag: str, modified=None) -> dict:
+    headers = {"ETag": f'"{etag}"'}
+    if modified is not None:
+        # las columnas guardan datetime.now() (hora local, naive); http_date asume UTC
+        headers["Last-Modified"] = http_date(modified.astimezone(timezone.utc))
+    return headers
+
+
+def not_modified(etag: str, modified=None):
+    """
+    304 con los validadores si el If-None-Match del request coincide; si no,
+    None y la vista sigue (recién ahí serializa):
+        return not_modified(etag) or (jsonify(body), 200, validator_headers(etag))
+    """
+    tag = matched(request.headers.get("If-None-Match"), etag)
+    if tag is not None:
+        return Response(status=304, headers=validator_headers(tag, modified))
+    return None
+
+
+def conditional_json(build, rows, *extra, deep: bool = False):
+    """
+    Respuesta GET con validadores: 304 sin llamar a build() si el cliente ya
+    tiene esta versión, o jsonify(build()) con ETag y Last-Modified.
+
+    El ETag sale de rows (y extra, p. ej. el next_cursor); con deep=True, cuando
+    el cuerpo depende de otras tablas (?include=), sale de build() ya armado.
+    """
+    modified = last_modified(getattr(r, "updated_at", None) for r in rows)
+    body = build() if deep else None
+    etag = etag_for(body, *extra) if deep else rows_etag(rows, *extra)
+    resp = not_modified(etag, modified)
+    if resp is not None:
+        return resp
+    return jsonify(build() if body is None else body), 200, validator_headers(etag, modified)
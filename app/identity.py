@@ -0,0 +1,93 @@
+# app/identity.py
+import threading
+
+from flask import abort
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import db
+from app.cache import MemoryBackend
+from app.models import Usuario
+from app.schemas import UsuarioSchema
+
+
+class UserCache:
+    """
+    Caché por proceso de usuarios (LRU + TTL) indexada por id.
+
+    Guarda el dump de UsuarioSchema, no el objeto ORM, así se puede devolver
+    tal cual en /api/me sin ir a la base. Que el usuario siga activo no se
+    consulta acá: desactivarlo revoca sus tokens (app/revocation.py).
+
+    Se invalida al confirmarse un commit que toque Usuario, pero solo en el
+    proceso que lo confirmó: los otros workers pueden servir el dump viejo
+    hasta USER_CACHE_TTL segundos.
+    """
+
+    def __init__(self):
+        self.backend = None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._schema = UsuarioSchema()
+
+    def init_app(self, app):
+        self.backend = MemoryBackend(
+            app.config.get("USER_CACHE_MAXSIZE", 10000), app.config.get("USER_CACHE_TTL", 30)
+        )
+        app.extensions["user_cache"] = self
+
+    def get(self, user_id: int):
+        """Devuelve el usuario serializado o None si no existe."""
+        key = f"user:{user_id}"
+        data = self.backend.get(key) if self.backend else None
+        with self._lock:
+            if data is not None:
+                self.hits += 1
+                return data
+            self.misses += 1
+        u = db.session.get(Usuario, user_id)
+        if u is None:
+            return None
+        data = self._schema.dump(u)
+        if self.backend:
+            self.backend.set(key, data)
+        return data
+
+    def get_or_404(self, user_id: int):
+        data = self.get(user_id)
+        if data is None:
+            abort(404)
+        return data
+
+    def invalidate(self, *user_ids):
+        if self.backend:
+            for uid in user_ids:
+                self.backend.delete(f"user:{uid}")
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+users = UserCache()
+
+
+# Mismo esquema que app/cache.py: juntar ids en el flush, invalidar en el commit
+@event.listens_for(Session, "after_flush")
+def _collect_users(session, flush_context):
+    pending = session.info.setdefault("user_ids", set())
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, Usuario):
+            pending.add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_users(session):
+    ids = session.info.pop("user_ids", None)
+    if ids:
+        users.invalidate(*ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_users(session):
+    session.info.pop("user_ids", None)
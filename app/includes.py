@@ -0,0 +1,85 @@
+# app/includes.py
+from collections import defaultdict
+
+from flask import request
+
+from app import db
+from app.models import Usuario, Post, Categoria, post_categoria
+
+# ?include=categories,author,comment_count
+POST_INCLUDES = ("categories", "author", "comment_count")
+
+# Tags extra de caché que necesita cada expansión (ver app/cache.py)
+INCLUDE_CACHE_TAGS = {
+    "categories": ("categories",),
+    "author": ("users",),
+    "comment_count": ("comments",),
+}
+
+
+class InvalidInclude(ValueError):
+    """Se pidió una expansión que no existe."""
+
+
+def parse_include(allowed=POST_INCLUDES) -> set:
+    raw = request.args.get("include", "")
+    pedidos = {p.strip() for p in raw.split(",") if p.strip()}
+    invalidos = pedidos - set(allowed)
+    if invalidos:
+        raise InvalidInclude(f"include inválido: {', '.join(sorted(invalidos))}")
+    return pedidos
+
+
+def include_cache_tags(**kwargs):
+    """Tags dinámicos para @cache.cached según las expansiones pedidas."""
+    try:
+        pedidos = parse_include()
+    except InvalidInclude:
+        return []
+    return [tag for p in sorted(pedidos) for tag in INCLUDE_CACHE_TAGS[p]]
+
+
+def expand_posts(items: list, include: set) -> list:
+    """
+    Agrega a cada post serializado las expansiones pedidas con una consulta
+    por expansión (nunca una por post), sea cual sea el tamaño de la página.
+    """
+    if not items or not include:
+        return items
+    ids = [p["id"] for p in items]
+
+    if "categories" in include:
+        cats = defaultdict(list)
+        rows = db.session.execute(
+            db.select(post_categoria.c.post_id, Categoria.id, Categoria.nombre)
+            .join(Categoria, Categoria.id == post_categoria.c.categoria_id)
+            .where(post_categoria.c.post_id.in_(ids))
+            .order_by(Categoria.nombre.asc())
+        )
+        for post_id, cat_id, nombre in rows:
+            cats[post_id].append({"id": cat_id, "nombre": nombre})
+        for p in items:
+            p["categories"] = cats.get(p["id"], [])
+
+    if "author" in include:
+        # por el post y no por p["usuario_id"]: con ?fields= puede no venir en el item
+        autores = {
+            post_id: {"id": uid, "username": username}
+            for post_id, uid, username in db.session.execute(
+                db.select(Post.id, Usuario.id, Usuario.username)
+                .join(Usuario, Usuario.id == Post.usuario_id)
+                .where(Post.id.in_(ids))
+            )
+        }
+        for p in items:
+            p["author"] = autores.get(p["id"])
+
+    if "comment_count" in include:
+        # columna mantenida por app/activity.py: lookup por id en vez de GROUP BY sobre comentarios
+        counts = dict(db.session.execute(
+            db.select(Post.id, Post.comment_count).where(Post.id.in_(ids))
+        ).all())
+        for p in items:
+            p["comment_count"] = counts.get(p["id"], 0)
+
+    return items
@@ -0,0 +1,71 @@
+# app/json_provider.py
+"""
+Proveedor JSON de la app: orjson cuando está instalado, con salida idéntica
+byte a byte a la de DefaultJSONProvider (json de la stdlib) con la misma
+configuración; si no, es el proveedor de siempre.
+
+orjson solo se usa para la forma compacta (la de jsonify fuera de debug) y sin
+ensure_ascii; se vuelve a la stdlib (mismo resultado que antes) cuando:
+- orjson no puede serializar el objeto (claves no str, enteros de más de 64
+  bits, tipos desconocidos para el default de Flask);
+- hay floats que orjson escribe distinto (exponentes: 1e-05 vs 0.00001, 1e+16
+  vs 1e16). Se detectan en la salida buscando un dígito seguido de "e" o
+  "0.0000" (con translate + in, sin regex: escanear con re costaba más que
+  el propio orjson); un string que "parezca" un float así solo provoca una
+  re-serialización, nunca una salida distinta.
+Los NaN/Infinity (JSON inválido) salen como null con orjson.
+"""
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # dependencia opcional
+    orjson = None
+
+# todos los dígitos pasan a "0": un dígito seguido de exponente queda como b"0e"
+_DIGITOS = bytes.maketrans(b"123456789", b"000000000")
+
+
+def _float_distinto(out: bytes) -> bool:
+    """True si out puede tener un float que la stdlib escribe distinto."""
+    return b"0.0000" in out or b"0e" in out.translate(_DIGITOS)
+
+
+COMPACT = (",", ":")
+_OPTIONS = (orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+            if orjson is not None else 0)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+
+    def __init__(self, app):
+        super().__init__(app)
+        # JSON_AS_ASCII dejó de leerse en Flask 2.3; se respeta acá
+        self.ensure_ascii = app.config.get("JSON_AS_ASCII", True)
+
+    @property
+    def fast(self) -> bool:
+        return orjson is not None and not self.ensure_ascii and self.sort_keys
+
+    def dumps_bytes(self, obj) -> bytes:
+        """Forma compacta en UTF-8 (la de response()), sin pasar por str."""
+        if self.fast:
+            try:
+                out = orjson.dumps(obj, default=self.default, option=_OPTIONS)
+            except TypeError:
+                pass
+            else:
+                if not _float_distinto(out):
+                    return out
+        return super().dumps(obj, separators=COMPACT).encode()
+
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs == {"separators": COMPACT}:
+            return self.dumps_bytes(obj).decode()
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj) + b"\n", mimetype=self.mimetype)
@@ -0,0 +1,212 @@
+# app/metrics.py
+"""
+Métricas del proceso en formato de texto Prometheus (/api/metrics).
+
+- Latencia por regla de URL y método (histograma) y requests por status.
+- Consultas SQL y tiempo de base por request (listeners de cursor sobre Engine).
+- Tiempo de hashing bcrypt, aparte (ver app/passwords.py).
+
+Todo se guarda en memoria del proceso con un lock por observación, así que se
+puede dejar activo en producción. Con METRICS_DEBUG_HEADERS (o app.debug) cada
+respuesta lleva X-Query-Count y Server-Timing.
+"""
+import bisect
+import threading
+import time
+from collections import defaultdict
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Segundos; cubren desde un GET cacheado hasta un login con bcrypt alto
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Histograma acumulativo por combinación de etiquetas (como los de Prometheus)."""
+
+    def __init__(self, name: str, help_: str, labels: tuple, buckets: tuple):
+        self.name = name
+        self.help = help_
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}   # valores de etiquetas -> [conteos por bucket..., +Inf, suma]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            serie = self._series.get(label_values)
+            if serie is None:
+                serie = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            serie[i] += 1
+            serie[-1] += value
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series = {k: list(v) for k, v in self._series.items()}
+        for values, serie in sorted(series.items()):
+            base = _labels(self.labels, values)
+            acumulado = 0
+            for le, n in zip((*self.buckets, "+Inf"), serie):
+                acumulado += n
+                yield f'{self.name}_bucket{{{base}{"," if base else ""}le="{le}"}} {acumulado}'
+            yield f"{self.name}_sum{{{base}}} {serie[-1]:.6f}"
+            yield f"{self.name}_count{{{base}}} {acumulado}"
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+class Counter:
+    def __init__(self, name: str, help_: str, labels: tuple):
+        self.name = name
+        self.help = help_
+        self.labels = labels
+        self._values = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float, *label_values):
+        with self._lock:
+            self._values[label_values] += amount
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            values = dict(self._values)
+        for label_values, v in sorted(values.items()):
+            yield f"{self.name}{{{_labels(self.labels, label_values)}}} {v:g}"
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values):
+    return ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+
+
+# =========================
+#       Registro
+# =========================
+class Metrics:
+    def __init__(self):
+        self.request_latency = Histogram(
+            "http_request_duration_seconds", "Latencia de requests por regla y método.",
+            ("rule", "method"), LATENCY_BUCKETS)
+        self.requests = Counter(
+            "http_requests_total", "Requests atendidos por regla, método y status.",
+            ("rule", "method", "status"))
+        self.request_queries = Histogram(
+            "db_queries_per_request", "Consultas SQL ejecutadas por request.",
+            ("rule", "method"), QUERY_BUCKETS)
+        self.db_time = Counter(
+            "db_query_seconds_total", "Tiempo total en consultas SQL por regla y método.",
+            ("rule", "method"))
+        self.queries = Counter(
+            "db_queries_total", "Consultas SQL ejecutadas por regla y método.",
+            ("rule", "method"))
+        self.hash_latency = Histogram(
+            "password_hash_duration_seconds", "Tiempo de bcrypt por operación (incluye la espera en el pool).",
+            ("op",), LATENCY_BUCKETS)
+        self.debug_headers = False
+        self.statement_hooks = []   # fn(statement, segundos, executemany) por sentencia (app/querywatch.py)
+        self._all = (self.request_latency, self.requests, self.request_queries,
+                     self.db_time, self.queries, self.hash_latency)
+
+    def init_app(self, app):
+        self.debug_headers = app.config.get("METRICS_DEBUG_HEADERS") or app.debug
+        app.before_request(_start_request)
+        app.after_request(_finish_request)
+        app.teardown_request(_record_request)
+        app.extensions["metrics"] = self
+
+    def on_statement(self, fn):
+        """Registra fn para cada sentencia SQL, con el tiempo que ya midieron estos listeners."""
+        if fn not in self.statement_hooks:
+            self.statement_hooks.append(fn)
+
+    def observe_hash(self, op: str, seconds: float):
+        self.hash_latency.observe(seconds, op)
+        if has_request_context():
+            g.metrics_hash_time = g.get("metrics_hash_time", 0.0) + seconds
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self._all for line in metric.render()) + "\n"
+
+    def reset(self):
+        for metric in self._all:
+            metric.reset()
+
+
+metrics = Metrics()
+
+
+# =========================
+#    Hooks de request
+# =========================
+def _start_request():
+    g.metrics_start = time.perf_counter()
+    g.metrics_queries = 0
+    g.metrics_db_time = 0.0
+    g.metrics_hash_time = 0.0
+
+
+def _finish_request(response):
+    g.metrics_status = response.status_code
+    if metrics.debug_headers and "metrics_start" in g:
+        total = (time.perf_counter() - g.metrics_start) * 1000
+        response.headers["X-Query-Count"] = str(g.metrics_queries)
+        timing = [f"db;dur={g.metrics_db_time * 1000:.2f}"]
+        if g.get("metrics_hash_time"):
+            timing.append(f"hash;dur={g.metrics_hash_time * 1000:.2f}")
+        timing.append(f"app;dur={total:.2f}")
+        response.headers["Server-Timing"] = ", ".join(timing)
+    return response
+
+
+def _record_request(exc):
+    # teardown: con stream_with_context corre cuando termina de enviarse el cuerpo
+    start = g.pop("metrics_start", None)
+    if start is None:
+        return
+    rule = request.url_rule.rule if request.url_rule else "<unmatched>"
+    method = request.method
+    status = g.get("metrics_status", 500)
+    metrics.request_latency.observe(time.perf_counter() - start, rule, method)
+    metrics.requests.inc(1, rule, method, status)
+    metrics.request_queries.observe(g.metrics_queries, rule, method)
+    metrics.queries.inc(g.metrics_queries, rule, method)
+    metrics.db_time.inc(g.metrics_db_time, rule, method)
+
+
+# =========================
+#    Listeners de SQL
+# =========================
+# Sobre la clase Engine: cubren todos los binds sin esperar a que se creen.
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["metrics_start"] = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info.pop("metrics_start", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    if has_request_context() and "metrics_start" in g:
+        g.metrics_queries += 1
+        g.metrics_db_time += elapsed
+    for hook in metrics.statement_hooks:
+        hook(statement, elapsed, executemany)
@@ -1,11 +1,13 @@
 from datetime import datetime
+from sqlalchemy.orm import validates
 from . import db #importamos la instancia de SQLAlchemy creada en __init__.py
-from passlib.hash import bcrypt
+from .passwords import passwords
 
 # Tabla intermedia para relación muchos a muchos
 post_categoria = db.Table('post_categoria',
     db.Column('post_id', db.Integer, db.ForeignKey('posts.id'), primary_key=True),
-    db.Column('categoria_id', db.Integer, db.ForeignKey('categorias.id'), primary_key=True)
+    db.Column('categoria_id', db.Integer, db.ForeignKey('categorias.id'), primary_key=True),
+    db.Index('ix_post_categoria_categoria', 'categoria_id', 'post_id')  # posts de una categoría
     ) 
 #un post puede tener varias categorias y una categoria puede estar en muchos posts(m a m).
 
@@ -17,6 +19,13 @@ class Usuario(db.Model):
     role = db.Column(db.String(20), default='user') #roles: user, admin, moderator
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.now)
+    # Sube al cambiar role o is_active: los JWT emitidos antes quedan revocados (app/revocation.py)
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    __table_args__ = (
+        db.Index('ix_usuarios_created_at', 'created_at'),  # listado admin de usuarios
+        db.Index('ix_usuarios_token_version', 'token_version'),  # carga de versiones revocadas
+    )
     
     #Relación uno a muchos con UserCredential, Post y Comentario
     credenciales = db.relationship("UserCredentials", uselist=False, back_populates="usuario")
@@ -29,15 +38,31 @@ class UserCredentials(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('usuarios.id'), nullable=False)
     password_hash = db.Column(db.String(200), nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_user_credentials_user_id', 'user_id'),  # login: credenciales del usuario
+    )
     
     usuario = db.relationship("Usuario", back_populates="credenciales")
 
     @staticmethod
     def hash_pwd(password):
-        return bcrypt.hash(password)
+        return passwords.hash(password)
 
     def check_pwd(self, password):
-        return bcrypt.verify(password, self.password_hash)
+        return passwords.verify(password, self.password_hash)
+
+
+# Largo máximo del extracto que se guarda junto con cada post (?fields=extracto)
+EXTRACTO_LARGO = 200
+
+def extracto_de(texto: str) -> str:
+    """Comienzo del texto con los espacios colapsados, cortado en una palabra y con "…" si sigue."""
+    plano = " ".join((texto or "").split())
+    if len(plano) <= EXTRACTO_LARGO:
+        return plano
+    corte = plano.rfind(" ", 0, EXTRACTO_LARGO)
+    return plano[:corte if corte > 0 else EXTRACTO_LARGO - 1] + "…"
 
 
 class Post(db.Model):
@@ -49,10 +74,29 @@ class Post(db.Model):
     usuario_id = db.Column(db.Integer, db.ForeignKey('usuarios.id'), nullable=False)
     is_published = db.Column(db.Boolean, default=True) #Indica si el post está publicado o en borrador 
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now) #Fecha de última actualización
+    extracto = db.Column(db.String(EXTRACTO_LARGO)) #Se calcula al escribir contenido (ver _set_extracto)
+    # Comentarios visibles y fecha del último, mantenidos en la misma transacción (app/activity.py)
+    comment_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    last_comment_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index('ix_posts_published_fecha', 'is_published', 'fecha_creacion', 'id'),  # feed público
+        db.Index('ix_posts_fecha_creacion', 'fecha_creacion'),  # stats: fracción de día de posts_last_week
+        db.Index('ix_posts_updated_at', 'updated_at', 'id'),  # sync: ?updated_since=
+        db.Index('ix_posts_published_activity', 'is_published', 'last_comment_at', 'id'),  # feed ?sort=activity
+        db.Index('ix_posts_published_comments', 'is_published', 'comment_count', 'id'),  # feed ?sort=comments
+        db.Index('ft_posts_titulo_contenido', 'titulo', 'contenido', mysql_prefix='FULLTEXT'),  # /api/search
+    )
 
     comentarios = db.relationship('Comentario', backref='post', lazy=True, cascade='all, delete-orphan')
     categorias = db.relationship('Categoria', secondary=post_categoria, backref=db.backref('posts', lazy='dynamic'), lazy='dynamic')
 
+    @validates('contenido')
+    def _set_extracto(self, key, contenido):
+        # Los inserts Core (app/bulk.py, app/synthetic.py) lo calculan aparte
+        self.extracto = extracto_de(contenido)
+        return contenido
+
 class Comentario(db.Model):
     __tablename__ = 'comentarios'
     id = db.Column(db.Integer, primary_key=True)
@@ -61,6 +105,14 @@ class Comentario(db.Model):
     usuario_id = db.Column(db.Integer, db.ForeignKey('usuarios.id'), nullable=False)
     post_id = db.Column(db.Integer, db.ForeignKey('posts.id'), nullable=False)
     is_visible = db.Column(db.Boolean, default=True) #Indica si el comentario es visible públicamente
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now) #Fecha de última actualización
+
+    __table_args__ = (
+        db.Index('ix_comentarios_post_visible_fecha', 'post_id', 'is_visible', 'fecha_creacion'),  # comentarios de un post
+        db.Index('ix_comentarios_post_updated', 'post_id', 'updated_at', 'id'),  # sync: ?updated_since=
+        db.Index('ix_comentarios_fecha_creacion', 'fecha_creacion'),  # reviews de moderación
+        db.Index('ft_comentarios_texto', 'texto', mysql_prefix='FULLTEXT'),  # /api/search
+    )
 
 class Categoria(db.Model):
     __tablename__ = 'categorias'
@@ -68,9 +120,28 @@ class Categoria(db.Model):
     nombre = db.Column(db.String(50), nullable=False, unique=True)
 
 
+# Contadores materializados para /api/stats (los mantiene app/stats.py)
+class Contador(db.Model):
+    __tablename__ = 'contadores'
+    nombre = db.Column(db.String(30), primary_key=True)  # posts, comentarios, usuarios
+    valor = db.Column(db.BigInteger, nullable=False, default=0)
 
+class PostsPorDia(db.Model):
+    __tablename__ = 'posts_por_dia'
+    dia = db.Column(db.Date, primary_key=True)
+    cantidad = db.Column(db.Integer, nullable=False, default=0)
 
 
-
-
-    
+# Borrados de posts y comentarios para la sincronización incremental (app/sync.py)
+class Tombstone(db.Model):
+    __tablename__ = 'tombstones'
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(10), nullable=False)  # post | comment
+    object_id = db.Column(db.Integer, nullable=False)
+    post_id = db.Column(db.Integer)  # para comentarios: el post al que pertenecían
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
+
+    __table_args__ = (
+        db.Index('ix_tombstones_kind_deleted', 'kind', 'deleted_at'),  # posts borrados desde
+        db.Index('ix_tombstones_post_deleted', 'post_id', 'deleted_at'),  # comentarios borrados de un post
+    )
@@ -0,0 +1,148 @@
+# app/pagination.py
+import base64
+import json
+from datetime import datetime
+
+from flask import current_app, request
+from sqlalchemy import and_, or_, false, DateTime, Integer, Select
+
+from app import db
+
+
+class InvalidCursor(ValueError):
+    """El cursor o el limit recibidos en la query string no son válidos."""
+
+
+class Keyset:
+    """
+    Paginación por cursor (keyset) sobre una lista de columnas.
+
+    El orden es (col1, col2, ...) todo ascendente o todo descendente; la última
+    columna tiene que ser única (normalmente el id) para que el orden sea total
+    y estable aunque se inserten filas nuevas mientras el cliente pagina.
+
+    Con nullable=True las columnas anteriores a la última pueden ser NULL; el
+    cursor sigue el orden de MySQL y SQLite (NULL primero en ascendente,
+    último en descendente).
+    """
+
+    def __init__(self, *columns, descending: bool = True, nullable: bool = False):
+        self.columns = columns
+        self.descending = descending
+        self.nullable = nullable
+
+    # ---- cursor opaco: base64url(JSON con los valores de la última fila) ----
+    def encode(self, row) -> str:
+        values = []
+        for col in self.columns:
+            v = getattr(row, col.key)
+            values.append(v.isoformat() if isinstance(v, datetime) else v)
+        raw = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode(self, cursor: str) -> list:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            values = json.loads(raw)
+            if not isinstance(values, list) or len(values) != len(self.columns):
+                raise ValueError
+            return [self._value(col, v) for col, v in zip(self.columns, values)]
+        except (ValueError, TypeError):
+            raise InvalidCursor("Cursor inválido.")
+
+    def _value(self, col, v):
+        """Valor del cursor con el tipo de su columna (ValueError si no corresponde)."""
+        if v is None:
+            if col is self.columns[-1]:   # la columna única (id) nunca es NULL
+                raise ValueError
+            return None
+        if isinstance(col.type, Integer):
+            if isinstance(v, bool) or not isinstance(v, int):
+                raise ValueError
+            return v
+        if not isinstance(v, str):
+            raise ValueError
+        return datetime.fromisoformat(v) if isinstance(col.type, DateTime) else v
+
+    def _after(self, values):
+        # (a, b) < (x, y)  ==>  a < x OR (a = x AND b < y)  (portable MySQL/SQLite)
+        conds = []
+        for i, (col, v) in enumerate(zip(self.columns, values)):
+            prefix = [c == pv for c, pv in zip(self.columns[:i], values[:i])]   # == None -> IS NULL
+            conds.append(and_(*prefix, self._step(col, v)))
+        return or_(*conds)
+
+    def _step(self, col, v):
+        if not self.nullable or col is self.columns[-1]:
+            return col < v if self.descending else col > v
+        if v is None:
+            return false() if self.descending else col.is_not(None)
+        if self.descending:
+            return or_(col < v, col.is_(None))
+        return col > v
+
+    def order_by(self):
+        return [c.desc() if self.descending else c.asc() for c in self.columns]
+
+    def apply(self, query, limit: int, cursor=None):
+        """Filtro del cursor, orden y limit + 1 (la fila extra indica si hay otra página)."""
+        if cursor:
+            query = query.filter(self._after(self.decode(cursor)))
+        return query.order_by(*self.order_by()).limit(limit + 1)
+
+    def split(self, rows, limit: int):
+        """(items, next_cursor) a partir de las filas traídas con apply()."""
+        items = rows[:limit]
+        next_cursor = self.encode(items[-1]) if len(rows) > limit else None
+        return items, next_cursor
+
+    def paginate(self, query):
+        """
+        Aplica cursor/limit de request.args a la query (Query ORM o select()).
+        Devuelve (items, next_cursor); next_cursor es None en la última página.
+        """
+        limit = parse_limit()
+        query = self.apply(query, limit, request.args.get("cursor"))
+        rows = db.session.execute(query).all() if isinstance(query, Select) else query.all()
+        return self.split(rows, limit)
+
+
+def encode_offset(offset: int) -> str:
+    """Cursor opaco para listados rankeados que no admiten keyset (p. ej. búsqueda)."""
+    return base64.urlsafe_b64encode(json.dumps(["o", offset]).encode()).decode().rstrip("=")
+
+
+def decode_offset(cursor) -> int:
+    if not cursor:
+        return 0
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        tag, offset = json.loads(raw)
+        if tag != "o" or not isinstance(offset, int) or offset < 0:
+            raise ValueError
+        return offset
+    except (ValueError, TypeError):
+        raise InvalidCursor("Cursor inválido.")
+
+
+def parse_limit(args=None, config=None) -> int:
+    """limit de la query string (por defecto la del request actual) acotado a PAGINATION_MAX_LIMIT."""
+    args = request.args if args is None else args
+    config = current_app.config if config is None else config
+    default = config.get("PAGINATION_DEFAULT_LIMIT", 20)
+    max_limit = config.get("PAGINATION_MAX_LIMIT", 100)
+    raw = args.get("limit")
+    if raw is None:
+        return default
+    try:
+        limit = int(raw)
+    except ValueError:
+        raise InvalidCursor("El parámetro limit debe ser un entero.")
+    if limit < 1:
+        raise InvalidCursor("El parámetro limit debe ser mayor a 0.")
+    return min(limit, max_limit)
+
+
+def page_response(items: list, next_cursor):
+    """Cuerpo estándar de las respuestas paginadas."""
+    return {"items": items, "next_cursor": next_cursor}
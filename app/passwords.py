@@ -0,0 +1,95 @@
+# app/passwords.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from flask import jsonify
+from passlib.hash import bcrypt
+
+from app.metrics import metrics
+
+
+class HasherBusy(Exception):
+    """La cola de hashing está llena: se responde 503 en vez de encolar más trabajo."""
+
+
+class PasswordService:
+    """
+    Hashing/verificación bcrypt fuera de los hilos de request.
+
+    Un pool acotado (HASH_WORKERS) hace el trabajo de bcrypt, que libera el GIL,
+    y como mucho HASH_MAX_QUEUE pedidos esperan turno; el resto recibe 503
+    enseguida, así un pico de logins no deja sin CPU al resto de la API.
+    El pool se crea en el primer uso (seguro con servidores pre-fork).
+    """
+
+    def __init__(self):
+        self.rounds = 12
+        self.workers = 4
+        self.max_queue = 32
+        self.timeout = 10
+        self._handler = bcrypt
+        self._executor = None
+        self._slots = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.rounds = app.config.get("BCRYPT_ROUNDS", 12)
+        self.workers = app.config.get("HASH_WORKERS", 4)
+        self.max_queue = app.config.get("HASH_MAX_QUEUE", 32)
+        self.timeout = app.config.get("HASH_TIMEOUT", 10)
+        self._handler = bcrypt.using(
+            rounds=self.rounds, min_desired_rounds=self.rounds, max_desired_rounds=self.rounds
+        )
+        self._executor = None
+        app.extensions["passwords"] = self
+
+        @app.errorhandler(HasherBusy)
+        def _busy(err):
+            return jsonify({"msg": "Servidor ocupado, reintentá en unos segundos."}), 503, {"Retry-After": "1"}
+
+    def _submit(self, op: str, fn, *args):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="bcrypt")
+                self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusy()
+        start = time.perf_counter()
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise HasherBusy()
+        finally:
+            metrics.observe_hash(op, time.perf_counter() - start)
+
+    def hash(self, password: str) -> str:
+        return self._submit("hash", self._handler.hash, password)
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        return self._submit("verify", self._handler.verify, password, password_hash)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """True si el hash guardado usa un costo distinto de BCRYPT_ROUNDS."""
+        return self._handler.needs_update(password_hash)
+
+    def warm_up(self):
+        """Carga el backend de bcrypt (import + autotest de passlib) antes del primer login."""
+        self._handler.get_backend()
+
+    def after_fork(self):
+        """En el worker recién forkeado: los hilos del pool no sobreviven al fork, se recrea en el primer uso."""
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+passwords = PasswordService()
@@ -0,0 +1,70 @@
+# app/preload.py
+"""
+Arranque precargado para servidores pre-fork (gunicorn --preload, ver gunicorn.conf.py).
+
+El master hace una sola vez el trabajo caro del arranque y los workers lo
+heredan por copy-on-write al forkear:
+- create_app() ya importa las vistas, passlib, marshmallow y los schemas/encoders
+  (instancias compartidas de app/schemas.py y app/serializers.py);
+- warm_up() configura los mappers, carga el backend de bcrypt y recorre los GET
+  públicos para llenar el caché de SQL compilado del motor y resolver el url_map;
+- después cierra las conexiones del master: ninguna conexión abierta cruza el fork.
+
+En cada worker, after_fork() descarta el pool heredado sin tocar los sockets del
+padre (dispose(close=False)) y el pool de hashing, que se recrean en el primer uso.
+"""
+import logging
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import configure_mappers
+
+from app import db
+from app.cache import cache
+from app.metrics import metrics
+from app.passwords import passwords
+
+logger = logging.getLogger("app.preload")
+
+# GET públicos que se recorren al precalentar (sin auth ni efectos)
+WARM_PATHS = (
+    "/api/posts",
+    "/api/posts?include=categories,author,comment_count",
+    "/api/categories",
+    "/api/categories?with_counts=1",
+)
+
+
+def warm_up(app):
+    configure_mappers()
+    passwords.warm_up()
+    app.url_map.update()
+
+    # Sin caché de respuestas: lo que se cachee en el master lo heredarían los
+    # workers (y con Redis se escribiría en la caché compartida)
+    backend, cache.backend = cache.backend, None
+    try:
+        with app.app_context():
+            client = app.test_client()
+            paths = list(WARM_PATHS)
+            posts = client.get("/api/posts?limit=1").get_json() or {}
+            for item in posts.get("items", []):
+                paths += [f"/api/posts/{item['id']}", f"/api/posts/{item['id']}/comments"]
+            for path in paths:
+                client.get(path)
+    except SQLAlchemyError as err:
+        # p. ej. base sin migrar: se arranca igual, sin el caché de SQL compilado
+        logger.warning("Precalentamiento incompleto: %s", getattr(err, "orig", err))
+    finally:
+        with app.app_context():
+            for engine in db.engines.values():
+                engine.dispose()
+        cache.backend = backend
+        # las métricas del master las heredan todos los workers
+        metrics.reset()
+
+
+def after_fork(app):
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    passwords.after_fork()
@@ -0,0 +1,143 @@
+# app/querywatch.py
+"""
+Vigilancia de consultas SQL por request.
+
+- @query_budget(n): máximo de consultas que puede ejecutar una vista. Si se
+  pasa, lanza QueryBudgetExceeded en tests (TESTING) y solo lo loguea en producción
+  (QUERY_BUDGET_MODE = "raise" | "log").
+- Detector de N+1 (QUERY_WATCH, activo siempre con debug/testing): agrupa las
+  sentencias por forma (sin parámetros ni literales) y avisa cuando la misma
+  forma se repite N_PLUS_ONE_THRESHOLD veces o más en un request.
+- Log de consultas lentas (SLOW_QUERY_MS) en JSON, con la sentencia y la vista
+  que la originó, en el logger "app.queries".
+
+Cuenta y mide con los listeners de cursor de app/metrics.py (g.metrics_queries
+y metrics.on_statement), sin un segundo par de listeners sobre Engine.
+"""
+import json
+import logging
+import re
+from collections import Counter
+from functools import lru_cache, wraps
+
+from flask import current_app, g, has_app_context, has_request_context, request
+
+from app.metrics import metrics
+
+logger = logging.getLogger("app.queries")
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Una vista ejecutó más consultas que las declaradas con @query_budget."""
+
+
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_LISTA = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ESPACIOS = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def statement_shape(statement: str) -> str:
+    """La sentencia sin literales, con las listas IN (?, ?, ...) colapsadas a (?)."""
+    shape = _LITERAL.sub("?", statement.replace("%s", "?"))
+    shape = _LISTA.sub("(?)", shape)
+    return _ESPACIOS.sub(" ", shape).strip()
+
+
+class QueryWatch:
+    """
+    La configuración se lee de current_app cuando se usa (no en init_app): así
+    vale también el patrón app = create_app(); app.config["TESTING"] = True.
+    """
+
+    def init_app(self, app):
+        app.before_request(_start_request)
+        app.teardown_request(_report_request)
+        # Un solo par de listeners de cursor: los de app/metrics.py cuentan y miden
+        metrics.on_statement(_on_statement)
+        app.extensions["querywatch"] = self
+
+    @property
+    def watch(self) -> bool:
+        return bool(current_app.config.get("QUERY_WATCH") or current_app.debug or current_app.testing)
+
+    @property
+    def mode(self) -> str:
+        return current_app.config.get("QUERY_BUDGET_MODE") or ("raise" if current_app.testing else "log")
+
+    @property
+    def n_plus_one_threshold(self) -> int:
+        return current_app.config.get("N_PLUS_ONE_THRESHOLD", 5)
+
+    @property
+    def slow_query_ms(self) -> float:
+        # también fuera de la app (scripts sin contexto): el default
+        return current_app.config.get("SLOW_QUERY_MS", 200) if has_app_context() else 200
+
+    def count(self) -> int:
+        """Consultas ejecutadas en el request actual (el contador de app/metrics.py)."""
+        return g.get("metrics_queries", 0)
+
+    def over_budget(self, view: str, budget: int, used: int):
+        msg = f"{view} ejecutó {used} consultas (presupuesto: {budget})"
+        if self.mode == "raise":
+            raise QueryBudgetExceeded(msg)
+        _log(logging.WARNING, "query_budget_exceeded", view=view, budget=budget, queries=used)
+
+
+querywatch = QueryWatch()
+
+
+def query_budget(max_queries: int):
+    """Declara cuántas consultas puede ejecutar la vista (sin contar el streaming del cuerpo)."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            antes = querywatch.count()
+            resp = fn(*args, **kwargs)
+            usadas = querywatch.count() - antes
+            if usadas > max_queries:
+                querywatch.over_budget(request.endpoint or fn.__qualname__, max_queries, usadas)
+            return resp
+        return wrapper
+    return decorator
+
+
+def _log(level, event_name, **fields):
+    if logger.isEnabledFor(level):
+        logger.log(level, json.dumps({"event": event_name, **fields}, ensure_ascii=False, default=str))
+
+
+# =========================
+#    Hooks de request
+# =========================
+def _start_request():
+    if querywatch.watch:
+        g.qw_shapes = Counter()
+
+
+def _report_request(exc):
+    shapes = g.pop("qw_shapes", None)
+    if not shapes:
+        return
+    for shape, n in shapes.items():
+        if n >= querywatch.n_plus_one_threshold:
+            _log(logging.WARNING, "n_plus_one", view=request.endpoint, method=request.method,
+                 path=request.path, count=n, statement=shape)
+
+
+# =========================
+#    Por sentencia SQL
+# =========================
+def _on_statement(statement, seconds, executemany):
+    en_request = has_request_context()
+    if en_request:
+        shapes = g.get("qw_shapes")
+        if shapes is not None:
+            shapes[statement_shape(statement)] += 1
+    ms = seconds * 1000
+    if ms >= querywatch.slow_query_ms:
+        _log(logging.WARNING, "slow_query", ms=round(ms, 2), statement=_ESPACIOS.sub(" ", statement)[:2000],
+             executemany=executemany,
+             view=request.endpoint if en_request else None,
+             method=request.method if en_request else None)
@@ -0,0 +1,163 @@
+# app/ratelimit.py
+"""
+Rate limiting de /api/login y /api/register (token bucket por IP y por email).
+
+bcrypt es caro a propósito: sin límite, una ráfaga de credential stuffing se
+convierte en CPU quemada para toda la API. Cada clave (p. ej. "login:ip:1.2.3.4"
+o "login:email:ana@mail.com") tiene un balde de `capacidad` fichas que se
+rellena a capacidad/período fichas por segundo; cada intento gasta una. Sin
+fichas se responde 429 con Retry-After, antes de tocar la base o bcrypt.
+
+Los límites se configuran como "intentos/segundos" (RATELIMIT_LOGIN_IP,
+RATELIMIT_LOGIN_EMAIL, RATELIMIT_REGISTER_IP, RATELIMIT_REGISTER_EMAIL). El
+backend "memory" es por proceso (reemplazo local del compartido); con "redis"
+los baldes se comparten entre workers. La IP es request.remote_addr: detrás de
+un proxy hay que aplicar werkzeug.middleware.proxy_fix.ProxyFix.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from flask import jsonify, request
+
+
+class RateLimited(Exception):
+    """Se acabaron las fichas del balde: 429 con Retry-After."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(retry_after)
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+def parse_limit(value: str):
+    """'20/60' -> (20, 60.0): 20 intentos cada 60 segundos."""
+    capacidad, _, periodo = str(value).partition("/")
+    return int(capacidad), float(periodo or 60)
+
+
+# =========================
+#        Backends
+# =========================
+class MemoryBuckets:
+    """Baldes por proceso (LRU acotado: un balde desalojado vuelve lleno)."""
+
+    def __init__(self, maxsize: int = 100000):
+        self.maxsize = maxsize
+        self._data = OrderedDict()   # key -> (fichas, último_refill)
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: int, period: float) -> float:
+        """Gasta una ficha; devuelve 0 si había o los segundos hasta la próxima."""
+        rate = capacity / period
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._data.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - last) * rate)
+            if tokens >= 1:
+                self._data[key] = (tokens - 1, now)
+                wait = 0.0
+            else:
+                self._data[key] = (tokens, now)
+                wait = (1 - tokens) / rate
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class RedisBuckets:
+    """Baldes compartidos entre workers (requiere el paquete `redis`)."""
+
+    # Mismo algoritmo que MemoryBuckets, atómico en Redis y con el reloj del servidor
+    _TAKE_SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local t = redis.call('TIME')
+    local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'last')
+    local tokens = tonumber(state[1]) or capacity
+    local last = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + (now - last) * rate)
+    local wait = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+    else
+        wait = (1 - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'last', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return tostring(wait)
+    """
+
+    def __init__(self, url: str, prefix: str = "blog:ratelimit:"):
+        import redis  # dependencia opcional
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._take = self.client.register_script(self._TAKE_SCRIPT)
+
+    def take(self, key: str, capacity: int, period: float) -> float:
+        return float(self._take(keys=[self.prefix + key], args=[capacity, capacity / period]))
+
+    def clear(self):
+        for key in self.client.scan_iter(self.prefix + "*"):
+            self.client.delete(key)
+
+
+# =========================
+#        Limitador
+# =========================
+class RateLimiter:
+
+    def __init__(self):
+        self.enabled = True
+        self.backend = MemoryBuckets()
+        self.limits = {}
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.enabled = app.config.get("RATELIMIT_ENABLED", True)
+        if app.config.get("RATELIMIT_BACKEND", "memory") == "redis":
+            self.backend = RedisBuckets(app.config["CACHE_REDIS_URL"])
+        else:
+            self.backend = MemoryBuckets(app.config.get("RATELIMIT_MAXSIZE", 100000))
+        self.limits = {
+            ("login", "ip"): parse_limit(app.config.get("RATELIMIT_LOGIN_IP", "20/60")),
+            ("login", "email"): parse_limit(app.config.get("RATELIMIT_LOGIN_EMAIL", "5/300")),
+            ("register", "ip"): parse_limit(app.config.get("RATELIMIT_REGISTER_IP", "5/3600")),
+            ("register", "email"): parse_limit(app.config.get("RATELIMIT_REGISTER_EMAIL", "3/3600")),
+        }
+        app.extensions["ratelimit"] = self
+
+        @app.errorhandler(RateLimited)
+        def _limited(err):
+            return (jsonify({"msg": f"Demasiados intentos. Reintentá en {err.retry_after} segundos."}),
+                    429, {"Retry-After": str(err.retry_after)})
+
+    def hit(self, action: str, kind: str, value):
+        """Gasta una ficha de (action, kind, value) o lanza RateLimited."""
+        if not self.enabled or not value:
+            return
+        capacity, period = self.limits[(action, kind)]
+        wait = self.backend.take(f"{action}:{kind}:{value}", capacity, period)
+        if wait > 0:
+            with self._lock:
+                self.rejected += 1
+            raise RateLimited(wait)
+
+    def check_ip(self, action: str):
+        self.hit(action, "ip", request.remote_addr)
+
+    def check_email(self, action: str, email):
+        self.hit(action, "email", (email or "").strip().lower())
+
+    def stats(self) -> dict:
+        return {"backend": type(self.backend).__name__, "rejected": self.rejected}
+
+
+ratelimit = RateLimiter()
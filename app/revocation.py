@@ -0,0 +1,195 @@
+# app/revocation.py
+"""
+Revocación de JWT sin ir a la base en cada request.
+
+Cada usuario tiene un token_version (columna de usuarios) que sube cuando
+cambia su role o su is_active, y el login lo pone en el claim "tv" del token.
+Un token está revocado si su "tv" es menor que la versión actual del usuario:
+bajar de rol o desactivar a alguien invalida todos sus tokens anteriores.
+
+Las versiones viven en memoria: un dict id -> versión solo con los usuarios
+que alguna vez cambiaron (el resto está en 0), así que el chequeo por request
+es un dict.get. Se cargan de la base en el primer request autenticado y cada
+REVOCATION_REFRESH segundos (lo que cambiaron otros workers), y el worker que
+confirma el cambio las actualiza en el after_commit. Con
+REVOCATION_BACKEND=redis las versiones se comparten entre workers (un HGET por
+request, sin SQL).
+
+Los UPDATE masivos (db.update(Usuario)) no pasan por los eventos del ORM: si
+tocan role o is_active tienen que subir token_version a mano.
+"""
+import logging
+import threading
+import time
+
+from flask import jsonify, request
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.base import NEVER_SET, NO_VALUE
+
+from app import db, jwt
+from app.models import Usuario
+
+logger = logging.getLogger("app.revocation")
+
+
+# =========================
+#        Backends
+# =========================
+class MemoryVersions:
+    """Versiones por proceso (reemplazo local del backend compartido)."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> int:
+        return self._data.get(user_id, 0)
+
+    def update(self, versions: dict):
+        # solo suben: una carga vieja no pisa la versión de un commit más nuevo
+        with self._lock:
+            for uid, version in versions.items():
+                if version > self._data.get(uid, 0):
+                    self._data[uid] = version
+
+    def __len__(self):
+        return len(self._data)
+
+
+class RedisVersions:
+    """Versiones compartidas entre workers en un hash de Redis (requiere el paquete `redis`)."""
+
+    # HSET solo si la versión nueva es mayor (mismo criterio que MemoryVersions)
+    _MAX_SCRIPT = """
+    for i = 1, #ARGV, 2 do
+        local actual = tonumber(redis.call('HGET', KEYS[1], ARGV[i]) or '0')
+        if tonumber(ARGV[i + 1]) > actual then
+            redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+        end
+    end
+    """
+
+    def __init__(self, url: str, key: str = "blog:token_versions"):
+        import redis  # dependencia opcional
+        self.client = redis.Redis.from_url(url)
+        self.key = key
+        self._update = self.client.register_script(self._MAX_SCRIPT)
+
+    def get(self, user_id: int) -> int:
+        value = self.client.hget(self.key, user_id)
+        return int(value) if value is not None else 0
+
+    def update(self, versions: dict):
+        if versions:
+            self._update(keys=[self.key], args=[x for item in versions.items() for x in item])
+
+    def __len__(self):
+        return self.client.hlen(self.key)
+
+
+# =========================
+#       Revocación
+# =========================
+class TokenRevocation:
+
+    def __init__(self):
+        self.store = MemoryVersions()
+        self.refresh = 30
+        self._loaded_at = None
+
+    def init_app(self, app):
+        if app.config.get("REVOCATION_BACKEND", "memory") == "redis":
+            self.store = RedisVersions(app.config["CACHE_REDIS_URL"])
+        else:
+            self.store = MemoryVersions()
+        self.refresh = app.config.get("REVOCATION_REFRESH", 30)
+        self._loaded_at = None
+        jwt.token_in_blocklist_loader(self.is_revoked)
+        jwt.revoked_token_loader(_revoked_response)
+        app.before_request(self._load_if_stale)
+        app.extensions["revocation"] = self
+
+    def is_revoked(self, jwt_header, jwt_payload) -> bool:
+        """token_in_blocklist_loader: sin SQL, un lookup en el store."""
+        try:
+            uid = int(jwt_payload["sub"])
+        except (KeyError, TypeError, ValueError):
+            return True
+        # tokens emitidos antes de que existiera el claim: versión 0
+        return jwt_payload.get("tv", 0) < self.store.get(uid)
+
+    def _load_if_stale(self):
+        # antes de la vista (fuera de su @query_budget) y solo en requests con token
+        if "Authorization" not in request.headers:
+            return
+        if self._loaded_at is not None and (
+                self.refresh <= 0 or time.monotonic() - self._loaded_at < self.refresh):
+            return
+        self.load()
+
+    def load(self):
+        """Trae de la base las versiones de los usuarios que alguna vez cambiaron."""
+        self._loaded_at = time.monotonic()
+        try:
+            rows = db.session.execute(
+                db.select(Usuario.id, Usuario.token_version).where(Usuario.token_version > 0)
+            ).all()
+        except SQLAlchemyError as err:
+            # p. ej. base sin migrar: se sigue con lo que haya en memoria
+            db.session.rollback()
+            logger.warning("No se pudieron cargar las versiones de tokens: %s", getattr(err, "orig", err))
+            return
+        self.store.update(dict(rows))
+
+    def stats(self) -> dict:
+        return {"backend": type(self.store).__name__, "users": len(self.store)}
+
+
+revocation = TokenRevocation()
+
+
+def _revoked_response(jwt_header, jwt_payload):
+    return jsonify({"msg": "La sesión fue revocada. Volvé a iniciar sesión."}), 401
+
+
+# =========================
+#   Versión por usuario
+# =========================
+@event.listens_for(Usuario.role, "set", active_history=True)
+@event.listens_for(Usuario.is_active, "set", active_history=True)
+def _bump_token_version(target, value, oldvalue, initiator):
+    if oldvalue is NO_VALUE or oldvalue is NEVER_SET or value == oldvalue or target.id is None:
+        return
+    # el +1 lo hace el UPDATE: dos requests que cambian al mismo usuario no pisan la versión
+    target.token_version = Usuario.token_version + 1
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("token_version_ids", set()).add(target.id)
+
+
+# Mismo esquema que app/cache.py: juntar en el flush, publicar en el commit
+@event.listens_for(Session, "after_flush")
+def _collect_versions(session, flush_context):
+    ids = session.info.pop("token_version_ids", None)
+    if not ids:
+        return
+    # la columna quedó expirada (valor calculado en SQL): se lee en la conexión del flush
+    rows = session.connection().execute(
+        db.select(Usuario.id, Usuario.token_version).where(Usuario.id.in_(ids))
+    )
+    session.info.setdefault("token_versions", {}).update(dict(rows.all()))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_versions(session):
+    versions = session.info.pop("token_versions", None)
+    if versions:
+        revocation.store.update(versions)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_versions(session):
+    session.info.pop("token_versions", None)
+    session.info.pop("token_version_ids", None)
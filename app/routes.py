@@ -3,17 +3,23 @@ from app.views import (
     # Auth
     RegisterAPI, LoginAPI, MeAPI,
     # Posts
-    PostListAPI, PostDetailAPI,
+    PostListAPI, PostDetailAPI, PostBatchAPI,
     # Comentarios
-    CommentListAPI, CommentDeleteAPI, CommentUpdateAPI,
+    CommentListAPI, CommentDeleteAPI, CommentUpdateAPI, CommentBatchAPI,
     # Categorías
-    CategoryListAPI, CategoryDetailAPI,
+    CategoryListAPI, CategoryDetailAPI, CategoryPostsAPI, CategoryBatchAPI,
     # Usuarios (admin)
     UserListAPI, UserDetailAPI,
     # Stats
     StatsAPI,
     # Reviews global
-    ReviewsAllAPI
+    ReviewsAllAPI,
+    # Caché
+    CacheStatsAPI,
+    # Métricas
+    MetricsAPI,
+    # Búsqueda
+    SearchAPI
 )
 
 def register_routes(app):
@@ -24,16 +30,20 @@ def register_routes(app):
 
     # ---- Posts ----
     app.add_url_rule("/api/posts", view_func=PostListAPI.as_view("post_list"))
+    app.add_url_rule("/api/posts:batch", view_func=PostBatchAPI.as_view("post_batch"))
     app.add_url_rule("/api/posts/<int:post_id>", view_func=PostDetailAPI.as_view("post_detail"))
 
     # ---- Comentarios ----
     app.add_url_rule("/api/posts/<int:post_id>/comments", view_func=CommentListAPI.as_view("comment_list"))
+    app.add_url_rule("/api/posts/<int:post_id>/comments:batch", view_func=CommentBatchAPI.as_view("comment_batch"))
     app.add_url_rule("/api/comments/<int:comment_id>", view_func=CommentDeleteAPI.as_view("comment_delete"))
     app.add_url_rule("/api/comments/<int:comment_id>/edit", view_func=CommentUpdateAPI.as_view("comment_update"))
 
     # ---- Categorías ----
     app.add_url_rule("/api/categories", view_func=CategoryListAPI.as_view("category_list"))
+    app.add_url_rule("/api/categories:batch", view_func=CategoryBatchAPI.as_view("category_batch"))
     app.add_url_rule("/api/categories/<int:category_id>", view_func=CategoryDetailAPI.as_view("category_detail"))
+    app.add_url_rule("/api/categories/<int:category_id>/posts", view_func=CategoryPostsAPI.as_view("category_posts"))
 
     # ---- Usuarios (admin) ----
     app.add_url_rule("/api/users", view_func=UserListAPI.as_view("user_list"))
@@ -45,3 +55,11 @@ def register_routes(app):
     # ---- Reviews global ----
     app.add_url_rule("/api/reviews", view_func=ReviewsAllAPI.as_view("reviews_all"))
 
+    # ---- Búsqueda ----
+    app.add_url_rule("/api/search", view_func=SearchAPI.as_view("search"))
+
+    # ---- Caché ----
+    app.add_url_rule("/api/cache/stats", view_func=CacheStatsAPI.as_view("cache_stats"))
+
+    # ---- Métricas ----
+    app.add_url_rule("/api/metrics", view_func=MetricsAPI.as_view("metrics"))
@@ -0,0 +1,51 @@
+# app/routing.py
+"""
+Ruteo de lecturas a réplicas (DATABASE_REPLICA_URLS).
+
+Los SELECT de requests GET/HEAD van a una réplica elegida al azar, la misma
+para toda la sesión (un request ve una sola réplica, no mezcla atrasos). Todo lo
+demás va al primario: las escrituras, los requests que no son de lectura, el
+código fuera de un request (CLI, seed) y cualquier lectura que venga después
+de una escritura en la misma sesión (que dura un request), así nadie lee una
+réplica atrasada justo después de escribir.
+
+Sin réplicas configuradas se comporta igual que la sesión de Flask-SQLAlchemy.
+"""
+import random
+
+from flask import has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql import Select, CompoundSelect
+from sqlalchemy.sql.dml import UpdateBase
+
+REPLICA_PREFIX = "replica_"
+READ_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+
+def replica_engines(engines: dict) -> list:
+    return [e for k, e in engines.items() if k and k.startswith(REPLICA_PREFIX)]
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._reads_from_replica(clause):
+            replica = self.info.get("db_replica")
+            if replica is None:
+                replicas = replica_engines(self._db.engines)
+                if replicas:
+                    replica = self.info["db_replica"] = random.choice(replicas)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _reads_from_replica(self, clause) -> bool:
+        if self._flushing or isinstance(clause, UpdateBase):
+            # escritura (flush o INSERT/UPDATE/DELETE Core): el resto de la sesión lee del primario
+            self.info["db_primary"] = True
+            return False
+        return (
+            isinstance(clause, (Select, CompoundSelect))
+            and not self.info.get("db_primary")
+            and has_request_context()
+            and request.method in READ_METHODS
+        )
@@ -32,6 +32,9 @@ class PostSchema(Schema):
     usuario_id  = fields.Int(dump_only=True)   # <- lo tomamos del JWT
     is_published = fields.Bool()
     updated_at  = fields.DateTime(dump_only=True)
+    extracto = fields.Str(dump_only=True)   # <- se calcula al guardar contenido
+    comment_count = fields.Int(dump_only=True)   # <- los mantiene app/activity.py
+    last_comment_at = fields.DateTime(dump_only=True)
 
 class ComentarioSchema(Schema):
     id  = fields.Int(dump_only=True)
@@ -40,6 +43,7 @@ class ComentarioSchema(Schema):
     usuario_id = fields.Int(dump_only=True)   # <- del JWT
     post_id = fields.Int(dump_only=True)   # <- suele venir en la URL /posts/<id>/comments
     is_visible = fields.Bool()
+    updated_at = fields.DateTime(dump_only=True)
 
 class CategoriaSchema(Schema):
     id = fields.Int(dump_only=True)
@@ -51,3 +55,12 @@ class PostCategoriaSchema(Schema):
     categoria_id = fields.Int(required=True)
 
 
+# Instancias compartidas: los Schema no guardan estado entre load()/dump(), así
+# que se construyen una sola vez por proceso (o en el master, con preload)
+register_schema = RegisterSchema()
+login_schema = LoginSchema()
+usuario_schema = UsuarioSchema()
+# el extracto y los contadores salen solo con ?fields=
+post_schema = PostSchema(exclude=("extracto", "comment_count", "last_comment_at"))
+comentario_schema = ComentarioSchema()
+categoria_schema = CategoriaSchema()
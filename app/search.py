@@ -0,0 +1,249 @@
+# app/search.py
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, defaultdict
+
+from flask import request
+from sqlalchemy import event, func, text
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import Post, Comentario
+
+POST = "post"
+COMMENT = "comment"
+
+
+# =========================
+#        Backends
+# =========================
+class MySQLFulltextBackend:
+    """
+    Índices FULLTEXT de MySQL (ft_posts_titulo_contenido, ft_comentarios_texto).
+    InnoDB los mantiene solo, así que apply() y rebuild() no tienen nada que hacer.
+    """
+
+    SQL = text(
+        "SELECT 'post' AS kind, id, MATCH(titulo, contenido) AGAINST (:q) AS score "
+        "FROM posts WHERE is_published = 1 AND MATCH(titulo, contenido) AGAINST (:q) "
+        "UNION ALL "
+        "SELECT 'comment' AS kind, id, MATCH(texto) AGAINST (:q) AS score "
+        "FROM comentarios WHERE is_visible = 1 AND MATCH(texto) AGAINST (:q) "
+        "ORDER BY score DESC, id DESC LIMIT :limit OFFSET :offset"
+    )
+
+    def search(self, q: str, limit: int, offset: int):
+        rows = db.session.execute(self.SQL, {"q": q, "limit": limit, "offset": offset})
+        return [(kind, id_, float(score)) for kind, id_, score in rows]
+
+    def apply(self, changes):
+        pass
+
+    def ensure_built(self):
+        pass
+
+    def refresh_if_stale(self, every: int):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def reset(self):
+        pass
+
+
+def tokenize(texto: str):
+    """Minúsculas, sin tildes, solo palabras de 2+ caracteres."""
+    plano = unicodedata.normalize("NFKD", texto.lower())
+    plano = "".join(ch for ch in plano if not unicodedata.combining(ch))
+    return [t for t in re.findall(r"\w+", plano) if len(t) > 1]
+
+
+# Cambia con cualquier alta, baja o edición de posts y comentarios, la haga
+# este proceso u otro (los inserts en lote también ponen updated_at).
+CONTENT_VERSION = db.select(
+    db.select(func.count()).select_from(Post).scalar_subquery(),
+    db.select(func.max(Post.updated_at)).scalar_subquery(),
+    db.select(func.count()).select_from(Comentario).scalar_subquery(),
+    db.select(func.max(Comentario.updated_at)).scalar_subquery(),
+)
+
+
+class InvertedIndexBackend:
+    """
+    Índice invertido en memoria del proceso (para desarrollo/tests con SQLite).
+    Ranking TF-IDF; se construye completo en la primera búsqueda y después se
+    actualiza de forma incremental con cada commit del mismo proceso.
+
+    Los commits de otros workers no le llegan: cada SEARCH_REFRESH segundos
+    refresh_if_stale() compara CONTENT_VERSION con la del último build y
+    reconstruye si cambió (también después de escrituras propias).
+    """
+
+    def __init__(self):
+        self._postings = defaultdict(dict)   # token -> {(kind, id): tf}
+        self._docs = {}                      # (kind, id) -> tokens
+        self._built = False
+        self._version = None                 # CONTENT_VERSION del último build
+        self._checked_at = None
+        self._lock = threading.RLock()
+
+    def _add(self, key, texto):
+        self._remove(key)
+        tf = Counter(tokenize(texto))
+        for token, n in tf.items():
+            self._postings[token][key] = n
+        self._docs[key] = tuple(tf)
+
+    def _remove(self, key):
+        for token in self._docs.pop(key, ()):
+            docs = self._postings.get(token)
+            if docs is not None:
+                docs.pop(key, None)
+                if not docs:
+                    del self._postings[token]
+
+    def apply(self, changes):
+        with self._lock:
+            if not self._built:
+                return  # el build inicial va a leer el estado ya confirmado
+            for key, texto in changes:
+                if texto is None:
+                    self._remove(key)
+                else:
+                    self._add(key, texto)
+
+    def reset(self):
+        """Descarta el índice; se reconstruye en la próxima búsqueda."""
+        with self._lock:
+            self._built = False
+
+    def ensure_built(self):
+        with self._lock:
+            if not self._built:
+                self.rebuild()
+
+    def refresh_if_stale(self, every: int):
+        """ensure_built() y, pasados `every` segundos (0: nunca), reconstruye si la base cambió."""
+        with self._lock:
+            if not self._built:
+                self.rebuild()
+                return
+            if every <= 0 or time.monotonic() - self._checked_at < every:
+                return
+            self._checked_at = time.monotonic()
+            if tuple(db.session.execute(CONTENT_VERSION).one()) != self._version:
+                self.rebuild()
+
+    def rebuild(self):
+        with self._lock:
+            # la versión se lee antes: lo que se escriba durante el build dispara el próximo
+            self._version = tuple(db.session.execute(CONTENT_VERSION).one())
+            self._checked_at = time.monotonic()
+            self._postings.clear()
+            self._docs.clear()
+            posts = db.select(Post.id, Post.titulo, Post.contenido).where(Post.is_published == True)
+            for id_, titulo, contenido in db.session.execute(posts.execution_options(yield_per=1000)):
+                self._add((POST, id_), f"{titulo} {contenido}")
+            coms = db.select(Comentario.id, Comentario.texto).where(Comentario.is_visible == True)
+            for id_, texto in db.session.execute(coms.execution_options(yield_per=1000)):
+                self._add((COMMENT, id_), texto)
+            self._built = True
+
+    def search(self, q: str, limit: int, offset: int):
+        with self._lock:
+            self.ensure_built()
+            total = len(self._docs) or 1
+            scores = defaultdict(float)
+            for token in set(tokenize(q)):
+                docs = self._postings.get(token, {})
+                if not docs:
+                    continue
+                idf = math.log(1 + total / len(docs))
+                for key, tf in docs.items():
+                    scores[key] += (1 + math.log(tf)) * idf
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], -kv[0][1]))
+        return [(kind, id_, round(score, 6)) for (kind, id_), score in ranked[offset:offset + limit]]
+
+
+# =========================
+#       Servicio
+# =========================
+class SearchIndex:
+    def __init__(self):
+        self.backend = None
+        self.refresh = 30
+
+    def init_app(self, app):
+        kind = app.config.get("SEARCH_BACKEND", "auto")
+        if kind == "auto":
+            kind = "mysql" if app.config["SQLALCHEMY_DATABASE_URI"].startswith("mysql") else "memory"
+        self.backend = MySQLFulltextBackend() if kind == "mysql" else InvertedIndexBackend()
+        self.refresh = app.config.get("SEARCH_REFRESH", 30)
+        app.before_request(self._prepare)
+        app.extensions["search"] = self
+
+    def _prepare(self):
+        # El build (inicial, después de un reset() o por cambios de otro worker)
+        # corre antes de la vista, fuera de su @query_budget
+        if request.endpoint == "search":
+            self.backend.refresh_if_stale(self.refresh)
+
+    def search(self, q: str, limit: int, offset: int):
+        return self.backend.search(q, limit, offset)
+
+    def rebuild(self):
+        self.backend.rebuild()
+
+    def apply(self, changes):
+        """Cambios [((kind, id), texto o None)] ya confirmados (p. ej. inserts en lote)."""
+        self.backend.apply(changes)
+
+    def reset(self):
+        self.backend.reset()
+
+
+search_index = SearchIndex()
+
+
+# =========================
+#  Actualización incremental
+# =========================
+# Se toma el texto en el flush (después del commit los atributos están
+# expirados) y se aplica al índice solo si el commit se confirma.
+def _change_for(obj, deleted: bool):
+    if isinstance(obj, Post):
+        visible = not deleted and obj.is_published is not False
+        return (POST, obj.id), f"{obj.titulo} {obj.contenido}" if visible else None
+    if isinstance(obj, Comentario):
+        visible = not deleted and obj.is_visible is not False
+        return (COMMENT, obj.id), obj.texto if visible else None
+    return None
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session, flush_context):
+    pending = session.info.setdefault("search_changes", [])
+    for obj in (*session.new, *session.dirty):
+        change = _change_for(obj, deleted=False)
+        if change:
+            pending.append(change)
+    for obj in session.deleted:
+        change = _change_for(obj, deleted=True)
+        if change:
+            pending.append(change)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session):
+    changes = session.info.pop("search_changes", None)
+    if changes and search_index.backend is not None:
+        search_index.backend.apply(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session):
+    session.info.pop("search_changes", None)
@@ -0,0 +1,119 @@
+# app/serializers.py
+from datetime import datetime
+
+from flask import request
+from marshmallow import fields
+
+from app import db
+from app.models import Usuario, Post, Comentario, Categoria
+from app.schemas import UsuarioSchema, PostSchema, ComentarioSchema, CategoriaSchema
+
+
+def _identity(value):
+    return value
+
+
+def _converter(field):
+    """
+    Función valor -> JSON equivalente a field._serialize para los tipos que
+    usamos en app/schemas.py; cualquier otro campo delega en marshmallow.
+    """
+    kind = type(field)
+    if kind is fields.Integer and not field.as_string:
+        return int
+    if kind is fields.Boolean:
+        return _identity
+    if kind in (fields.String, fields.Email):
+        return str
+    if kind is fields.DateTime and (field.format or field.DEFAULT_FORMAT) in ("iso", "iso8601"):
+        return datetime.isoformat
+    return lambda value, _f=field: _f._serialize(value, None, None)
+
+
+class InvalidFields(ValueError):
+    """Se pidió en ?fields= un campo que el recurso no tiene."""
+
+
+class RowEncoder:
+    """
+    Serializador "compilado" a partir de un Schema: se arma una sola vez por
+    proceso y convierte filas de un select() de columnas (sin hidratar objetos
+    ORM) en dicts idénticos a los de Schema().dump().
+
+    Los campos de optional (p. ej. el extracto de los posts) no salen por
+    defecto; only() devuelve la proyección para ?fields=, que selecciona y
+    serializa solo esas columnas (más el id).
+    """
+
+    def __init__(self, schema_cls, model, optional=()):
+        schema = schema_cls()
+        self._available = {
+            name: (_converter(field), getattr(model, field.attribute or name))
+            for name, field in schema.dump_fields.items()
+        }
+        self._projections = {}
+        self._project([name for name in self._available if name not in optional])
+
+    def _project(self, names):
+        self.names = tuple(names)
+        self._fields = [(name, self._available[name][0]) for name in self.names]
+        self.columns = [self._available[name][1] for name in self.names]
+
+    @property
+    def available(self):
+        return tuple(self._available)
+
+    def only(self, names) -> "RowEncoder":
+        """Encoder con el id y los campos pedidos, en el orden del Schema (cacheado por conjunto)."""
+        pedidos = set(names) | ({"id"} & set(self._available))
+        key = frozenset(pedidos)
+        encoder = self._projections.get(key)
+        if encoder is None:
+            encoder = object.__new__(RowEncoder)
+            encoder._available = self._available
+            encoder._projections = self._projections
+            encoder._project([name for name in self._available if name in pedidos])
+            self._projections[key] = encoder
+        return encoder
+
+    def select(self, *extra):
+        """
+        select() con las columnas en el orden que espera dump(). extra agrega
+        al final columnas que la vista necesita (orden del keyset, visibilidad,
+        updated_at) pero no se serializan.
+        """
+        columns = list(self.columns)
+        keys = {c.key for c in columns}
+        for col in extra:
+            if col.key not in keys:
+                columns.append(col)
+                keys.add(col.key)
+        return db.select(*columns)
+
+    def dump(self, row) -> dict:
+        return {
+            name: None if value is None else conv(value)
+            for (name, conv), value in zip(self._fields, row)
+        }
+
+    def dump_many(self, rows) -> list:
+        dump = self.dump
+        return [dump(row) for row in rows]
+
+
+def parse_fields(encoder: RowEncoder) -> RowEncoder:
+    """?fields=titulo,extracto -> proyección de encoder (sin el parámetro, encoder tal cual)."""
+    raw = request.args.get("fields")
+    if raw is None:
+        return encoder
+    pedidos = {f.strip() for f in raw.split(",") if f.strip()}
+    invalidos = pedidos - set(encoder.available)
+    if invalidos:
+        raise InvalidFields(f"fields inválido: {', '.join(sorted(invalidos))}")
+    return encoder.only(pedidos)
+
+
+usuario_encoder = RowEncoder(UsuarioSchema, Usuario)
+post_encoder = RowEncoder(PostSchema, Post, optional=("extracto", "comment_count", "last_comment_at"))
+comentario_encoder = RowEncoder(ComentarioSchema, Comentario)
+categoria_encoder = RowEncoder(CategoriaSchema, Categoria)
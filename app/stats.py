@@ -0,0 +1,121 @@
+# app/stats.py
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, func
+
+from app import db
+from app.models import Usuario, Post, Comentario, Contador, PostsPorDia
+
+contadores = Contador.__table__
+posts_por_dia = PostsPorDia.__table__
+
+# modelo -> nombre del contador
+CONTADORES = {Post: "posts", Comentario: "comentarios", Usuario: "usuarios"}
+
+
+# =========================
+#   Upsert "sumar delta"
+# =========================
+def _upsert_add(connection, table, key_col: str, key, value_col: str, delta: int):
+    """INSERT ... (o suma delta si la fila ya existe), atómico en MySQL y SQLite."""
+    values = {key_col: key, value_col: delta}
+    if connection.dialect.name == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table).values(**values)
+        stmt = stmt.on_duplicate_key_update({value_col: table.c[value_col] + delta})
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(table).values(**values).on_conflict_do_update(
+            index_elements=[key_col], set_={value_col: table.c[value_col] + delta}
+        )
+    connection.execute(stmt)
+
+
+# =========================
+#  Mantenimiento por eventos
+# =========================
+# Corren sobre la misma conexión del flush, así que el contador se confirma o
+# se revierte junto con la fila que lo modifica.
+def _on_change(delta: int):
+    def listener(mapper, connection, target):
+        _upsert_add(connection, contadores, "nombre", CONTADORES[type(target)], "valor", delta)
+        if isinstance(target, Post) and target.fecha_creacion is not None:
+            _upsert_add(connection, posts_por_dia, "dia", target.fecha_creacion.date(), "cantidad", delta)
+    return listener
+
+for _model in CONTADORES:
+    event.listen(_model, "after_insert", _on_change(+1))
+    event.listen(_model, "after_delete", _on_change(-1))
+
+
+def record_bulk_insert(model, rows):
+    """
+    Equivalente a los listeners after_insert para inserts Core en lote (que no
+    disparan eventos de mapper): suma len(rows) y los buckets diarios.
+    """
+    if not rows:
+        return
+    connection = db.session.connection()
+    _upsert_add(connection, contadores, "nombre", CONTADORES[model], "valor", len(rows))
+    if model is Post:
+        por_dia = Counter(r["fecha_creacion"].date() for r in rows if r.get("fecha_creacion"))
+        for dia, n in por_dia.items():
+            _upsert_add(connection, posts_por_dia, "dia", dia, "cantidad", n)
+
+
+# =========================
+#        Lectura
+# =========================
+def read_stats(include_week: bool = False) -> dict:
+    valores = dict(db.session.execute(db.select(contadores.c.nombre, contadores.c.valor)).all())
+    resp = {
+        "total_posts":    valores.get("posts", 0),
+        "total_comments": valores.get("comentarios", 0),
+        "total_users":    valores.get("usuarios", 0),
+    }
+    if include_week:
+        resp["posts_last_week"] = posts_since(datetime.now() - timedelta(days=7))
+    return resp
+
+
+def posts_since(desde: datetime) -> int:
+    """
+    Posts con fecha_creacion >= desde: días completos desde los buckets diarios
+    más la fracción del primer día (rango acotado sobre ix_posts_fecha_creacion).
+    """
+    primer_dia_completo = desde.date() + timedelta(days=1)
+    dias = db.session.scalar(
+        db.select(func.coalesce(func.sum(posts_por_dia.c.cantidad), 0))
+        .where(posts_por_dia.c.dia >= primer_dia_completo)
+    ) or 0
+    fraccion = db.session.scalar(
+        db.select(func.count()).select_from(Post).where(
+            Post.fecha_creacion >= desde,
+            Post.fecha_creacion < datetime.combine(primer_dia_completo, datetime.min.time()),
+        )
+    ) or 0
+    return int(dias) + fraccion
+
+
+# =========================
+#      Reconciliación
+# =========================
+def reconcile():
+    """Recalcula todos los contadores desde cero (COUNT/GROUP BY) en una transacción."""
+    db.session.execute(contadores.delete())
+    db.session.execute(posts_por_dia.delete())
+    db.session.execute(contadores.insert(), [
+        {"nombre": nombre, "valor": db.session.scalar(db.select(func.count()).select_from(model)) or 0}
+        for model, nombre in CONTADORES.items()
+    ])
+    dia = func.date(Post.fecha_creacion)
+    filas = db.session.execute(
+        db.select(dia, func.count()).where(Post.fecha_creacion.is_not(None)).group_by(dia)
+    ).all()
+    if filas:
+        db.session.execute(posts_por_dia.insert(), [
+            {"dia": d if not isinstance(d, str) else datetime.strptime(d, "%Y-%m-%d").date(), "cantidad": n}
+            for d, n in filas
+        ])
+    db.session.commit()
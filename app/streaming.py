@@ -0,0 +1,52 @@
+# app/streaming.py
+from flask import Response, current_app, request, stream_with_context
+
+from app import db
+
+# Formatos de streaming soportados (?stream=ndjson | ?stream=json)
+NDJSON = "ndjson"
+JSON_ARRAY = "json"
+
+
+def requested_stream_format():
+    """
+    Devuelve el formato de streaming pedido por el cliente o None.
+    Se activa con ?stream=ndjson|json o con Accept: application/x-ndjson.
+    """
+    fmt = request.args.get("stream")
+    if fmt in (NDJSON, JSON_ARRAY):
+        return fmt
+    if request.accept_mimetypes.best == "application/x-ndjson":
+        return NDJSON
+    return None
+
+
+def stream_query(stmt, encoder, fmt: str):
+    """
+    Ejecuta `stmt` (el select() de un RowEncoder) con yield_per (cursor del
+    lado del servidor en MySQL) y va escribiendo cada fila serializada, sin
+    armar nunca la lista completa.
+    """
+    batch = current_app.config.get("STREAM_BATCH_SIZE", 500)
+    dumps = current_app.json.dumps
+
+    def rows():
+        result = db.session.execute(stmt.execution_options(yield_per=batch))
+        for row in result:
+            yield encoder.dump(row)
+
+    def ndjson():
+        for item in rows():
+            yield dumps(item) + "\n"
+
+    def json_array():
+        yield "["
+        first = True
+        for item in rows():
+            yield dumps(item) if first else "," + dumps(item)
+            first = False
+        yield "]"
+
+    if fmt == NDJSON:
+        return Response(stream_with_context(ndjson()), mimetype="application/x-ndjson")
+    return Response(stream_with_context(json_array()), mimetype="application/json")
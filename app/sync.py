@@ -0,0 +1,130 @@
+# app/sync.py
+"""
+Sincronización incremental: ?updated_since=<ISO 8601> en /api/posts y en
+/api/posts/<id>/comments.
+
+Devuelve las filas con updated_at >= updated_since (paginadas por keyset sobre
+(updated_at, id)) y en "deleted" los ids que el cliente tiene que borrar: los
+que se despublicaron/ocultaron y, en la primera página, los tombstones de los
+borrados. El cliente guarda el sync_token de la última página y lo manda como
+updated_since la próxima vez (la comparación es inclusiva, así que puede
+recibir de nuevo alguna fila ya vista; aplicar los cambios tiene que ser
+idempotente).
+"""
+from datetime import datetime, timedelta
+
+from flask import current_app, request
+from sqlalchemy import event
+
+from app import db
+from app.models import Post, Comentario, Tombstone
+from app.pagination import Keyset
+
+POST = "post"
+COMMENT = "comment"
+
+tombstones = Tombstone.__table__
+
+POSTS_SYNC_KEYSET = Keyset(Post.updated_at, Post.id, descending=False)
+COMMENTS_SYNC_KEYSET = Keyset(Comentario.updated_at, Comentario.id, descending=False)
+
+
+class InvalidSince(ValueError):
+    """updated_since no es una fecha ISO 8601."""
+
+
+class SinceExpired(ValueError):
+    """updated_since es anterior a la retención de tombstones: hace falta una sincronización completa."""
+
+
+def parse_since(raw: str) -> datetime:
+    try:
+        since = datetime.fromisoformat(raw)
+    except (TypeError, ValueError):
+        raise InvalidSince("updated_since debe ser una fecha ISO 8601 (p. ej. 2025-01-31T12:00:00).")
+    if since.tzinfo is not None:
+        since = since.astimezone().replace(tzinfo=None)  # las fechas del modelo son naive, hora local
+    dias = current_app.config.get("SYNC_TOMBSTONE_DAYS", 90)
+    if since < datetime.now() - timedelta(days=dias):
+        raise SinceExpired(f"updated_since es anterior a {dias} días; hacé una sincronización completa.")
+    return since
+
+
+# =========================
+#        Tombstones
+# =========================
+# Misma conexión del flush que borra la fila: el tombstone se confirma o se
+# revierte con ella, también en los borrados en cascada (comentarios de un post).
+def _on_delete(kind):
+    def listener(mapper, connection, target):
+        connection.execute(tombstones.insert().values(
+            kind=kind, object_id=target.id,
+            post_id=target.id if kind == POST else target.post_id,
+            deleted_at=datetime.now(),
+        ))
+    return listener
+
+event.listen(Post, "after_delete", _on_delete(POST))
+event.listen(Comentario, "after_delete", _on_delete(COMMENT))
+
+
+def prune(days: int) -> int:
+    """Borra los tombstones más viejos que la retención; devuelve cuántos."""
+    result = db.session.execute(
+        tombstones.delete().where(tombstones.c.deleted_at < datetime.now() - timedelta(days=days)))
+    db.session.commit()
+    return result.rowcount
+
+
+# =========================
+#         Cambios
+# =========================
+def changes(stmt, keyset: Keyset, visible: str, since: datetime, tombstones_query):
+    """
+    Aplica el keyset (limit/cursor del request) a stmt, que ya filtra
+    updated_at >= since. Devuelve (filas visibles, ids borrados, next_cursor,
+    sync_token); las filas no visibles y los tombstones de tombstones_query
+    (solo en la primera página) van a los borrados.
+    """
+    rows, next_cursor = keyset.paginate(stmt)
+    items = [r for r in rows if getattr(r, visible)]
+    deleted = [r.id for r in rows if not getattr(r, visible)]
+    marcas = [since, *(r.updated_at for r in rows if r.updated_at is not None)]
+    if not request.args.get("cursor"):
+        for object_id, deleted_at in db.session.execute(tombstones_query):
+            deleted.append(object_id)
+            marcas.append(deleted_at)
+    return items, deleted, next_cursor, max(marcas).isoformat()
+
+
+def tombstones_stmt(since: datetime, *filters):
+    return (db.select(tombstones.c.object_id, tombstones.c.deleted_at)
+            .where(*filters, tombstones.c.deleted_at >= since)
+            .order_by(tombstones.c.deleted_at, tombstones.c.id))
+
+
+# Filtros de cada recurso (también los usa flask explain-check)
+def post_changes_filter(stmt, since: datetime):
+    return stmt.where(Post.updated_at >= since)
+
+
+def post_tombstones(since: datetime):
+    return tombstones_stmt(since, tombstones.c.kind == POST)
+
+
+def comment_changes_filter(stmt, post_id: int, since: datetime):
+    return stmt.where(Comentario.post_id == post_id, Comentario.updated_at >= since)
+
+
+def comment_tombstones(post_id: int, since: datetime):
+    return tombstones_stmt(since, tombstones.c.post_id == post_id, tombstones.c.kind == COMMENT)
+
+
+def post_changes(stmt, since: datetime):
+    return changes(post_changes_filter(stmt, since), POSTS_SYNC_KEYSET, "is_published", since,
+                   post_tombstones(since))
+
+
+def comment_changes(stmt, post_id: int, since: datetime):
+    return changes(comment_changes_filter(stmt, post_id, since), COMMENTS_SYNC_KEYSET, "is_visible", since,
+                   comment_tombstones(post_id, since))
@@ -0,0 +1,167 @@
+# app/synthetic.py
+"""
+Generador de datos sintéticos para carga y benchmarks (ver seed.py --sintetico).
+
+Todo sale de un random.Random(semilla) y de una fecha de corte fija, así que
+la misma semilla produce el mismo dataset (salvo las sales de bcrypt) tanto en
+MySQL como en SQLite. Inserta con inserts Core en lotes y ids explícitos.
+"""
+import bisect
+import itertools
+import random
+from array import array
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_
+
+from app import db
+from app.models import Usuario, UserCredentials, Post, Comentario, Categoria, post_categoria, extracto_de
+from app.passwords import passwords
+from app.stats import reconcile
+from app import activity
+
+PALABRAS = (
+    "receta viaje tecnología salud finanzas mascotas moda noticias tutorial reseña "
+    "python flask api datos ciudad montaña playa café libro película música deporte "
+    "huerta cocina ahorro inversión perro gato consejos guía rápida completa nueva mejor"
+).split()
+
+# Pool chico de hashes: bcrypt por usuario haría tardar horas la generación
+POOL_CLAVES = 16
+
+
+def _zipf_cum_weights(n: int, s: float):
+    """Pesos acumulados 1/rank^s para sampleo tipo Zipf con random.choices."""
+    return list(itertools.accumulate(1.0 / (r ** s) for r in range(1, n + 1)))
+
+
+def _frase(rng, n):
+    return " ".join(rng.choice(PALABRAS) for _ in range(n))
+
+
+def _lotes(total: int, batch: int):
+    for start in range(0, total, batch):
+        yield start, min(start + batch, total)
+
+
+def _next_id(model):
+    return (db.session.scalar(db.select(db.func.max(model.id))) or 0) + 1
+
+
+def _validar(usuarios, posts, comentarios, anios, batch):
+    if min(usuarios, posts, comentarios) < 0:
+        raise ValueError("usuarios, posts y comentarios no pueden ser negativos")
+    if (posts or comentarios) and usuarios < 1:
+        raise ValueError("hace falta al menos 1 usuario para generar posts o comentarios")
+    if comentarios and posts < 1:
+        raise ValueError("hace falta al menos 1 post para generar comentarios")
+    if anios < 1 or batch < 1:
+        raise ValueError("anios y batch deben ser al menos 1")
+
+
+def generate(usuarios=1000, posts=5000, comentarios=20000, anios=3, semilla=42,
+             hasta=datetime(2025, 12, 31), batch=10000, zipf_s=1.1, log=print):
+    """
+    Agrega el dataset a lo que ya haya en la base. ValueError si los tamaños no
+    alcanzan (p. ej. comentarios sin posts) o si los nombres de esta corrida
+    ya existen.
+    """
+    _validar(usuarios, posts, comentarios, anios, batch)
+    rng = random.Random(semilla)
+    fin = hasta.timestamp()
+    inicio = (hasta - timedelta(days=365 * anios)).timestamp()
+    span = fin - inicio
+
+    # ---- Categorías (se reutilizan las existentes) ----
+    cat_ids = list(db.session.scalars(db.select(Categoria.id).order_by(Categoria.id)))
+    if not cat_ids:
+        db.session.execute(db.insert(Categoria), [{"nombre": f"Categoría {i}"} for i in range(10)])
+        db.session.commit()
+        cat_ids = list(db.session.scalars(db.select(Categoria.id).order_by(Categoria.id)))
+    cat_weights = _zipf_cum_weights(len(cat_ids), 1.0)
+
+    # ---- Usuarios: altas repartidas en el período, en orden cronológico ----
+    hashes = [passwords.hash(f"password{k}") for k in range(POOL_CLAVES)]
+    primer_usuario = _next_id(Usuario)
+    primer_cred = _next_id(UserCredentials)
+    # username/email únicos por corrida: prefijo con el primer id libre
+    prefijo = f"sint{primer_usuario}_"
+    ocupado = db.session.scalar(db.select(Usuario.id).where(or_(
+        Usuario.username.startswith(prefijo, autoescape=True),
+        Usuario.email.startswith(prefijo, autoescape=True),
+    )).limit(1))
+    if usuarios and ocupado is not None:
+        raise ValueError(f"ya hay usuarios con el prefijo {prefijo!r}")
+    alta = array("d")
+    for a, b in _lotes(usuarios, batch):
+        filas, creds = [], []
+        for i in range(a, b):
+            uid = primer_usuario + i
+            nombre = f"{prefijo}{i}"
+            ts = inicio + span * 0.8 * (i / max(usuarios, 1)) + rng.random() * 3600
+            alta.append(ts)
+            r = rng.random()
+            filas.append({
+                "id": uid, "username": nombre, "email": f"{nombre}@example.com",
+                "role": "admin" if r < 0.001 else ("moderator" if r < 0.01 else "user"),
+                "is_active": rng.random() > 0.03,
+                "created_at": datetime.fromtimestamp(ts),
+            })
+            creds.append({"id": primer_cred + i, "user_id": uid, "password_hash": hashes[i % POOL_CLAVES]})
+        db.session.execute(db.insert(Usuario), filas)
+        db.session.execute(db.insert(UserCredentials), creds)
+        db.session.commit()
+        log(f"  usuarios {b}/{usuarios}")
+
+    # ---- Posts: autores con sesgo Zipf, fecha posterior al alta del autor ----
+    autor_weights = _zipf_cum_weights(usuarios, zipf_s)
+    autor_perm = list(range(usuarios))
+    rng.shuffle(autor_perm)
+    primer_post = _next_id(Post)
+    creado = array("d")
+    for a, b in _lotes(posts, batch):
+        filas, links = [], []
+        for i in range(a, b):
+            pid = primer_post + i
+            k = autor_perm[bisect.bisect(autor_weights, rng.random() * autor_weights[-1])]
+            ts = alta[k] + rng.random() * (fin - alta[k])
+            creado.append(ts)
+            fecha = datetime.fromtimestamp(ts)
+            titulo = _frase(rng, rng.randint(3, 8)).capitalize()
+            contenido = "\n\n".join(_frase(rng, rng.randint(20, 60)) for _ in range(rng.randint(1, 6)))
+            filas.append({
+                "id": pid, "titulo": titulo, "contenido": contenido, "extracto": extracto_de(contenido),
+                "usuario_id": primer_usuario + k, "is_published": rng.random() > 0.1,
+                "fecha_creacion": fecha, "updated_at": fecha,
+            })
+            elegidas = {cat_ids[bisect.bisect(cat_weights, rng.random() * cat_weights[-1])]
+                        for _ in range(rng.randint(1, 3))}
+            links.extend({"post_id": pid, "categoria_id": c} for c in sorted(elegidas))
+        db.session.execute(db.insert(Post), filas)
+        db.session.execute(post_categoria.insert(), links)
+        db.session.commit()
+        log(f"  posts {b}/{posts}")
+
+    # ---- Comentarios: cantidad por post tipo Zipf (pocos posts muy comentados) ----
+    post_weights = _zipf_cum_weights(posts, zipf_s)
+    post_perm = list(range(posts))
+    rng.shuffle(post_perm)
+    primer_com = _next_id(Comentario)
+    for a, b in _lotes(comentarios, batch):
+        filas = []
+        for i in range(a, b):
+            k = post_perm[bisect.bisect(post_weights, rng.random() * post_weights[-1])]
+            fecha = datetime.fromtimestamp(creado[k] + rng.random() * (fin - creado[k]))
+            filas.append({
+                "id": primer_com + i, "texto": _frase(rng, rng.randint(4, 30)),
+                "usuario_id": primer_usuario + rng.randrange(usuarios),
+                "post_id": primer_post + k, "is_visible": rng.random() > 0.05,
+                "fecha_creacion": fecha, "updated_at": fecha,
+            })
+        db.session.execute(db.insert(Comentario), filas)
+        db.session.commit()
+        log(f"  comentarios {b}/{comentarios}")
+
+    # Los inserts Core no disparan los listeners de contadores ni de actividad por post
+    reconcile()
+    activity.reconcile(batch)
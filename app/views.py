@@ -1,59 +1,57 @@
-from flask import request, jsonify
+from flask import request, jsonify, abort
 from flask.views import MethodView
 from marshmallow import ValidationError
-from functools import wraps
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
 
 #IMPORTAMOS LO NECESARIO
-from passlib.hash import bcrypt
-from flask_jwt_extended import (
-    jwt_required, verify_jwt_in_request,
-    create_access_token, get_jwt, get_jwt_identity
-)
+from flask_jwt_extended import create_access_token
 
 from app import db
-from app.models import Usuario, UserCredentials, Post, Comentario, Categoria
+from app.models import Usuario, UserCredentials, Post, Comentario, Categoria, post_categoria
 
 from app.schemas import (
-    RegisterSchema, LoginSchema, UsuarioSchema, PostSchema, ComentarioSchema, CategoriaSchema
+    register_schema, login_schema, usuario_schema, post_schema, comentario_schema, categoria_schema
+)
+from app.pagination import (
+    InvalidCursor, page_response, parse_limit, encode_offset, decode_offset
+)
+from app.streaming import requested_stream_format, stream_query
+from app.cache import cache
+from app.passwords import passwords
+from app.ratelimit import ratelimit
+from app.identity import users
+from app.serializers import (
+    usuario_encoder, post_encoder, comentario_encoder, categoria_encoder, parse_fields, InvalidFields
 )
+from app.includes import parse_include, expand_posts, include_cache_tags, InvalidInclude
+from app.bulk import bulk_create_posts, bulk_create_comments, bulk_create_categories, InvalidBatch
+from app.querywatch import query_budget
+from app.conditional import conditional_json
+from app.sync import parse_since, post_changes, comment_changes, InvalidSince, SinceExpired
+from app.authz import authz, current_principal
+from app.activity import POST_SORTS, InvalidSort, parse_sort, activity_cache_tags
 
 # =========================
 #    RBAC / Ownership
 # =========================
-def role_required(*allowed_roles: str):
-    """Exige que el claim 'role' del JWT esté en allowed_roles."""
-    def decorator(fn):
-        @wraps(fn)
-        def wrapper(*args, **kwargs):
-            verify_jwt_in_request()
-            role = get_jwt().get("role")
-            if role not in allowed_roles:
-                return jsonify({"msg": "No tenés permiso para realizar esta acción."}), 403
-            return fn(*args, **kwargs)
-        return wrapper
-    return decorator
-
-def is_admin() -> bool:
-    return get_jwt().get("role") == "admin"
-
-def owns(owner_id: int) -> bool:
-    try:
-        uid = int(get_jwt_identity())  # lo pasamos a int para comparar
-    except (TypeError, ValueError):
-        uid = get_jwt_identity()
-    return is_admin() or owner_id == uid
+# Token y roles por endpoint: tabla RULES de app/authz.py (se aplica antes de
+# cada vista). Acá solo queda el chequeo de autoría, que necesita el recurso.
 
 # =======================
 #          AUTH
 # =======================
 class RegisterAPI(MethodView):
     def post(self):
+        # Límite por IP y por email antes de tocar la base o bcrypt (429 + Retry-After)
+        ratelimit.check_ip("register")
         try:
-            data = RegisterSchema().load(request.get_json() or {})
+            data = register_schema.load(request.get_json() or {})
             print("📩 Datos recibidos:", data)
         except ValidationError as err:
             print("❌ Errores de validación:", err.messages)
             return jsonify({"errors": err.messages}), 422
+        ratelimit.check_email("register", data["email"])
 
         # Verificar si ya existe usuario o email
         existe = Usuario.query.filter(
@@ -71,37 +69,56 @@ class RegisterAPI(MethodView):
         )
 
         # Crear credenciales (sin role, solo el hash)
-        cred = UserCredentials(usuario=u, password_hash=bcrypt.hash(data["password"]))
+        cred = UserCredentials(usuario=u, password_hash=passwords.hash(data["password"]))
 
         db.session.add_all([u, cred])
         db.session.commit()
 
         print("✅ Usuario creado correctamente:", u.username, "-", u.role)
-        return UsuarioSchema().dump(u), 201
+        return usuario_schema.dump(u), 201
 
 
 
 class LoginAPI(MethodView):
+    @query_budget(2)
     def post(self):
+        # Límite por IP y por email antes de tocar la base o bcrypt (429 + Retry-After)
+        ratelimit.check_ip("login")
         try:
-            data = LoginSchema().load(request.get_json() or {})
+            data = login_schema.load(request.get_json() or {})
         except ValidationError as err:
             return jsonify({"errors": err.messages}), 422
+        ratelimit.check_email("login", data["email"])
 
-        usuario = Usuario.query.filter_by(email=data["email"]).first()
+        usuario = (Usuario.query.options(joinedload(Usuario.credenciales))
+                   .filter_by(email=data["email"]).first())
         if not usuario or not usuario.is_active or not usuario.credenciales:
             return jsonify({"msg": "Credenciales inválidas."}), 401
-        if not bcrypt.verify(data["password"], usuario.credenciales.password_hash):
-            return jsonify({"msg": "Credenciales inválidas."}), 401
+        cred_id = usuario.credenciales.id
+        stored_hash = usuario.credenciales.password_hash
 
         # identity como string (el ID del usuario)
         identity = str(usuario.id) 
         claims   = {
             "role": usuario.role,
             "email": usuario.email,
-            "username": usuario.username
+            "username": usuario.username,
+            "tv": usuario.token_version,   # revocación (app/revocation.py)
         }
 
+        # Devolvemos la conexión al pool mientras bcrypt trabaja
+        db.session.rollback()
+        if not passwords.verify(data["password"], stored_hash):
+            return jsonify({"msg": "Credenciales inválidas."}), 401
+
+        # Si cambió BCRYPT_ROUNDS, aprovechamos que tenemos la clave en claro
+        if passwords.needs_rehash(stored_hash):
+            db.session.execute(
+                db.update(UserCredentials).where(UserCredentials.id == cred_id)
+                .values(password_hash=passwords.hash(data["password"]))
+            )
+            db.session.commit()
+
         access_token = create_access_token(
             identity=identity,
             additional_claims=claims
@@ -111,62 +128,148 @@ class LoginAPI(MethodView):
 
 
 class MeAPI(MethodView):
-    @jwt_required()
+    @query_budget(1)
     def get(self):
-        uid = int(get_jwt_identity())
-        u = Usuario.query.get(uid)
+        u = users.get(current_principal().id)  # caché de usuarios (app/identity.py)
         if not u:
             return jsonify({"msg": "Usuario no encontrado"}), 404
-        return UsuarioSchema().dump(u), 200
+        return u, 200
 
 
 # =======================
 #          POSTS
 # =======================
+POSTS_KEYSET = POST_SORTS["recent"]   # (fecha_creacion, id) desc; ?sort= elige otro (app/activity.py)
+
+def _posts_stmt(encoder, category_id=None, *extra):
+    """select() de encoder (con las columnas extra que necesita la vista), opcionalmente de una categoría."""
+    stmt = encoder.select(*extra)
+    if category_id is not None:
+        # join indexado por ix_post_categoria_categoria (categoria_id, post_id)
+        stmt = stmt.join(post_categoria, post_categoria.c.post_id == Post.id)\
+                   .where(post_categoria.c.categoria_id == category_id)
+    return stmt
+
+def published_posts_stmt(enc, keyset, category_id=None):
+    """select() del feed publicado, sin cursor ni limit (el mismo que revisa flask explain-check)."""
+    return _posts_stmt(enc, category_id, *keyset.columns, Post.updated_at).where(Post.is_published == True)
+
+def published_posts_page(category_id=None):
+    """Página de posts publicados (opcionalmente de una categoría) con keyset, sort, include y fields."""
+    try:
+        include = parse_include()
+        enc = parse_fields(post_encoder)
+        keyset = parse_sort()
+        rows, next_cursor = keyset.paginate(published_posts_stmt(enc, keyset, category_id))
+    except (InvalidCursor, InvalidInclude, InvalidFields, InvalidSort) as err:
+        return jsonify({"msg": str(err)}), 400
+    return conditional_json(
+        lambda: page_response(expand_posts(enc.dump_many(rows), include), next_cursor),
+        rows, next_cursor, enc.names, deep=bool(include),
+    )
+
+def posts_changes_stmt(enc, category_id=None):
+    return _posts_stmt(enc, category_id, Post.updated_at, Post.id, Post.is_published)
+
+def posts_changes_page(category_id=None):
+    """?updated_since=: posts cambiados desde esa fecha y ids borrados/despublicados."""
+    try:
+        include = parse_include()
+        enc = parse_fields(post_encoder)
+        since = parse_since(request.args["updated_since"])
+        items, deleted, next_cursor, token = post_changes(posts_changes_stmt(enc, category_id), since)
+    except (InvalidCursor, InvalidInclude, InvalidFields, InvalidSince) as err:
+        return jsonify({"msg": str(err)}), 400
+    except SinceExpired as err:
+        return jsonify({"msg": str(err)}), 410
+    return conditional_json(
+        lambda: {**page_response(expand_posts(enc.dump_many(items), include), next_cursor),
+                 "deleted": deleted, "sync_token": token},
+        items, deleted, next_cursor, token, enc.names, deep=bool(include),
+    )
+
 class PostListAPI(MethodView):
-    # Público: listar solo publicados
+    # Público: listar solo publicados, paginado por cursor (?limit=&cursor=)
+    # ?include=categories,author,comment_count agrega expansiones en lote
+    # ?category=<id> filtra por categoría
+    # ?updated_since=<ISO 8601> devuelve solo los cambios (sincronización incremental)
+    # ?fields=titulo,extracto limita columnas y campos (el id sale siempre; extracto y contadores solo si se piden)
+    # ?sort=recent|activity|comments ordena por fecha, último comentario o cantidad de comentarios
+    @query_budget(5)
+    @cache.cached("posts:list", include_cache_tags, activity_cache_tags)
     def get(self):
-        posts = Post.query.filter_by(is_published=True).order_by(Post.fecha_creacion.desc()).all()
-        return jsonify(PostSchema(many=True).dump(posts)), 200
+        category = request.args.get("category")
+        if category is not None and not (category.isascii() and category.isdigit()):
+            return jsonify({"msg": "El parámetro category debe ser un id numérico."}), 400
+        category = int(category) if category is not None else None
+        if "updated_since" in request.args:
+            return posts_changes_page(category)
+        return published_posts_page(category)
 
     # user+: crear
-    @jwt_required()
     def post(self):
         try:
-            data = PostSchema().load(request.get_json() or {})
+            data = post_schema.load(request.get_json() or {})
         except ValidationError as err:
             return jsonify({"errors": err.messages}), 422
 
-        uid = int(get_jwt_identity())
-
         nuevo_post = Post(
             titulo=data["titulo"],
             contenido=data["contenido"],
-            usuario_id=uid,
+            usuario_id=current_principal().id,
             is_published=data.get("is_published", True)
         )
         db.session.add(nuevo_post)
         db.session.commit()
-        return PostSchema().dump(nuevo_post), 201
+        return post_schema.dump(nuevo_post), 201
+
+
+def batch_response(creados: int, errors: dict):
+    """201 si se creó todo, 207 si hubo errores parciales, 422 si no se creó nada."""
+    status = 201 if not errors else (207 if creados else 422)
+    return jsonify({"created": creados, "errors": {str(i): e for i, e in errors.items()}}), status
+
+class PostBatchAPI(MethodView):
+    # user+: crear varios posts en una sola petición (POST /api/posts:batch)
+    def post(self):
+        try:
+            creados, errors = bulk_create_posts(request.get_json(silent=True), current_principal().id)
+        except InvalidBatch as err:
+            return jsonify({"msg": str(err)}), 400
+        return batch_response(creados, errors)
 
 
 class PostDetailAPI(MethodView):
     # Público: ver un post (si no publicado, solo admin)
+    @query_budget(4)
+    @cache.cached("post:{post_id}", include_cache_tags, activity_cache_tags)
     def get(self, post_id: int):
-        p = Post.query.get(post_id)
-        if not p or (not p.is_published and not is_admin()):
+        try:
+            include = parse_include()
+            enc = parse_fields(post_encoder)
+        except (InvalidInclude, InvalidFields) as err:
+            return jsonify({"msg": str(err)}), 400
+        row = db.session.execute(
+            enc.select(Post.is_published, Post.updated_at).where(Post.id == post_id)).first()
+        if not row:
             return jsonify({"msg": "No encontrado"}), 404
-        return PostSchema().dump(p), 200
+        if not row.is_published:
+            # la vista de admin de un borrador nunca va a la caché pública
+            cache.skip()
+            principal = current_principal(optional=True)
+            if not (principal and principal.is_admin):
+                return jsonify({"msg": "No encontrado"}), 404
+        return conditional_json(lambda: expand_posts([enc.dump(row)], include)[0],
+                                [row], enc.names, deep=bool(include))
 
     # Autor o admin: editar
-    @jwt_required()
     def put(self, post_id: int):
         post = Post.query.get_or_404(post_id)
-        if not owns(post.usuario_id):
+        if not authz.can_modify(post.usuario_id):
             return jsonify({"msg": "No tenés permiso para editar este post."}), 403
 
         try:
-            data = PostSchema().load(request.get_json() or {}, partial=True)
+            data = post_schema.load(request.get_json() or {}, partial=True)
         except ValidationError as err:
             return jsonify({"errors": err.messages}), 422
 
@@ -174,13 +277,12 @@ class PostDetailAPI(MethodView):
             if field in data:
                 setattr(post, field, data[field])
         db.session.commit()
-        return PostSchema().dump(post), 200
+        return post_schema.dump(post), 200
 
     # Autor o admin: eliminar
-    @jwt_required()
     def delete(self, post_id: int):
         post = Post.query.get_or_404(post_id)
-        if not owns(post.usuario_id):
+        if not authz.can_modify(post.usuario_id):
             return jsonify({"msg": "No tenés permiso para eliminar este post."}), 403
         db.session.delete(post)
         db.session.commit()
@@ -188,81 +290,133 @@ class PostDetailAPI(MethodView):
     
 # ======== COMENTARIOS ========
 
+def visible_comments_stmt(enc, post_id: int):
+    return (enc.select(Comentario.updated_at)
+            .where(Comentario.post_id == post_id, Comentario.is_visible == True)
+            .order_by(Comentario.fecha_creacion.asc()))
+
+def comments_changes_stmt(enc):
+    return enc.select(Comentario.updated_at, Comentario.id, Comentario.is_visible)
+
 class CommentListAPI(MethodView):
     # Público: listar comentarios de un post
+    # ?updated_since=<ISO 8601> devuelve solo los cambios, paginados (?limit=&cursor=)
+    # ?fields=texto,fecha_creacion limita columnas y campos (el id sale siempre)
+    @query_budget(3)
+    @cache.cached("post:{post_id}", "comments:{post_id}")
     def get(self, post_id: int):
-        post = Post.query.get_or_404(post_id)
-        qs = Comentario.query.filter_by(post_id=post.id, is_visible=True)\
-                             .order_by(Comentario.fecha_creacion.asc()).all()
-        return jsonify(ComentarioSchema(many=True).dump(qs)), 200
+        if db.session.scalar(db.select(Post.id).where(Post.id == post_id)) is None:
+            abort(404)
+        try:
+            enc = parse_fields(comentario_encoder)
+        except InvalidFields as err:
+            return jsonify({"msg": str(err)}), 400
+        if "updated_since" in request.args:
+            try:
+                since = parse_since(request.args["updated_since"])
+                items, deleted, next_cursor, token = comment_changes(comments_changes_stmt(enc), post_id, since)
+            except (InvalidCursor, InvalidSince) as err:
+                return jsonify({"msg": str(err)}), 400
+            except SinceExpired as err:
+                return jsonify({"msg": str(err)}), 410
+            return conditional_json(
+                lambda: {**page_response(enc.dump_many(items), next_cursor),
+                         "deleted": deleted, "sync_token": token},
+                items, deleted, next_cursor, token, enc.names,
+            )
+        rows = db.session.execute(visible_comments_stmt(enc, post_id)).all()
+        return conditional_json(lambda: enc.dump_many(rows), rows, enc.names)
 
     # user+: crear comentario en un post
-    @jwt_required()
     def post(self, post_id: int):
         post = Post.query.get_or_404(post_id)
         try:
-            data = ComentarioSchema().load(request.get_json() or {})
+            data = comentario_schema.load(request.get_json() or {})
         except ValidationError as err:
             return jsonify({"errors": err.messages}), 422
 
-        uid = int(get_jwt_identity())
-
         com = Comentario(
             texto=data["texto"],
-            usuario_id=uid,
+            usuario_id=current_principal().id,
             post_id=post.id,
             is_visible=True
         )
         db.session.add(com); db.session.commit()
-        return ComentarioSchema().dump(com), 201
+        return comentario_schema.dump(com), 201
+
+
+class CommentBatchAPI(MethodView):
+    # user+: crear varios comentarios en un post (POST /api/posts/<id>/comments:batch)
+    def post(self, post_id: int):
+        if db.session.scalar(db.select(Post.id).where(Post.id == post_id)) is None:
+            abort(404)
+        try:
+            creados, errors = bulk_create_comments(post_id, request.get_json(silent=True), current_principal().id)
+        except InvalidBatch as err:
+            return jsonify({"msg": str(err)}), 400
+        return batch_response(creados, errors)
 
 
 class CommentDeleteAPI(MethodView):
     # Autor del comentario, moderator o admin
-    @jwt_required()
     def delete(self, comment_id: int):
         c = Comentario.query.get_or_404(comment_id)
-        role = get_jwt().get("role")
-        uid = int(get_jwt_identity())
-
-
-        if not (c.usuario_id == uid or role in ("moderator", "admin")):
+        if not authz.can_modify(c.usuario_id):
             return jsonify({"msg": "No tenés permiso para eliminar este comentario."}), 403
 
         db.session.delete(c); db.session.commit()
         return "", 204
     
 class CommentUpdateAPI(MethodView):
-    @jwt_required()
     def put(self, comment_id):
         c = Comentario.query.get_or_404(comment_id)
-        uid = int(get_jwt_identity())
-        role = get_jwt().get("role")
 
         # Solo autor, moderator o admin pueden editar
-        if c.usuario_id != uid and role not in ("moderator", "admin"):
+        if not authz.can_modify(c.usuario_id):
             return jsonify({"msg": "No autorizado"}), 403
 
         data = request.get_json() or {}
         c.texto = data.get("texto", c.texto)
         db.session.commit()
-        return ComentarioSchema().dump(c), 200
+        return comentario_schema.dump(c), 200
 
 
 # ======== CATEGORÍAS ========
 
+def _category_count_tags(**kwargs):
+    return ["posts:list"] if request.args.get("with_counts") else []
+
 class CategoryListAPI(MethodView):
-    # Público
+    # Público; ?with_counts=1 agrega post_count (posts publicados) con un solo GROUP BY
+    @query_budget(2)
+    @cache.cached("categories", _category_count_tags)
     def get(self):
-        cats = Categoria.query.order_by(Categoria.nombre.asc()).all()
-        return jsonify(CategoriaSchema(many=True).dump(cats)), 200
+        try:
+            enc = parse_fields(categoria_encoder)
+        except InvalidFields as err:
+            return jsonify({"msg": str(err)}), 400
+        rows = db.session.execute(enc.select().order_by(Categoria.nombre.asc())).all()
+        counts = None
+        if request.args.get("with_counts"):
+            counts = dict(db.session.execute(
+                db.select(post_categoria.c.categoria_id, func.count())
+                .join(Post, Post.id == post_categoria.c.post_id)
+                .where(Post.is_published == True)
+                .group_by(post_categoria.c.categoria_id)
+            ).all())
+
+        def build():
+            items = enc.dump_many(rows)
+            if counts is not None:
+                for cat in items:
+                    cat["post_count"] = counts.get(cat["id"], 0)
+            return items
+        return conditional_json(build, rows, sorted(counts.items()) if counts is not None else None, enc.names)
 
     # moderator+ crea
-    @jwt_required()
-    @role_required("moderator", "admin")
     def post(self):
         try:
-            data = CategoriaSchema().load(request.get_json() or {})
+            data = categoria_schema.load(request.get_json() or {})
         except ValidationError as err:
             return jsonify({"errors": err.messages}), 422
 
@@ -271,17 +425,35 @@ class CategoryListAPI(MethodView):
 
         cat = Categoria(nombre=data["nombre"])
         db.session.add(cat); db.session.commit()
-        return CategoriaSchema().dump(cat), 201
+        return categoria_schema.dump(cat), 201
+
+
+class CategoryBatchAPI(MethodView):
+    # moderator+ crea varias categorías (POST /api/categories:batch)
+    def post(self):
+        try:
+            creados, errors = bulk_create_categories(request.get_json(silent=True))
+        except InvalidBatch as err:
+            return jsonify({"msg": str(err)}), 400
+        return batch_response(creados, errors)
+
+
+class CategoryPostsAPI(MethodView):
+    # Público: posts publicados de una categoría (keyset, ?include= igual que /api/posts)
+    @query_budget(5)
+    @cache.cached("posts:list", "categories", include_cache_tags, activity_cache_tags)
+    def get(self, category_id: int):
+        if db.session.scalar(db.select(Categoria.id).where(Categoria.id == category_id)) is None:
+            return jsonify({"msg": "Categoría no encontrada"}), 404
+        return published_posts_page(category_id)
 
 
 class CategoryDetailAPI(MethodView):
     # moderator+ edita
-    @jwt_required()
-    @role_required("moderator", "admin")
     def put(self, category_id: int):
         cat = Categoria.query.get_or_404(category_id)
         try:
-            data = CategoriaSchema().load(request.get_json() or {}, partial=True)
+            data = categoria_schema.load(request.get_json() or {}, partial=True)
         except ValidationError as err:
             return jsonify({"errors": err.messages}), 422
 
@@ -293,11 +465,9 @@ class CategoryDetailAPI(MethodView):
             cat.nombre = data["nombre"]
 
         db.session.commit()
-        return CategoriaSchema().dump(cat), 200
+        return categoria_schema.dump(cat), 200
 
     # admin borra
-    @jwt_required()
-    @role_required("admin")
     def delete(self, category_id: int):
         cat = Categoria.query.get_or_404(category_id)
         db.session.delete(cat); db.session.commit()
@@ -306,24 +476,34 @@ class CategoryDetailAPI(MethodView):
 
 # ======== USUARIOS (ADMIN) ========
 class UserListAPI(MethodView):
-    @role_required("admin")
+    @query_budget(1)
     def get(self):
-        users = Usuario.query.order_by(Usuario.created_at.desc()).all()
-        return jsonify(UsuarioSchema(many=True).dump(users)), 200
+        try:
+            enc = parse_fields(usuario_encoder)
+        except InvalidFields as err:
+            return jsonify({"msg": str(err)}), 400
+        stmt = enc.select().order_by(Usuario.created_at.desc())
+        fmt = requested_stream_format()
+        if fmt:
+            return stream_query(stmt, enc, fmt)
+        return jsonify(enc.dump_many(db.session.execute(stmt))), 200
 
 
 class UserDetailAPI(MethodView):
-    @jwt_required()
+    @query_budget(1)
     def get(self, user_id: int):
-        u = Usuario.query.get_or_404(user_id)
-        uid = int(get_jwt_identity())
+        u = users.get_or_404(user_id)
 
-        if not (is_admin() or uid == u.id):
+        if not authz.can_modify(u["id"]):
             return jsonify({"msg": "Forbidden"}), 403
-        return UsuarioSchema().dump(u), 200
+        try:
+            enc = parse_fields(usuario_encoder)
+        except InvalidFields as err:
+            return jsonify({"msg": str(err)}), 400
+        return {name: u[name] for name in enc.names}, 200
 
     # admin: cambiar rol y/o activar/desactivar
-    @role_required("admin")
+    @query_budget(3)   # SELECT, UPDATE y la relectura de token_version (app/revocation.py)
     def patch(self, user_id: int):
         u = Usuario.query.get_or_404(user_id)
         data = request.get_json() or {}
@@ -333,17 +513,16 @@ class UserDetailAPI(MethodView):
             if new_role not in ("user", "moderator", "admin"):
                 return jsonify({"msg": "Rol inválido"}), 400
             u.role = new_role
-            if u.credenciales:
-                u.credenciales.role = new_role
 
         if "is_active" in data:
             u.is_active = bool(data["is_active"])
 
+        # antes del commit: después la instancia queda expirada y dump() la recargaría
+        body = usuario_schema.dump(u)
         db.session.commit()
-        return UsuarioSchema().dump(u), 200
+        return body, 200
 
     # admin: desactivar (soft delete)
-    @role_required("admin")
     def delete(self, user_id: int):
         u = Usuario.query.get_or_404(user_id)
         u.is_active = False
@@ -352,32 +531,75 @@ class UserDetailAPI(MethodView):
 
 
 # ======== STATS (moderator+ / admin extra campo) ========
-from sqlalchemy import func
-from datetime import datetime, timedelta
-from app.models import Comentario as _Comentario, Post as _Post, Usuario as _Usuario
+from app.stats import read_stats
 
 class StatsAPI(MethodView):
-    @jwt_required()
-    @role_required("moderator", "admin")
+    # Lee los contadores materializados (ver app/stats.py) en vez de hacer COUNT(*)
+    @query_budget(3)
     def get(self):
-        resp = {
-            "total_posts":      db.session.scalar(db.select(func.count()).select_from(_Post)) or 0,
-            "total_comments":   db.session.scalar(db.select(func.count()).select_from(_Comentario)) or 0,
-            "total_users":      db.session.scalar(db.select(func.count()).select_from(_Usuario)) or 0,
-        }
-        if get_jwt().get("role") == "admin":
-            week_ago = datetime.now() - timedelta(days=7)
-            posts_last_week = db.session.scalar(
-                db.select(func.count()).select_from(_Post).where(_Post.fecha_creacion >= week_ago)
-            ) or 0
-            resp["posts_last_week"] = posts_last_week
+        resp = read_stats(include_week=current_principal().is_admin)
         return jsonify(resp), 200
 
+# ======== BÚSQUEDA ========
+from app.search import search_index, POST, COMMENT
+
+class SearchAPI(MethodView):
+    # Público: /api/search?q=texto&limit=&cursor= (posts publicados y comentarios visibles)
+    @query_budget(3)
+    def get(self):
+        q = (request.args.get("q") or "").strip()
+        if not q:
+            return jsonify({"msg": "Falta el parámetro q."}), 400
+        try:
+            limit = parse_limit()
+            offset = decode_offset(request.args.get("cursor"))
+        except InvalidCursor as err:
+            return jsonify({"msg": str(err)}), 400
+
+        hits = search_index.search(q, limit + 1, offset)
+        page = hits[:limit]
+        ids = {
+            kind: [id_ for k, id_, _ in page if k == kind] for kind in (POST, COMMENT)
+        }
+        rows = {}
+        if ids[POST]:
+            for r in db.session.execute(post_encoder.select().where(Post.id.in_(ids[POST]))):
+                rows[(POST, r.id)] = post_encoder.dump(r)
+        if ids[COMMENT]:
+            for r in db.session.execute(comentario_encoder.select().where(Comentario.id.in_(ids[COMMENT]))):
+                rows[(COMMENT, r.id)] = comentario_encoder.dump(r)
+
+        items = [
+            {"type": kind, "score": score, "data": rows[(kind, id_)]}
+            for kind, id_, score in page if (kind, id_) in rows
+        ]
+        next_cursor = encode_offset(offset + limit) if len(hits) > limit else None
+        return jsonify(page_response(items, next_cursor)), 200
+
+
+# ======== CACHÉ (admin) ========
+class CacheStatsAPI(MethodView):
+    def get(self):
+        return jsonify(cache.stats()), 200
+
+# ====MÉTRICAS====
+from app.metrics import metrics
+
+class MetricsAPI(MethodView):
+    def get(self):
+        return metrics.render(), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
 # ====REVIEWS====
 class ReviewsAllAPI(MethodView):
-    @jwt_required()
-    @role_required("admin", "moderator")
+    @query_budget(1)
     def get(self):
-        reviews = Comentario.query.order_by(Comentario.fecha_creacion.desc()).all()
-        return jsonify(ComentarioSchema(many=True).dump(reviews)), 200
+        try:
+            enc = parse_fields(comentario_encoder)
+        except InvalidFields as err:
+            return jsonify({"msg": str(err)}), 400
+        stmt = enc.select().order_by(Comentario.fecha_creacion.desc())
+        fmt = requested_stream_format()
+        if fmt:
+            return stream_query(stmt, enc, fmt)
+        return jsonify(enc.dump_many(db.session.execute(stmt))), 200
 
@@ -0,0 +1,6 @@
+#asgi.py
+from app import create_app
+from app.asgi import AsyncReadApp
+
+# Modo ASGI: uvicorn asgi:app --workers 4
+app = AsyncReadApp(create_app())
@@ -0,0 +1,124 @@
+# benchmarks/bench_activity.py
+"""
+Feed ordenado por actividad: agregados sobre comentarios vs columnas de posts.
+
+Sobre una base poblada con app/synthetic.py compara, por consulta, lo que
+costaría sin las columnas de app/activity.py contra la versión con ellas:
+- sort=activity: MAX(fecha_creacion) por post con GROUP BY vs last_comment_at
+  (índice ix_posts_published_activity);
+- sort=comments: COUNT(*) por post con GROUP BY vs comment_count
+  (índice ix_posts_published_comments);
+- include=comment_count de una página: GROUP BY sobre comentarios vs lookup
+  por id.
+Además mide el costo de escritura: alta de un comentario (ORM + commit) con y
+sin los listeners que mantienen las columnas.
+
+Reporta milisegundos por consulta (mediana de --repeticiones).
+
+Uso:
+    python benchmarks/bench_activity.py --posts 20000 --comentarios 100000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--limit", type=int, default=20, help="posts por página")
+    p.add_argument("--repeticiones", type=int, default=20)
+    p.add_argument("--altas", type=int, default=300, help="comentarios por variante de escritura")
+    p.add_argument("--usuarios", type=int, default=500)
+    p.add_argument("--posts", type=int, default=20000)
+    p.add_argument("--comentarios", type=int, default=100000)
+    return p.parse_args()
+
+
+def consultas(limit):
+    """nombre -> (sin columnas, con columnas)."""
+    from sqlalchemy import func
+    from app import db
+    from app.models import Post, Comentario
+
+    visibles = (db.select(Comentario.post_id, func.max(Comentario.fecha_creacion).label("ultimo"),
+                          func.count().label("cantidad"))
+                .where(Comentario.is_visible == True).group_by(Comentario.post_id).subquery())
+    publicados = db.select(Post.id).where(Post.is_published == True)
+    agregado = publicados.outerjoin(visibles, visibles.c.post_id == Post.id)
+    pagina = list(db.session.scalars(publicados.order_by(Post.fecha_creacion.desc()).limit(limit)))
+    return {
+        "sort=activity": (
+            agregado.order_by(visibles.c.ultimo.desc(), Post.id.desc()).limit(limit),
+            publicados.order_by(Post.last_comment_at.desc(), Post.id.desc()).limit(limit),
+        ),
+        "sort=comments": (
+            agregado.order_by(func.coalesce(visibles.c.cantidad, 0).desc(), Post.id.desc()).limit(limit),
+            publicados.order_by(Post.comment_count.desc(), Post.id.desc()).limit(limit),
+        ),
+        "include=comment_count": (
+            db.select(Comentario.post_id, func.count())
+            .where(Comentario.post_id.in_(pagina), Comentario.is_visible == True)
+            .group_by(Comentario.post_id),
+            db.select(Post.id, Post.comment_count).where(Post.id.in_(pagina)),
+        ),
+    }
+
+
+def medir(fn, n):
+    tiempos = []
+    for _ in range(n):
+        inicio = time.perf_counter()
+        fn()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def altas(n, post_ids):
+    from app import db
+    from app.models import Comentario
+
+    def run():
+        for i in range(n):
+            db.session.add(Comentario(texto="bench", usuario_id=1, post_id=post_ids[i % len(post_ids)]))
+            db.session.commit()
+    return medir(run, 1) / n
+
+
+def main():
+    args = parse_args()
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+    os.environ["CACHE_BACKEND"] = "none"
+
+    from sqlalchemy import event
+    from app import create_app, db, activity
+    from app.models import Post, Comentario
+    from app.synthetic import generate
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        if not db.session.scalar(db.select(db.func.count()).select_from(Post)):
+            generate(usuarios=args.usuarios, posts=args.posts, comentarios=args.comentarios, log=lambda *_: None)
+
+        print(f"{'consulta':<22} {'agregado ms':>12} {'columna ms':>11} {'x':>6}")
+        for nombre, (antes, ahora) in consultas(args.limit).items():
+            previo = medir(lambda: db.session.execute(antes).all(), args.repeticiones)
+            actual = medir(lambda: db.session.execute(ahora).all(), args.repeticiones)
+            print(f"{nombre:<22} {previo:>12.2f} {actual:>11.2f} {previo / actual:>6.1f}")
+
+        post_ids = list(db.session.scalars(db.select(Post.id).limit(100)))
+        con = altas(args.altas, post_ids)
+        event.remove(Comentario, "after_insert", activity._on_insert)
+        sin = altas(args.altas, post_ids)
+        event.listen(Comentario, "after_insert", activity._on_insert)
+        print(f"\n{'alta de comentario':<22} {sin:>12.2f} {con:>11.2f}   (ms sin / con listeners)")
+
+
+if __name__ == "__main__":
+    main()
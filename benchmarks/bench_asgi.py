@@ -0,0 +1,234 @@
+# benchmarks/bench_asgi.py
+"""
+Benchmark WSGI vs ASGI en los GET públicos (posts, detalle, comentarios, categorías).
+
+Levanta cada modo en un subproceso contra la misma base SQLite (poblada con
+app/synthetic.py) y, para cada nivel de --conexiones, abre esa cantidad de
+clientes concurrentes (keep-alive si el servidor lo permite) que piden en loop
+durante --duracion segundos, esperando --pensar-ms entre pedidos (clientes lentos).
+
+- wsgi: run:app en un servidor WSGI (werkzeug) con un pool fijo de --threads
+  hilos; cada pedido ocupa un hilo de principio a fin, incluida la espera a la
+  base, y werkzeug cierra la conexión después de cada respuesta.
+- asgi: asgi:app (app/asgi.py) en uvicorn, un solo event loop.
+
+Reporta requests ok, errores (timeouts, conexiones rechazadas o status != 200),
+rps y latencias p50/p99 por modo y nivel. Para comparar despliegues reales se
+pueden pasar los comandos, p. ej.:
+    --wsgi-cmd "gunicorn -w 4 --threads 8 -b 127.0.0.1:{port} run:app"
+    --asgi-cmd "uvicorn asgi:app --port {port} --workers 4"
+
+Requiere uvicorn, asgiref y aiosqlite.
+
+Uso:
+    python benchmarks/bench_asgi.py --conexiones 10,100,500 --duracion 10 --out asgi.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shlex
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--conexiones", default="10,100,500", help="niveles de conexiones concurrentes")
+    p.add_argument("--duracion", type=float, default=10, help="segundos por nivel")
+    p.add_argument("--pensar-ms", type=float, default=50, help="pausa entre pedidos de una conexión")
+    p.add_argument("--timeout", type=float, default=10, help="segundos antes de contar un pedido como error")
+    p.add_argument("--threads", type=int, default=16, help="hilos del servidor WSGI incluido")
+    p.add_argument("--usuarios", type=int, default=1000)
+    p.add_argument("--posts", type=int, default=5000)
+    p.add_argument("--comentarios", type=int, default=20000)
+    p.add_argument("--wsgi-cmd", help="comando del servidor WSGI ({port} se reemplaza)")
+    p.add_argument("--asgi-cmd", help="comando del servidor ASGI ({port} se reemplaza)")
+    p.add_argument("--out", help="archivo JSON de salida")
+    # uso interno: levantar el servidor WSGI incluido
+    p.add_argument("--serve-wsgi", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    return p.parse_args()
+
+
+# =========================
+#   Servidor WSGI incluido
+# =========================
+def serve_wsgi(port: int, threads: int):
+    import logging
+    from werkzeug.serving import BaseWSGIServer
+    from run import app
+
+    class PoolWSGIServer(BaseWSGIServer):
+        """Cada conexión se atiende en un hilo de un pool fijo, como un worker con threads."""
+        multithread = True
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.pool = ThreadPoolExecutor(threads)
+
+        def process_request(self, request, client_address):
+            self.pool.submit(self._handle, request, client_address)
+
+        def _handle(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = PoolWSGIServer("127.0.0.1", port, app)
+    server.request_queue_size = 1024
+    server.serve_forever()
+
+
+# =========================
+#       Preparación
+# =========================
+def preparar(args) -> dict:
+    """Crea y puebla la base; devuelve los paths a pedir."""
+    from app import create_app, db
+    from app.models import Post, Categoria
+    from app.synthetic import generate
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        if not db.session.scalar(db.select(db.func.count()).select_from(Post)):
+            generate(usuarios=args.usuarios, posts=args.posts, comentarios=args.comentarios, log=lambda *_: None)
+        posts = list(db.session.scalars(
+            db.select(Post.id).where(Post.is_published == True).order_by(Post.id).limit(200)))
+        cats = list(db.session.scalars(db.select(Categoria.id)))
+    return {
+        "posts": ["/api/posts?limit=20"] + [f"/api/posts?limit=20&category={c}" for c in cats[:5]],
+        "post_detail": [f"/api/posts/{p}" for p in posts],
+        "comments": [f"/api/posts/{p}/comments" for p in posts],
+        "categories": ["/api/categories"],
+    }
+
+
+def libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def levantar(cmd: str, port: int, env) -> subprocess.Popen:
+    proc = subprocess.Popen(shlex.split(cmd.format(port=port)), cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(200):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return proc
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise SystemExit(f"El servidor no arrancó: {cmd}")
+
+
+# =========================
+#        Cliente
+# =========================
+async def conexion(port, paths, hasta, pensar, timeout, latencias, errores):
+    reader = writer = None
+    while time.perf_counter() < hasta:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", port), timeout)
+            path = random.choice(paths)
+            t0 = time.perf_counter()
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: bench\r\n\r\n".encode())
+            await writer.drain()
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout)
+            lineas = head.decode("latin-1").split("\r\n")
+            headers = {k.lower(): v.strip() for k, _, v in (l.partition(":") for l in lineas[1:] if l)}
+            await asyncio.wait_for(reader.readexactly(int(headers.get("content-length", 0))), timeout)
+            latencias.append((time.perf_counter() - t0) * 1000)
+            if lineas[0].split()[1] != "200":
+                errores.append(lineas[0])
+            if lineas[0].startswith("HTTP/1.0") or headers.get("connection", "").lower() == "close":
+                writer.close()
+                writer = None
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as err:
+            errores.append(type(err).__name__)
+            if writer is not None:
+                writer.close()
+            writer = None
+            await asyncio.sleep(0.05)
+            continue
+        await asyncio.sleep(pensar)
+    if writer is not None:
+        writer.close()
+
+
+async def nivel(port, paths, n, args):
+    latencias, errores = [], []
+    todos = [p for grupo in paths.values() for p in grupo]
+    inicio = time.perf_counter()
+    hasta = inicio + args.duracion
+    await asyncio.gather(*(
+        conexion(port, todos, hasta, args.pensar_ms / 1000, args.timeout, latencias, errores)
+        for _ in range(n)
+    ))
+    total = time.perf_counter() - inicio
+    q = statistics.quantiles(latencias, n=100) if len(latencias) > 1 else (latencias or [0]) * 99
+    return {
+        "conexiones": n,
+        "ok": len(latencias) - sum(1 for e in errores if e.startswith("HTTP")),
+        "errores": len(errores),
+        "rps": round(len(latencias) / total, 1),
+        "p50_ms": round(q[49], 2),
+        "p99_ms": round(q[98], 2),
+    }
+
+
+def main():
+    args = parse_args()
+    if args.serve_wsgi:
+        return serve_wsgi(args.serve_wsgi, args.threads)
+
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+    env.setdefault("CACHE_BACKEND", "none")   # se mide el camino a la base, no la caché
+    os.environ.update(env)
+    paths = preparar(args)
+
+    comandos = {
+        "wsgi": args.wsgi_cmd or f"{sys.executable} {os.path.abspath(__file__)} --threads {args.threads} --serve-wsgi {{port}}",
+        "asgi": args.asgi_cmd or f"{sys.executable} -m uvicorn asgi:app --port {{port}} --log-level warning",
+    }
+    niveles = [int(n) for n in args.conexiones.split(",")]
+    resultados = {}
+    print(f"{'modo':<6} {'conex':>6} {'ok':>8} {'errores':>8} {'rps':>9} {'p50':>9} {'p99':>9}")
+    for modo, cmd in comandos.items():
+        port = libre()
+        proc = levantar(cmd, port, env)
+        try:
+            resultados[modo] = []
+            for n in niveles:
+                r = asyncio.run(nivel(port, paths, n, args))
+                resultados[modo].append(r)
+                print(f"{modo:<6} {n:>6} {r['ok']:>8} {r['errores']:>8} {r['rps']:>9.1f} "
+                      f"{r['p50_ms']:>9.2f} {r['p99_ms']:>9.2f}")
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"args": {k: v for k, v in vars(args).items() if k != "serve_wsgi"},
+                       "results": resultados}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/bench_authz.py
+"""
+Micro-benchmark del costo de autorización por request.
+
+Compara, dentro de un request armado con test_request_context (sin vista ni
+base), lo que hacía cada vista protegida antes de app/authz.py contra la tabla
+de reglas:
+- antes: @jwt_required() + @role_required(...) (dos verify_jwt_in_request, o
+  sea dos decodificaciones del JWT) y después get_jwt()/int(get_jwt_identity())
+  en la vista;
+- ahora: el before_request de authz (una decodificación, Principal en g y un
+  lookup en la tabla) y current_principal() en la vista.
+
+Reporta microsegundos por request (mediana de --rondas rondas de --requests).
+
+Uso:
+    python benchmarks/bench_authz.py --requests 5000 --rondas 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# (método, path, rol del token)
+CASOS = [
+    ("GET", "/api/stats", "moderator"),
+    ("GET", "/api/users", "admin"),
+    ("POST", "/api/posts", "user"),
+]
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--requests", type=int, default=5000, help="requests por ronda")
+    p.add_argument("--rondas", type=int, default=5)
+    return p.parse_args()
+
+
+def antes(roles):
+    from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
+
+    verify_jwt_in_request()                      # @jwt_required()
+    verify_jwt_in_request()                      # @role_required(...)
+    if roles and get_jwt().get("role") not in roles:
+        raise AssertionError("rol rechazado")
+    return int(get_jwt_identity()), get_jwt().get("role")   # la vista
+
+
+def ahora(roles):
+    from app.authz import authz, current_principal
+
+    assert authz._enforce() is None
+    principal = current_principal()
+    return principal.id, principal.role
+
+
+def medir(app, fn, method, path, headers, roles, n):
+    """Microsegundos por request: contexto de request + autorización."""
+    inicio = time.perf_counter()
+    for _ in range(n):
+        with app.test_request_context(path, method=method, headers=headers):
+            fn(roles)
+    return (time.perf_counter() - inicio) / n * 1e6
+
+
+def main():
+    args = parse_args()
+    os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+    from flask_jwt_extended import create_access_token
+    from app import create_app
+    from app.authz import authz
+
+    app = create_app()
+    print(f"{'caso':<22} {'vacío µs':>9} {'antes µs':>9} {'ahora µs':>9} {'ahorro µs':>10}")
+    for method, path, rol in CASOS:
+        with app.app_context():
+            token = create_access_token(identity="1", additional_claims={"role": rol, "tv": 0})
+        headers = {"Authorization": f"Bearer {token}"}
+        with app.test_request_context(path, method=method):
+            regla = authz.rule()
+        roles = regla.roles if regla else None
+        tiempos = {"vacío": [], "antes": [], "ahora": []}
+        for _ in range(args.rondas):
+            tiempos["vacío"].append(medir(app, lambda _: None, method, path, headers, roles, args.requests))
+            tiempos["antes"].append(medir(app, antes, method, path, headers, roles, args.requests))
+            tiempos["ahora"].append(medir(app, ahora, method, path, headers, roles, args.requests))
+        vacio, previo, actual = (statistics.median(tiempos[k]) for k in ("vacío", "antes", "ahora"))
+        print(f"{method + ' ' + path:<22} {vacio:>9.1f} {previo - vacio:>9.1f} {actual - vacio:>9.1f} "
+              f"{previo - actual:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# benchmarks/bench_batch.py
+"""
+Throughput de alta de posts: POST /api/posts (uno por request) vs.
+POST /api/posts:batch con lotes de 1, 100 y 1000.
+
+Uso:
+    python benchmarks/bench_batch.py [total_posts]
+"""
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+from app import create_app, db  # noqa: E402
+from app.models import Usuario, Categoria  # noqa: E402
+
+
+def post(i):
+    return {"titulo": f"post {i}", "contenido": "contenido de prueba " * 20, "categorias": [1 + i % 5]}
+
+
+def main(total: int):
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        db.session.add(Usuario(id=1, username="bench", email="bench@mail.com"))
+        db.session.add_all([Categoria(nombre=f"cat {i}") for i in range(5)])
+        db.session.commit()
+        token = create_access_token(identity="1", additional_claims={"role": "user"})
+    cliente = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    print(f"{'modo':<22} {'posts':>8} {'segundos':>10} {'posts/s':>10}")
+
+    n = min(total, 2000)
+    inicio = time.perf_counter()
+    for i in range(n):
+        item = post(i)
+        item.pop("categorias")
+        assert cliente.post("/api/posts", json=item, headers=headers).status_code == 201
+    t = time.perf_counter() - inicio
+    print(f"{'POST /api/posts':<22} {n:>8} {t:>10.2f} {n / t:>10.0f}")
+
+    for lote in (1, 100, 1000):
+        n = min(total, lote * 2000)
+        inicio = time.perf_counter()
+        for start in range(0, n, lote):
+            r = cliente.post("/api/posts:batch", json=[post(i) for i in range(start, start + lote)],
+                             headers=headers)
+            assert r.status_code == 201, r.json
+        t = time.perf_counter() - inicio
+        print(f"{f'posts:batch x{lote}':<22} {n:>8} {t:>10.2f} {n / t:>10.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,76 @@
+# benchmarks/bench_fields.py
+"""
+Tamaño y latencia del feed /api/posts con y sin ?fields= (proyección de columnas).
+
+Compara la página completa (con contenido) contra la proyección de feed
+(titulo + extracto guardado) sobre una base poblada con app/synthetic.py.
+Mide con el test client en proceso, sin caché de respuestas: bytes del cuerpo
+y latencia p50/p95 por variante.
+
+Uso:
+    python benchmarks/bench_fields.py --limit 100 --requests 300
+"""
+import argparse
+import contextlib
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+VARIANTES = {
+    "completo": "",
+    "feed": "&fields=titulo,extracto,fecha_creacion,usuario_id",
+    "solo_titulo": "&fields=titulo",
+}
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--limit", type=int, default=100, help="posts por página")
+    p.add_argument("--requests", type=int, default=300, help="requests por variante")
+    p.add_argument("--usuarios", type=int, default=200)
+    p.add_argument("--posts", type=int, default=5000)
+    p.add_argument("--comentarios", type=int, default=1000)
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+    os.environ["CACHE_BACKEND"] = "none"
+
+    from app import create_app, db
+    from app.models import Post
+    from app.synthetic import generate
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        if not db.session.scalar(db.select(db.func.count()).select_from(Post)):
+            generate(usuarios=args.usuarios, posts=args.posts, comentarios=args.comentarios, log=lambda *_: None)
+
+    client = app.test_client()
+    resultados = {}
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        for nombre, extra in VARIANTES.items():
+            path = f"/api/posts?limit={args.limit}{extra}"
+            tamano = len(client.get(path).data)
+            tiempos = []
+            for _ in range(args.requests):
+                inicio = time.perf_counter()
+                client.get(path)
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+            q = statistics.quantiles(tiempos, n=100)
+            resultados[nombre] = (tamano, q[49], q[94])
+    base = resultados["completo"][0]
+    print(f"{'variante':<12} {'bytes':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for nombre, (tamano, p50, p95) in resultados.items():
+        print(f"{nombre:<12} {tamano:>9} {p50:>8.2f} {p95:>8.2f}   ({100 * tamano / base:.0f}% de los bytes)")
+
+
+if __name__ == "__main__":
+    main()
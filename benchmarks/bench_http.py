@@ -0,0 +1,313 @@
+# benchmarks/bench_http.py
+"""
+Benchmark HTTP de punta a punta de todas las rutas de app/routes.py.
+
+Levanta la app de create_app() en un servidor HTTP local contra una base
+poblada con app/synthetic.py y recorre cada regla/método registrado con la
+concurrencia pedida. Reporta throughput y latencias p50/p95/p99 por endpoint
+y guarda todo en JSON para comparar corridas.
+
+Uso:
+    python benchmarks/bench_http.py --requests 200 --concurrency 8 --out resultados.json
+    python benchmarks/bench_http.py --baseline resultados.json --threshold 0.2   # falla si empeora
+
+Si una ruta nueva no tiene escenario en ESCENARIOS, el benchmark falla: así
+ninguna ruta queda sin medir.
+"""
+import argparse
+import contextlib
+import http.client
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PASSWORD = "bench123"
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--requests", type=int, default=200, help="requests por endpoint")
+    p.add_argument("--concurrency", type=int, default=8)
+    p.add_argument("--usuarios", type=int, default=1000)
+    p.add_argument("--posts", type=int, default=5000)
+    p.add_argument("--comentarios", type=int, default=20000)
+    p.add_argument("--semilla", type=int, default=42)
+    p.add_argument("--only", help="endpoints separados por coma (p. ej. post_list,login)")
+    p.add_argument("--out", help="archivo JSON de salida")
+    p.add_argument("--baseline", help="JSON de una corrida anterior para comparar")
+    p.add_argument("--threshold", type=float, default=0.2, help="tolerancia relativa de regresión")
+    return p.parse_args()
+
+
+# =========================
+#       Preparación
+# =========================
+class Contexto:
+    """Tokens, ids de referencia y pools de recursos descartables para los escenarios."""
+
+    def __init__(self, n: int):
+        self.n = n
+        self.run = datetime.now().strftime("%H%M%S%f")
+        self.tokens = {}
+        self.ids = {}
+        self.pools = {}
+        self._lock = threading.Lock()
+        self._seq = 0
+
+    def seq(self) -> int:
+        with self._lock:
+            self._seq += 1
+            return self._seq
+
+    def pop(self, pool: str):
+        return self.pools[pool].popleft()
+
+
+def preparar(app, args) -> Contexto:
+    from flask_jwt_extended import create_access_token
+    from app import db
+    from app.models import Usuario, UserCredentials, Post, Comentario, Categoria
+    from app.passwords import passwords
+    from app.synthetic import generate
+
+    ctx = Contexto(args.requests)
+    with app.app_context():
+        db.create_all()
+        if not db.session.scalar(db.select(db.func.count()).select_from(Post)):
+            generate(usuarios=args.usuarios, posts=args.posts, comentarios=args.comentarios,
+                     semilla=args.semilla, log=lambda *_: None)
+
+        hash_ = passwords.hash(PASSWORD)
+        for rol in ("admin", "moderator", "user"):
+            email = f"bench_{rol}@mail.com"
+            u = Usuario.query.filter_by(email=email).first()
+            if not u:
+                u = Usuario(username=f"bench_{rol}", email=email, role=rol)
+                db.session.add_all([u, UserCredentials(usuario=u, password_hash=hash_)])
+                db.session.commit()
+            ctx.ids[rol] = u.id
+            ctx.tokens[rol] = create_access_token(
+                identity=str(u.id),
+                additional_claims={"role": u.role, "email": u.email, "username": u.username},
+            )
+
+        uid = ctx.ids["user"]
+        ctx.ids["post"] = db.session.scalar(
+            db.select(Post.id).where(Post.is_published == True).order_by(Post.id).limit(1))
+        ctx.ids["categoria"] = db.session.scalar(db.select(Categoria.id).order_by(Categoria.id).limit(1))
+
+        # recursos propios: los que se editan se reutilizan, los que se borran se consumen
+        n = args.requests
+        posts = [Post(titulo=f"bench {i}", contenido="bench", usuario_id=uid) for i in range(n + 1)]
+        coms = [Comentario(texto=f"bench {i}", usuario_id=uid, post_id=ctx.ids["post"]) for i in range(n + 1)]
+        cats = [Categoria(nombre=f"bench {ctx.run} {i}") for i in range(n + 1)]
+        victimas = [Usuario(username=f"bv{ctx.run}{i}", email=f"bv{ctx.run}{i}@mail.com") for i in range(n + 1)]
+        db.session.add_all(posts + coms + cats + victimas)
+        db.session.commit()
+
+        ctx.ids["own_post"] = posts[0].id
+        ctx.ids["own_comment"] = coms[0].id
+        ctx.ids["own_category"] = cats[0].id
+        ctx.pools["posts"] = deque(p.id for p in posts[1:])
+        ctx.pools["comments"] = deque(c.id for c in coms[1:])
+        ctx.pools["categories"] = deque(c.id for c in cats[1:])
+        ctx.pools["users"] = deque(u.id for u in victimas)
+    return ctx
+
+
+# =========================
+#        Escenarios
+# =========================
+# (endpoint, método) -> fn(ctx) -> (path, body, rol o None, status esperados)
+ESCENARIOS = {
+    ("register", "POST"): lambda c: (
+        "/api/register",
+        {"username": f"r{c.run}{(s := c.seq())}", "email": f"r{c.run}{s}@mail.com", "password": PASSWORD},
+        None, (201,)),
+    ("login", "POST"): lambda c: (
+        "/api/login", {"email": "bench_user@mail.com", "password": PASSWORD}, None, (200,)),
+    ("me", "GET"): lambda c: ("/api/me", None, "user", (200,)),
+    ("post_list", "GET"): lambda c: ("/api/posts?limit=20", None, None, (200,)),
+    ("post_list", "POST"): lambda c: (
+        "/api/posts", {"titulo": "bench", "contenido": "contenido " * 50}, "user", (201,)),
+    ("post_batch", "POST"): lambda c: (
+        "/api/posts:batch", [{"titulo": f"batch {i}", "contenido": "x" * 200} for i in range(100)],
+        "user", (201,)),
+    ("post_detail", "GET"): lambda c: (f"/api/posts/{c.ids['post']}", None, None, (200,)),
+    ("post_detail", "PUT"): lambda c: (
+        f"/api/posts/{c.ids['own_post']}", {"titulo": f"editado {c.seq()}"}, "user", (200,)),
+    ("post_detail", "DELETE"): lambda c: (f"/api/posts/{c.pop('posts')}", None, "user", (204,)),
+    ("comment_list", "GET"): lambda c: (f"/api/posts/{c.ids['post']}/comments", None, None, (200,)),
+    ("comment_list", "POST"): lambda c: (
+        f"/api/posts/{c.ids['post']}/comments", {"texto": "comentario bench"}, "user", (201,)),
+    ("comment_batch", "POST"): lambda c: (
+        f"/api/posts/{c.ids['post']}/comments:batch", [{"texto": f"c {i}"} for i in range(100)],
+        "user", (201,)),
+    ("comment_delete", "DELETE"): lambda c: (f"/api/comments/{c.pop('comments')}", None, "user", (204,)),
+    ("comment_update", "PUT"): lambda c: (
+        f"/api/comments/{c.ids['own_comment']}/edit", {"texto": f"editado {c.seq()}"}, "user", (200,)),
+    ("category_list", "GET"): lambda c: ("/api/categories", None, None, (200,)),
+    ("category_list", "POST"): lambda c: (
+        "/api/categories", {"nombre": f"n{c.run}{c.seq()}"}, "moderator", (201,)),
+    ("category_batch", "POST"): lambda c: (
+        "/api/categories:batch", [{"nombre": f"b{c.run}{c.seq()}"} for _ in range(20)], "moderator", (201,)),
+    ("category_detail", "PUT"): lambda c: (
+        f"/api/categories/{c.ids['own_category']}", {"nombre": f"e{c.run}{c.seq()}"}, "moderator", (200,)),
+    ("category_detail", "DELETE"): lambda c: (
+        f"/api/categories/{c.pop('categories')}", None, "admin", (204,)),
+    ("category_posts", "GET"): lambda c: (
+        f"/api/categories/{c.ids['categoria']}/posts?limit=20", None, None, (200,)),
+    ("user_list", "GET"): lambda c: ("/api/users", None, "admin", (200,)),
+    ("user_detail", "GET"): lambda c: (f"/api/users/{c.ids['user']}", None, "admin", (200,)),
+    ("user_detail", "PATCH"): lambda c: (
+        f"/api/users/{c.pools['users'][0]}", {"role": ("user", "moderator")[c.seq() % 2]}, "admin", (200,)),
+    ("user_detail", "DELETE"): lambda c: (f"/api/users/{c.pop('users')}", None, "admin", (204,)),
+    ("stats", "GET"): lambda c: ("/api/stats", None, "admin", (200,)),
+    ("reviews_all", "GET"): lambda c: ("/api/reviews", None, "moderator", (200,)),
+    ("search", "GET"): lambda c: ("/api/search?q=receta+viaje", None, None, (200,)),
+    ("cache_stats", "GET"): lambda c: ("/api/cache/stats", None, "admin", (200,)),
+    ("metrics", "GET"): lambda c: ("/api/metrics", None, None, (200,)),
+}
+
+# El orden importa: los DELETE van al final de cada grupo para no borrar lo que usan los otros
+ORDEN_METODOS = {"GET": 0, "POST": 1, "PUT": 2, "PATCH": 3, "DELETE": 4}
+
+
+def rutas(app):
+    out = []
+    for rule in app.url_map.iter_rules():
+        if rule.endpoint == "static":
+            continue
+        for method in sorted(rule.methods - {"HEAD", "OPTIONS"}, key=ORDEN_METODOS.get):
+            out.append((rule.endpoint, method))
+    faltan = [r for r in out if r not in ESCENARIOS]
+    if faltan:
+        raise SystemExit(f"Rutas sin escenario de benchmark: {faltan}")
+    return out
+
+
+# =========================
+#          Medición
+# =========================
+def pedir(port, method, path, body, token):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    headers = {"Content-Type": "application/json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    data = json.dumps(body).encode() if body is not None else None
+    t0 = time.perf_counter()
+    conn.request(method, path, body=data, headers=headers)
+    resp = conn.getresponse()
+    resp.read()
+    ms = (time.perf_counter() - t0) * 1000
+    conn.close()
+    return resp.status, ms
+
+
+def medir(port, ctx, endpoint, method, n, concurrency):
+    escenario = ESCENARIOS[(endpoint, method)]
+    latencias, errores = [], []
+
+    def uno(_):
+        path, body, rol, esperados = escenario(ctx)
+        status, ms = pedir(port, method, path, body, ctx.tokens.get(rol))
+        latencias.append(ms)
+        if status not in esperados:
+            errores.append(status)
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(uno, range(n)))
+    total = time.perf_counter() - inicio
+
+    q = statistics.quantiles(latencias, n=100) if len(latencias) > 1 else latencias * 99
+    return {
+        "requests": n,
+        "errors": len(errores),
+        "error_statuses": sorted(set(errores)),
+        "rps": round(n / total, 2),
+        "p50_ms": round(q[49], 3),
+        "p95_ms": round(q[94], 3),
+        "p99_ms": round(q[98], 3),
+    }
+
+
+def comparar(resultados, baseline_path, threshold) -> int:
+    with open(baseline_path) as f:
+        base = json.load(f)["results"]
+    regresiones = 0
+    for nombre, r in resultados.items():
+        b = base.get(nombre)
+        if not b:
+            continue
+        motivos = []
+        if r["p95_ms"] > b["p95_ms"] * (1 + threshold):
+            motivos.append(f"p95 {b['p95_ms']:.1f} -> {r['p95_ms']:.1f} ms")
+        if r["rps"] < b["rps"] * (1 - threshold):
+            motivos.append(f"rps {b['rps']:.0f} -> {r['rps']:.0f}")
+        if motivos:
+            regresiones += 1
+            print(f"REGRESIÓN {nombre}: {', '.join(motivos)}")
+    return regresiones
+
+
+def main():
+    args = parse_args()
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+    os.environ.setdefault("RATELIMIT_ENABLED", "0")   # login/register se miden sin el limitador
+
+    from werkzeug.serving import make_server
+    from app import create_app
+
+    app = create_app()
+    ctx = preparar(app, args)
+    # sin el log de acceso de werkzeug ni los print() de las vistas mezclados con la tabla
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    seleccion = set(args.only.split(",")) if args.only else None
+    resultados = {}
+    print(f"{'endpoint':<28} {'req':>6} {'err':>5} {'rps':>9} {'p50':>9} {'p95':>9} {'p99':>9}")
+    try:
+        for endpoint, method in rutas(app):
+            if seleccion and endpoint not in seleccion:
+                continue
+            with contextlib.redirect_stdout(open(os.devnull, "w")):
+                r = medir(server.server_port, ctx, endpoint, method, args.requests, args.concurrency)
+            nombre = f"{endpoint} {method}"
+            resultados[nombre] = r
+            print(f"{nombre:<28} {r['requests']:>6} {r['errors']:>5} {r['rps']:>9.1f} "
+                  f"{r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f}")
+    finally:
+        server.shutdown()
+
+    salida = {
+        "meta": {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "database": app.config["SQLALCHEMY_DATABASE_URI"].split("@")[-1],
+            "requests": args.requests, "concurrency": args.concurrency,
+            "usuarios": args.usuarios, "posts": args.posts, "comentarios": args.comentarios,
+        },
+        "results": resultados,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(salida, f, indent=2)
+    if args.baseline and comparar(resultados, args.baseline, args.threshold):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
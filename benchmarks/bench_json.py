@@ -0,0 +1,130 @@
+# benchmarks/bench_json.py
+"""
+Benchmark de codificación JSON y bytes en el cable por endpoint.
+
+Para las respuestas más grandes de la API (reviews, usuarios, una página de
+100 posts y los comentarios del post más comentado) mide:
+- codificación: tiempo de armar el cuerpo con el json de la stdlib
+  (DefaultJSONProvider) contra FastJSONProvider (app/json_provider.py, orjson
+  si está instalado), verificando que los bytes sean idénticos;
+- cable: bytes de la respuesta sin comprimir, con gzip y con br (si está
+  instalado brotli), tal como los sirve la app según Accept-Encoding;
+- latencia p50 del request completo con y sin Accept-Encoding: gzip.
+
+Va contra la app en proceso con el test client, sin caché de respuestas.
+
+Uso:
+    python benchmarks/bench_json.py --repeticiones 200 --out json.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--repeticiones", type=int, default=200, help="codificaciones/requests por medición")
+    p.add_argument("--usuarios", type=int, default=500)
+    p.add_argument("--posts", type=int, default=5000)
+    p.add_argument("--comentarios", type=int, default=20000)
+    p.add_argument("--out", help="archivo JSON de salida")
+    return p.parse_args()
+
+
+def mediana_ms(fn, repeticiones: int) -> float:
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        fn()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def main():
+    args = parse_args()
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+    os.environ["CACHE_BACKEND"] = "none"
+
+    from flask.json.provider import DefaultJSONProvider
+    from flask_jwt_extended import create_access_token
+    from app import create_app, db
+    from app.compression import compression
+    from app.json_provider import orjson
+    from app.models import Comentario, Usuario
+    from app.synthetic import generate
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        if not db.session.scalar(db.select(db.func.count()).select_from(Usuario)):
+            generate(usuarios=args.usuarios, posts=args.posts, comentarios=args.comentarios, log=lambda *_: None)
+        admin = db.session.scalar(db.select(Usuario).where(Usuario.role == "admin")) \
+            or db.session.scalar(db.select(Usuario))
+        admin.role = "admin"
+        db.session.commit()
+        token = create_access_token(identity=str(admin.id), additional_claims={"role": "admin"})
+        top = db.session.execute(
+            db.select(Comentario.post_id).group_by(Comentario.post_id)
+            .order_by(db.func.count().desc()).limit(1)
+        ).scalar()
+
+    endpoints = {
+        "reviews": "/api/reviews",
+        "users": "/api/users",
+        "posts?limit=100": "/api/posts?limit=100",
+        f"comments de {top}": f"/api/posts/{top}/comments",
+    }
+    auth = {"Authorization": f"Bearer {token}"}
+    codings = ["identity", *compression.codings]
+    client = app.test_client()
+    stdlib = DefaultJSONProvider(app)
+    stdlib.ensure_ascii = app.json.ensure_ascii
+    resultados = {}
+
+    with app.app_context(), contextlib.redirect_stdout(open(os.devnull, "w")):
+        for nombre, path in endpoints.items():
+            plano = client.get(path, headers=auth)
+            assert plano.status_code == 200, (path, plano.status_code)
+            cuerpo = plano.get_json()
+            esperado = stdlib.dumps(cuerpo, separators=(",", ":")).encode()
+            assert app.json.dumps_bytes(cuerpo) == esperado, nombre
+
+            r = {
+                "stdlib_ms": mediana_ms(lambda: stdlib.dumps(cuerpo, separators=(",", ":")).encode(),
+                                        args.repeticiones),
+                "rapido_ms": mediana_ms(lambda: app.json.dumps_bytes(cuerpo), args.repeticiones),
+                "bytes": {},
+            }
+            for coding in codings:
+                resp = client.get(path, headers={**auth, "Accept-Encoding": coding})
+                assert resp.headers.get("Content-Encoding", "identity") == coding, (path, coding)
+                r["bytes"][coding] = len(resp.data)
+            r["request_identity_ms"] = mediana_ms(lambda: client.get(path, headers=auth), args.repeticiones // 4 or 1)
+            r["request_gzip_ms"] = mediana_ms(
+                lambda: client.get(path, headers={**auth, "Accept-Encoding": "gzip"}), args.repeticiones // 4 or 1)
+            resultados[nombre] = r
+
+    print(f"codificador rápido: {'orjson ' + orjson.__version__ if orjson else 'no disponible (stdlib)'}")
+    print(f"{'endpoint':<22} {'stdlib ms':>10} {'rápido ms':>10} {'x':>5} "
+          + " ".join(f"{c:>10}" for c in codings) + f" {'req ms':>8} {'req gz ms':>10}")
+    for nombre, r in resultados.items():
+        print(f"{nombre:<22} {r['stdlib_ms']:>10.2f} {r['rapido_ms']:>10.2f} "
+              f"{r['stdlib_ms'] / max(r['rapido_ms'], 1e-9):>5.1f} "
+              + " ".join(f"{r['bytes'][c]:>10}" for c in codings)
+              + f" {r['request_identity_ms']:>8.2f} {r['request_gzip_ms']:>10.2f}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"args": vars(args), "results": resultados}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/bench_login.py
+"""
+Throughput de POST /api/login con distintos niveles de concurrencia y latencia
+de un endpoint barato (GET /api/categories) mientras dura la ráfaga.
+
+Uso:
+    BCRYPT_ROUNDS=12 python benchmarks/bench_login.py 1 4 16 64
+"""
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+LOGINS_POR_HILO = 8
+
+tmp = tempfile.mkdtemp()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+os.environ.setdefault("CACHE_BACKEND", "none")
+
+from app import create_app, db  # noqa: E402
+from app.models import Usuario, UserCredentials  # noqa: E402
+
+
+def preparar(app):
+    with app.app_context():
+        db.create_all()
+        u = Usuario(username="bench", email="bench@mail.com", role="user")
+        db.session.add_all([u, UserCredentials(usuario=u, password_hash=UserCredentials.hash_pwd("bench123"))])
+        db.session.commit()
+
+
+def rafaga(app, concurrencia: int):
+    estados, lat_baratas = [], []
+    fin = threading.Event()
+
+    def login():
+        cliente = app.test_client()
+        for _ in range(LOGINS_POR_HILO):
+            r = cliente.post("/api/login", json={"email": "bench@mail.com", "password": "bench123"})
+            estados.append(r.status_code)
+
+    def barato():
+        cliente = app.test_client()
+        while not fin.is_set():
+            t0 = time.perf_counter()
+            cliente.get("/api/categories")
+            lat_baratas.append((time.perf_counter() - t0) * 1000)
+            time.sleep(0.01)
+
+    sonda = threading.Thread(target=barato)
+    sonda.start()
+    hilos = [threading.Thread(target=login) for _ in range(concurrencia)]
+    inicio = time.perf_counter()
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    total = time.perf_counter() - inicio
+    fin.set()
+    sonda.join()
+
+    ok = estados.count(200)
+    p99 = statistics.quantiles(lat_baratas, n=100)[98] if len(lat_baratas) > 1 else lat_baratas[0]
+    print(f"{concurrencia:>6} {ok / total:>10.1f} {estados.count(503):>6} {p99:>16.2f}")
+
+
+if __name__ == "__main__":
+    app = create_app()
+    preparar(app)
+    niveles = [int(x) for x in sys.argv[1:]] or [1, 4, 16, 64]
+    print(f"BCRYPT_ROUNDS={app.config['BCRYPT_ROUNDS']} HASH_WORKERS={app.config['HASH_WORKERS']} "
+          f"HASH_MAX_QUEUE={app.config['HASH_MAX_QUEUE']}")
+    print(f"{'hilos':>6} {'logins/s':>10} {'503':>6} {'p99 categories ms':>16}")
+    for n in niveles:
+        rafaga(app, n)
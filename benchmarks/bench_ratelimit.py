@@ -0,0 +1,180 @@
+# benchmarks/bench_ratelimit.py
+"""
+Benchmark del rate limiting de login bajo un ataque de credential stuffing simulado.
+
+Levanta la app (run:app en un servidor WSGI con hilos) en un subproceso contra
+una base poblada con app/synthetic.py y mide, durante --duracion segundos, la
+latencia de un cliente legítimo (GET /api/posts y GET /api/me con token) en
+tres escenarios:
+- sin ataque: solo el tráfico legítimo;
+- ataque sin limitador: --atacantes hilos mandan POST /api/login con emails
+  reales y claves incorrectas (cada intento es un verify de bcrypt);
+- ataque con limitador: lo mismo con RATELIMIT_ENABLED=1 (app/ratelimit.py).
+
+Reporta latencias p50/p95/p99 del cliente legítimo, intentos del atacante por
+status (401, 429, 503) y CPU del servidor (segundos de usuario + sistema).
+
+Uso:
+    python benchmarks/bench_ratelimit.py --atacantes 16 --duracion 10 --out ratelimit.json
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+LEGITIMOS = ("/api/posts?limit=20", "/api/me")
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--atacantes", type=int, default=16, help="hilos del atacante")
+    p.add_argument("--legitimos", type=int, default=2, help="hilos del cliente legítimo")
+    p.add_argument("--duracion", type=float, default=10, help="segundos por escenario")
+    p.add_argument("--usuarios", type=int, default=500)
+    p.add_argument("--posts", type=int, default=2000)
+    p.add_argument("--comentarios", type=int, default=5000)
+    p.add_argument("--out", help="archivo JSON de salida")
+    # uso interno: levantar el servidor
+    p.add_argument("--serve", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    return p.parse_args()
+
+
+def serve(port: int):
+    import logging
+    from werkzeug.serving import make_server
+    from run import app
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    make_server("127.0.0.1", port, app, threaded=True).serve_forever()
+
+
+def preparar(args):
+    """Puebla la base; devuelve (token del cliente legítimo, emails para el ataque)."""
+    from flask_jwt_extended import create_access_token
+    from app import create_app, db
+    from app.models import Usuario
+    from app.synthetic import generate
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        if not db.session.scalar(db.select(db.func.count()).select_from(Usuario)):
+            generate(usuarios=args.usuarios, posts=args.posts, comentarios=args.comentarios, log=lambda *_: None)
+        usuario = db.session.scalar(db.select(Usuario).where(Usuario.is_active == True).limit(1))
+        token = create_access_token(identity=str(usuario.id), additional_claims={
+            "role": usuario.role, "tv": usuario.token_version})
+        emails = list(db.session.scalars(db.select(Usuario.email).where(Usuario.is_active == True)))
+    return token, emails
+
+
+def libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def pedir(port, method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    try:
+        conn.request(method, path, body=body, headers=headers or {})
+        resp = conn.getresponse()
+        resp.read()
+        return resp.status
+    finally:
+        conn.close()
+
+
+def escenario(args, env, token, emails, atacar: bool) -> dict:
+    port = libre()
+    proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve", str(port)],
+                            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(200):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    for path in LEGITIMOS:   # primer request de cada ruta fuera de la medición
+        pedir(port, "GET", path, headers={"Authorization": f"Bearer {token}"})
+
+    fin = time.monotonic() + args.duracion
+    latencias, ataque, lock = [], Counter(), threading.Lock()
+
+    def legitimo():
+        rng = random.Random()
+        while time.monotonic() < fin:
+            inicio = time.perf_counter()
+            status = pedir(port, "GET", rng.choice(LEGITIMOS), headers={"Authorization": f"Bearer {token}"})
+            with lock:
+                latencias.append(((time.perf_counter() - inicio) * 1000, status))
+
+    def atacante():
+        rng = random.Random()
+        while time.monotonic() < fin:
+            body = json.dumps({"email": rng.choice(emails), "password": f"clave{rng.random()}"})
+            status = pedir(port, "POST", "/api/login", body, {"Content-Type": "application/json"})
+            with lock:
+                ataque[status] += 1
+
+    hilos = [threading.Thread(target=legitimo) for _ in range(args.legitimos)]
+    if atacar:
+        hilos += [threading.Thread(target=atacante) for _ in range(args.atacantes)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+
+    proc.terminate()
+    _, _, uso = os.wait4(proc.pid, 0)
+    tiempos = [ms for ms, status in latencias if status == 200]
+    q = statistics.quantiles(tiempos, n=100)
+    return {
+        "legitimos_ok": len(tiempos),
+        "legitimos_error": len(latencias) - len(tiempos),
+        "p50_ms": round(q[49], 2), "p95_ms": round(q[94], 2), "p99_ms": round(q[98], 2),
+        "ataque": dict(sorted(ataque.items())),
+        "cpu_servidor_s": round(uso.ru_utime + uso.ru_stime, 2),
+    }
+
+
+def main():
+    args = parse_args()
+    if args.serve:
+        return serve(args.serve)
+
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+    os.environ["CACHE_BACKEND"] = "none"
+    token, emails = preparar(args)
+
+    resultados = {}
+    for nombre, atacar, limitar in (("sin ataque", False, True),
+                                    ("ataque sin limitador", True, False),
+                                    ("ataque con limitador", True, True)):
+        env = dict(os.environ, RATELIMIT_ENABLED="1" if limitar else "0")
+        resultados[nombre] = escenario(args, env, token, emails, atacar)
+
+    print(f"{'escenario':<22} {'ok':>6} {'err':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'cpu s':>7}  ataque")
+    for nombre, r in resultados.items():
+        print(f"{nombre:<22} {r['legitimos_ok']:>6} {r['legitimos_error']:>5} {r['p50_ms']:>8.2f} "
+              f"{r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['cpu_servidor_s']:>7.2f}  {r['ataque'] or '-'}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"args": {k: v for k, v in vars(args).items() if k != "serve"}, "results": resultados},
+                      f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
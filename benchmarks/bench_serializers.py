@@ -0,0 +1,99 @@
+# benchmarks/bench_serializers.py
+"""
+Serialización de listados: marshmallow sobre objetos ORM vs. RowEncoder sobre
+filas de select(). Antes de medir verifica que el JSON sea idéntico byte a byte.
+
+Uso:
+    python benchmarks/bench_serializers.py 1000 10000
+"""
+import os
+import sys
+import tempfile
+import time
+from functools import partial
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+
+from flask import json  # noqa: E402
+
+from app import create_app, db  # noqa: E402
+from app.models import Usuario, Post, Comentario, Categoria  # noqa: E402
+from app.schemas import UsuarioSchema, PostSchema, ComentarioSchema, CategoriaSchema  # noqa: E402
+from app.serializers import (  # noqa: E402
+    usuario_encoder, post_encoder, comentario_encoder, categoria_encoder
+)
+
+CASOS = [
+    ("usuarios", Usuario, UsuarioSchema, usuario_encoder),
+    ("posts", Post, partial(PostSchema, exclude=("extracto",)), post_encoder),   # extracto: solo con ?fields=
+    ("comentarios", Comentario, ComentarioSchema, comentario_encoder),
+    ("categorias", Categoria, CategoriaSchema, categoria_encoder),
+]
+
+
+def poblar(n: int):
+    ahora = datetime.now()
+    db.session.execute(db.insert(Usuario), [
+        {"id": i + 1, "username": f"u{i}", "email": f"u{i}@mail.com", "role": "user",
+         "is_active": i % 7 != 0, "created_at": ahora - timedelta(seconds=i, microseconds=i)}
+        for i in range(n)
+    ])
+    db.session.execute(db.insert(Post), [
+        {"id": i + 1, "titulo": f"Título ñ {i}", "contenido": "contenido " * 50, "usuario_id": 1,
+         "is_published": i % 3 != 0, "fecha_creacion": ahora - timedelta(minutes=i),
+         "updated_at": None if i % 5 == 0 else ahora}
+        for i in range(n)
+    ])
+    db.session.execute(db.insert(Comentario), [
+        {"texto": f"comentario «{i}»", "usuario_id": 1, "post_id": 1, "is_visible": i % 4 != 0,
+         "fecha_creacion": ahora - timedelta(seconds=i)}
+        for i in range(n)
+    ])
+    db.session.execute(db.insert(Categoria), [{"nombre": f"cat {i}"} for i in range(min(n, 500))])
+    db.session.commit()
+
+
+def medir(fn, repeticiones=5):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        fn()
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor * 1000
+
+
+def main(n: int):
+    app = create_app()
+    with app.test_request_context():
+        db.drop_all()
+        db.create_all()
+        poblar(n)
+        for nombre, model, schema_cls, encoder in CASOS:
+            orden = model.id.asc()
+            objs = db.session.execute(db.select(model).order_by(orden)).scalars().all()
+            rows = db.session.execute(encoder.select().order_by(orden)).all()
+            viejo = json.dumps(schema_cls(many=True).dump(objs))
+            nuevo = json.dumps(encoder.dump_many(rows))
+            assert viejo == nuevo, f"{nombre}: la salida difiere"
+
+            def con_marshmallow():
+                db.session.expunge_all()
+                items = db.session.execute(db.select(model).order_by(orden)).scalars().all()
+                return json.dumps(schema_cls(many=True).dump(items))
+
+            def con_encoder():
+                items = db.session.execute(encoder.select().order_by(orden)).all()
+                return json.dumps(encoder.dump_many(items))
+
+            t_old, t_new = medir(con_marshmallow), medir(con_encoder)
+            print(f"{n:>8} {nombre:<12} {t_old:>14.2f} {t_new:>12.2f} {t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    print(f"{'filas':>8} {'tabla':<12} {'marshmallow ms':>14} {'encoder ms':>12} {'mejora':>8}")
+    for n in [int(x) for x in sys.argv[1:]] or [1_000, 10_000]:
+        main(n)
@@ -0,0 +1,159 @@
+# benchmarks/bench_startup.py
+"""
+Benchmark de arranque de workers: import, create_app() y primer request.
+
+Mide, en intérpretes nuevos (--repeticiones veces cada uno):
+- import: tiempo de importar app (Flask, SQLAlchemy, extensiones, modelos);
+- create_app: tiempo de create_app() (vistas, passlib, marshmallow, schemas);
+- primer request vs régimen: latencia del primer GET público contra la mediana
+  de los siguientes (lo que paga el primer usuario de cada worker nuevo);
+- arranque en frío: desde que se lanza el proceso hasta la primera respuesta,
+  como un worker sin --preload;
+- fork precargado: desde el fork() de un master que ya hizo create_app() y
+  warm_up() (app/preload.py) hasta la primera respuesta, como gunicorn --preload.
+
+Uso:
+    python benchmarks/bench_startup.py --repeticiones 5 --out arranque.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PATH = "/api/posts"
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--repeticiones", type=int, default=5)
+    p.add_argument("--requests", type=int, default=50, help="requests para la latencia en régimen")
+    p.add_argument("--usuarios", type=int, default=200)
+    p.add_argument("--posts", type=int, default=2000)
+    p.add_argument("--comentarios", type=int, default=5000)
+    p.add_argument("--out", help="archivo JSON de salida")
+    # uso interno: una medición en un intérprete nuevo
+    p.add_argument("--medir", action="store_true", help=argparse.SUPPRESS)
+    return p.parse_args()
+
+
+# =========================
+#   Medición (subproceso)
+# =========================
+def medir(n_requests: int):
+    """Corre en un intérprete nuevo; imprime los tiempos en JSON (ms)."""
+    t0 = time.perf_counter()
+    import app as paquete
+    t1 = time.perf_counter()
+    flask_app = paquete.create_app()
+    t2 = time.perf_counter()
+    client = flask_app.test_client()
+    assert client.get(PATH).status_code == 200
+    t3 = time.perf_counter()
+    regimen = []
+    for _ in range(n_requests):
+        inicio = time.perf_counter()
+        client.get(PATH)
+        regimen.append(time.perf_counter() - inicio)
+    print(json.dumps({
+        "import_ms": (t1 - t0) * 1000,
+        "create_app_ms": (t2 - t1) * 1000,
+        "primer_request_ms": (t3 - t2) * 1000,
+        "regimen_ms": statistics.median(regimen) * 1000 if regimen else None,
+    }))
+
+
+def en_frio(env) -> float:
+    """Desde que se lanza un proceso nuevo hasta su primera respuesta (ms)."""
+    inicio = time.perf_counter()
+    subprocess.run([sys.executable, os.path.abspath(__file__), "--medir", "--requests", "0"],
+                   cwd=ROOT, env=env, capture_output=True, check=True)
+    return (time.perf_counter() - inicio) * 1000
+
+
+def precargado(repeticiones: int):
+    """fork() desde un master precalentado hasta la primera respuesta del hijo (ms)."""
+    from app import create_app
+    from app.preload import warm_up, after_fork
+
+    master = create_app()
+    warm_up(master)
+    tiempos = []
+    for _ in range(repeticiones):
+        r, w = os.pipe()
+        inicio = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            os.close(r)
+            after_fork(master)
+            status = master.test_client().get(PATH).status_code
+            os.write(w, str(status).encode())
+            os._exit(0)
+        os.close(w)
+        status = os.read(r, 16)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+        os.close(r)
+        os.waitpid(pid, 0)
+        assert status == b"200", status
+    return tiempos
+
+
+def preparar(args):
+    from app import create_app, db
+    from app.models import Post
+    from app.synthetic import generate
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        if not db.session.scalar(db.select(db.func.count()).select_from(Post)):
+            generate(usuarios=args.usuarios, posts=args.posts, comentarios=args.comentarios, log=lambda *_: None)
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def resumen(valores):
+    return {"mediana": round(statistics.median(valores), 2), "min": round(min(valores), 2),
+            "max": round(max(valores), 2)}
+
+
+def main():
+    args = parse_args()
+    if args.medir:
+        return medir(args.requests)
+
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+    os.environ.setdefault("CACHE_BACKEND", "none")   # se mide el arranque, no la caché
+    env = dict(os.environ)
+    preparar(args)
+
+    internos = []
+    for _ in range(args.repeticiones):
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--medir", "--requests", str(args.requests)],
+                             cwd=ROOT, env=env, capture_output=True, text=True, check=True).stdout
+        internos.append(json.loads(out.strip().splitlines()[-1]))
+    frio = [en_frio(env) for _ in range(args.repeticiones)]
+    fork = precargado(args.repeticiones)
+
+    resultados = {k: resumen([d[k] for d in internos]) for k in internos[0]}
+    resultados["arranque_en_frio_ms"] = resumen(frio)
+    resultados["fork_precargado_ms"] = resumen(fork)
+
+    print(f"{'medición':<22} {'mediana':>10} {'min':>10} {'max':>10}")
+    for nombre, r in resultados.items():
+        print(f"{nombre:<22} {r['mediana']:>10.2f} {r['min']:>10.2f} {r['max']:>10.2f}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"args": {k: v for k, v in vars(args).items() if k != "medir"},
+                       "results": resultados}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/bench_stats.py
+"""
+GET /api/stats: COUNT(*) sobre las tablas vs. contadores materializados.
+
+Uso:
+    python benchmarks/bench_stats.py 10000 100000 1000000
+
+Pobla una base SQLite temporal con N posts y 2N comentarios (inserts Core,
+sin eventos), reconstruye los contadores y mide el tiempo medio por llamada.
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+REPETICIONES = 50
+
+
+def stats_con_count(db, func, Post, Comentario, Usuario):
+    week_ago = datetime.now() - timedelta(days=7)
+    return {
+        "total_posts": db.session.scalar(db.select(func.count()).select_from(Post)),
+        "total_comments": db.session.scalar(db.select(func.count()).select_from(Comentario)),
+        "total_users": db.session.scalar(db.select(func.count()).select_from(Usuario)),
+        "posts_last_week": db.session.scalar(
+            db.select(func.count()).select_from(Post).where(Post.fecha_creacion >= week_ago)),
+    }
+
+
+def medir(fn):
+    inicio = time.perf_counter()
+    for _ in range(REPETICIONES):
+        resultado = fn()
+    return (time.perf_counter() - inicio) / REPETICIONES * 1000, resultado
+
+
+def correr(n: int):
+    from sqlalchemy import func
+    from app import create_app, db
+    from app.models import Usuario, Post, Comentario
+    from app.stats import reconcile, read_stats
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        db.session.add(Usuario(id=1, username="bench", email="bench@mail.com"))
+        db.session.commit()
+        ahora = datetime.now()
+        lote = 20_000
+        for start in range(0, n, lote):
+            db.session.execute(db.insert(Post), [
+                {"id": i + 1, "titulo": f"post {i}", "contenido": "x", "usuario_id": 1,
+                 "fecha_creacion": ahora - timedelta(minutes=i * 7)}
+                for i in range(start, min(start + lote, n))
+            ])
+            db.session.execute(db.insert(Comentario), [
+                {"texto": "c", "usuario_id": 1, "post_id": i % n + 1}
+                for i in range(2 * start, min(2 * (start + lote), 2 * n))
+            ])
+            db.session.commit()
+        reconcile()
+
+        t_count, r_count = medir(lambda: stats_con_count(db, func, Post, Comentario, Usuario))
+        t_cont, r_cont = medir(lambda: read_stats(include_week=True))
+        assert r_count == r_cont, (r_count, r_cont)
+        print(f"{n:>10} {t_count:>14.3f} {t_cont:>16.3f} {t_count / t_cont:>8.1f}x")
+
+
+if __name__ == "__main__":
+    cantidades = [int(x) for x in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    print(f"{'posts':>10} {'COUNT(*) ms':>14} {'contadores ms':>16} {'mejora':>9}")
+    for n in cantidades:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+            # cada tamaño en un proceso limpio (create_app lee DATABASE_URL al importar config)
+            if os.fork() == 0:
+                correr(n)
+                os._exit(0)
+            os.wait()
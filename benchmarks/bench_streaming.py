@@ -0,0 +1,79 @@
+# benchmarks/bench_streaming.py
+"""
+Pico de memoria (RSS) de GET /api/reviews con y sin ?stream=ndjson.
+
+Uso:
+    python benchmarks/bench_streaming.py 10000 100000 1000000
+
+Cada medición corre en un subproceso propio contra una base SQLite temporal,
+así ru_maxrss refleja solo esa petición.
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def poblar(db_path: str, n: int):
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    from app import create_app, db
+    from app.models import Usuario, Post, Comentario
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        db.session.add(Usuario(id=1, username="bench", email="bench@mail.com", role="admin"))
+        db.session.add(Post(id=1, titulo="bench", contenido="bench", usuario_id=1))
+        db.session.commit()
+        lote = 10_000
+        for start in range(0, n, lote):
+            db.session.execute(
+                db.insert(Comentario),
+                [{"texto": f"comentario {i} " * 4, "usuario_id": 1, "post_id": 1, "is_visible": True}
+                 for i in range(start, min(start + lote, n))],
+            )
+            db.session.commit()
+
+
+def medir(db_path: str, modo: str):
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    from flask_jwt_extended import create_access_token
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        token = create_access_token(identity="1", additional_claims={"role": "admin"})
+    url = "/api/reviews" + ("?stream=ndjson" if modo == "stream" else "")
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    resp = app.test_client().get(url, headers={"Authorization": f"Bearer {token}"}, buffered=False)
+    total = sum(len(chunk) for chunk in resp.response)
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{pico - base},{total}")
+
+
+def main(cantidades):
+    print(f"{'comentarios':>12} {'modo':>8} {'pico RSS (MB)':>14} {'bytes':>12}")
+    for n in cantidades:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "bench.db")
+            subprocess.run([sys.executable, __file__, "--poblar", db_path, str(n)], check=True)
+            for modo in ("buffer", "stream"):
+                out = subprocess.run(
+                    [sys.executable, __file__, "--medir", db_path, modo],
+                    check=True, capture_output=True, text=True,
+                ).stdout.strip().splitlines()[-1]
+                kb, total = out.split(",")
+                print(f"{n:>12} {modo:>8} {int(kb) / 1024:>14.1f} {int(total):>12}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--poblar"]:
+        poblar(sys.argv[2], int(sys.argv[3]))
+    elif sys.argv[1:2] == ["--medir"]:
+        medir(sys.argv[2], sys.argv[3])
+    else:
+        main([int(x) for x in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,171 @@
+# benchmarks/bench_sync.py
+"""
+Benchmark de sincronización de clientes: bytes y CPU por estrategia.
+
+Un cliente ya tiene todos los posts publicados y los comentarios de cada uno;
+después se edita, se comenta y se borra --cambios por ciento de los posts, y el
+cliente se pone al día de tres formas:
+- completo: vuelve a bajar todas las páginas de /api/posts y los comentarios
+  de cada post (lo que hacen hoy los clientes móviles);
+- incremental: /api/posts?updated_since=<sync_token> y, por cada post que
+  conoce, /api/posts/<id>/comments?updated_since=<sync_token>;
+- condicional: lo mismo que completo pero con If-None-Match (ETag guardado de
+  la sincronización anterior): lo que no cambió vuelve como 304 sin cuerpo.
+
+Reporta requests, bytes de respuesta, CPU (del proceso: cliente de prueba +
+app) y tiempo total de cada estrategia. Va contra la app en proceso con el
+test client, sin caché de respuestas.
+
+Uso:
+    python benchmarks/bench_sync.py --posts 2000 --comentarios 10000 --cambios 1 --out sync.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+LIMIT = 100
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--usuarios", type=int, default=200)
+    p.add_argument("--posts", type=int, default=2000)
+    p.add_argument("--comentarios", type=int, default=10000)
+    p.add_argument("--cambios", type=float, default=1.0, help="porcentaje de posts modificados")
+    p.add_argument("--semilla", type=int, default=42)
+    p.add_argument("--out", help="archivo JSON de salida")
+    return p.parse_args()
+
+
+class Cliente:
+    """Cuenta requests y bytes; guarda ETags por path para If-None-Match."""
+
+    def __init__(self, client):
+        self.client = client
+        self.etags = {}
+        self.guardadas = {}    # (path, cursor) -> (items, next_cursor) de cada página
+        self.requests = 0
+        self.bytes = 0
+
+    def get(self, path, condicional=False):
+        headers = {"If-None-Match": self.etags[path]} if condicional and path in self.etags else {}
+        resp = self.client.get(path, headers=headers)
+        assert resp.status_code in (200, 304), (path, resp.status_code)
+        self.requests += 1
+        self.bytes += len(resp.data)
+        if "ETag" in resp.headers:
+            self.etags[path] = resp.headers["ETag"]
+        return resp
+
+    def paginas(self, path, condicional=False):
+        """Recorre todas las páginas; las que vuelven 304 salen de la copia local."""
+        items, cursor = [], None
+        while True:
+            sep = "&" if "?" in path else "?"
+            resp = self.get(f"{path}{sep}limit={LIMIT}" + (f"&cursor={cursor}" if cursor else ""), condicional)
+            if resp.status_code != 304:
+                body = resp.get_json()
+                self.guardadas[(path, cursor)] = body["items"], body["next_cursor"]
+            pagina, cursor = self.guardadas[(path, cursor)]
+            items += pagina
+            if not cursor:
+                return items
+
+
+def sincronizar(cliente, modo, post_ids, token):
+    """Una puesta al día completa según modo; devuelve el sync_token nuevo."""
+    if modo == "incremental":
+        nuevo, cursor = token, None
+        while True:
+            body = cliente.get(f"/api/posts?updated_since={token}&limit={LIMIT}"
+                               + (f"&cursor={cursor}" if cursor else "")).get_json()
+            post_ids.update(p["id"] for p in body["items"])
+            post_ids.difference_update(body["deleted"])
+            nuevo = max(nuevo, body["sync_token"])
+            cursor = body["next_cursor"]
+            if not cursor:
+                break
+        for pid in sorted(post_ids):
+            cliente.get(f"/api/posts/{pid}/comments?updated_since={token}")
+        return nuevo
+
+    condicional = modo == "condicional"
+    post_ids.clear()
+    post_ids.update(p["id"] for p in cliente.paginas("/api/posts", condicional))
+    for pid in sorted(post_ids):
+        cliente.get(f"/api/posts/{pid}/comments", condicional)
+    return token
+
+
+def main():
+    args = parse_args()
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+    os.environ["CACHE_BACKEND"] = "none"
+
+    from datetime import datetime
+    from app import create_app, db
+    from app.models import Post, Comentario
+    from app.synthetic import generate
+
+    app = create_app()
+    rng = random.Random(args.semilla)
+    resultados = {}
+    with app.app_context(), contextlib.redirect_stdout(open(os.devnull, "w")):
+        db.create_all()
+        if not db.session.scalar(db.select(db.func.count()).select_from(Post)):
+            generate(usuarios=args.usuarios, posts=args.posts, comentarios=args.comentarios,
+                     semilla=args.semilla, log=lambda *_: None)
+
+        # Estado inicial de cada cliente: una sincronización completa
+        clientes, estado = {}, {}
+        token = datetime.now().isoformat()
+        for modo in ("completo", "incremental", "condicional"):
+            clientes[modo] = Cliente(app.test_client())
+            estado[modo] = set()
+            sincronizar(clientes[modo], "condicional", estado[modo], token)
+
+        # Cambios: edición de posts, comentarios nuevos y borrados
+        publicados = list(db.session.scalars(db.select(Post).where(Post.is_published == True)))
+        n = max(1, int(len(publicados) * args.cambios / 100))
+        elegidos = rng.sample(publicados, 3 * n)
+        for p in elegidos[:n]:
+            p.titulo = p.titulo + " (editado)"
+        for p in elegidos[n:2 * n]:
+            db.session.add(Comentario(texto="comentario nuevo", usuario_id=p.usuario_id, post_id=p.id))
+        for p in elegidos[2 * n:]:
+            db.session.delete(p)
+        db.session.commit()
+
+        for modo, cliente in clientes.items():
+            cliente.requests = cliente.bytes = 0
+            cpu, inicio = time.process_time(), time.perf_counter()
+            sincronizar(cliente, modo, estado[modo], token)
+            resultados[modo] = {
+                "requests": cliente.requests,
+                "bytes": cliente.bytes,
+                "cpu_ms": round((time.process_time() - cpu) * 1000, 1),
+                "total_ms": round((time.perf_counter() - inicio) * 1000, 1),
+            }
+        assert estado["completo"] == estado["incremental"] == estado["condicional"]
+
+    base = resultados["completo"]
+    print(f"{'estrategia':<12} {'requests':>9} {'bytes':>12} {'cpu_ms':>9} {'total_ms':>9} {'bytes %':>8} {'cpu %':>7}")
+    for modo, r in resultados.items():
+        print(f"{modo:<12} {r['requests']:>9} {r['bytes']:>12} {r['cpu_ms']:>9.1f} {r['total_ms']:>9.1f} "
+              f"{100 * r['bytes'] / base['bytes']:>7.1f}% {100 * r['cpu_ms'] / max(base['cpu_ms'], 1e-9):>6.1f}%")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"args": vars(args), "results": resultados}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
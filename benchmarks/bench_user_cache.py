@@ -0,0 +1,57 @@
+# benchmarks/bench_user_cache.py
+"""
+Consultas SQL por request autenticado con y sin la caché de usuarios.
+
+Uso:
+    python benchmarks/bench_user_cache.py
+"""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app import create_app, db  # noqa: E402
+from app.identity import users  # noqa: E402
+from app.models import Usuario  # noqa: E402
+
+REQUESTS = 200
+RUTAS = ["/api/me", "/api/users/1"]
+
+
+def main():
+    app = create_app()
+    consultas = [0]
+    with app.app_context():
+        db.create_all()
+        db.session.add(Usuario(id=1, username="bench", email="bench@mail.com", role="admin"))
+        db.session.commit()
+        token = create_access_token(identity="1", additional_claims={"role": "admin"})
+        event.listen(db.engine, "before_cursor_execute",
+                     lambda *a: consultas.__setitem__(0, consultas[0] + 1))
+
+    cliente = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+    print(f"{'ruta':<16} {'sin caché':>10} {'con caché':>10}")
+    for ruta in RUTAS:
+        resultados = []
+        for con_cache in (False, True):
+            backend = users.backend
+            if not con_cache:
+                users.backend = None
+            consultas[0] = 0
+            for _ in range(REQUESTS):
+                assert cliente.get(ruta, headers=headers).status_code == 200
+            resultados.append(consultas[0] / REQUESTS)
+            users.backend = backend
+        print(f"{ruta:<16} {resultados[0]:>10.2f} {resultados[1]:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
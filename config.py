@@ -1,14 +1,105 @@
 import os
 from datetime import timedelta
 
+
+def engine_options(url: str) -> dict:
+    """Opciones de pool para MySQL; SQLite usa el pool por defecto de SQLAlchemy."""
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", 10)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 20)),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", 30)),       # segundos esperando conexión libre
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),     # antes del wait_timeout de MySQL
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "1") == "1",
+    }
+
+
 class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "clave-secreta")
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "mysql+pymysql://root:@localhost/proyecto_blog")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+
+    # Réplicas de lectura (URLs separadas por coma): los SELECT de los GET van a ellas
+    DATABASE_REPLICA_URLS = [u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+    SQLALCHEMY_BINDS = {
+        f"replica_{i}": {"url": url, **engine_options(url)} for i, url in enumerate(DATABASE_REPLICA_URLS)
+    }
 
     # JWT (consigna: 24 horas)
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "cambiame-por-env")
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
+    # Revocación al cambiar role/is_active: "memory" (por proceso, se recarga de la
+    # base cada REVOCATION_REFRESH segundos) o "redis" (compartida, usa CACHE_REDIS_URL)
+    REVOCATION_BACKEND = os.getenv("REVOCATION_BACKEND", "memory")
+    REVOCATION_REFRESH = int(os.getenv("REVOCATION_REFRESH", 30))
+
+    # Paginación por cursor de los listados
+    PAGINATION_DEFAULT_LIMIT = int(os.getenv("PAGINATION_DEFAULT_LIMIT", 20))
+    PAGINATION_MAX_LIMIT = int(os.getenv("PAGINATION_MAX_LIMIT", 100))
+
+    # Filas por lote en las respuestas en streaming (?stream=ndjson|json)
+    STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", 500))
+
+    # Alta en lote (/api/posts:batch, ...)
+    BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", 1000))
+    BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", 500))   # filas por transacción
+
+    # Caché de respuestas públicas: "memory" (LRU+TTL por proceso), "redis" o "none"
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_TTL = int(os.getenv("CACHE_TTL", 60))              # segundos
+    CACHE_MAXSIZE = int(os.getenv("CACHE_MAXSIZE", 1024))    # entradas (solo memory)
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    # Atraso tolerado de las réplicas: una respuesta leída de una réplica no se
+    # cachea si alguno de sus tags se invalidó hace menos de esto (0: siempre se cachea)
+    CACHE_REPLICA_LAG = int(os.getenv("CACHE_REPLICA_LAG", 5))  # segundos
+
+    # Caché de usuarios por proceso (LRU + TTL); la invalidación no llega a los
+    # otros workers, que ven el usuario viejo en /api/me hasta USER_CACHE_TTL
+    USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", 30))           # segundos
+    USER_CACHE_MAXSIZE = int(os.getenv("USER_CACHE_MAXSIZE", 10000))
+
+    # Búsqueda: "mysql" (FULLTEXT), "memory" (índice invertido por proceso) o "auto"
+    SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "auto")
+    # memory: cada cuántos segundos se revisa si otro worker cambió posts/comentarios (0: nunca)
+    SEARCH_REFRESH = int(os.getenv("SEARCH_REFRESH", 30))
+
+    # Hashing de contraseñas (bcrypt)
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))     # costo; al cambiarlo se rehashea en el login
+    HASH_WORKERS = int(os.getenv("HASH_WORKERS", os.cpu_count() or 2))
+    HASH_MAX_QUEUE = int(os.getenv("HASH_MAX_QUEUE", 32))   # pedidos en espera antes de responder 503
+    HASH_TIMEOUT = int(os.getenv("HASH_TIMEOUT", 10))       # segundos
+
+    # Rate limiting de /api/login y /api/register: "intentos/segundos" por IP y por email;
+    # "memory" (por proceso) o "redis" (compartido entre workers, usa CACHE_REDIS_URL)
+    RATELIMIT_ENABLED = os.getenv("RATELIMIT_ENABLED", "1") == "1"
+    RATELIMIT_BACKEND = os.getenv("RATELIMIT_BACKEND", "memory")
+    RATELIMIT_LOGIN_IP = os.getenv("RATELIMIT_LOGIN_IP", "20/60")
+    RATELIMIT_LOGIN_EMAIL = os.getenv("RATELIMIT_LOGIN_EMAIL", "5/300")
+    RATELIMIT_REGISTER_IP = os.getenv("RATELIMIT_REGISTER_IP", "5/3600")
+    RATELIMIT_REGISTER_EMAIL = os.getenv("RATELIMIT_REGISTER_EMAIL", "3/3600")
+
+    # Métricas: X-Query-Count y Server-Timing en cada respuesta (siempre activos con debug)
+    METRICS_DEBUG_HEADERS = os.getenv("METRICS_DEBUG_HEADERS", "0") == "1"
+
+    # Vigilancia de consultas: detector de N+1 (siempre activo con debug/testing),
+    # @query_budget ("raise" con TESTING, "log" en producción) y log de lentas
+    QUERY_WATCH = os.getenv("QUERY_WATCH", "0") == "1"
+    QUERY_BUDGET_MODE = os.getenv("QUERY_BUDGET_MODE", "")
+    N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", 5))
+    SLOW_QUERY_MS = int(os.getenv("SLOW_QUERY_MS", 200))
+
+    # Sincronización incremental (?updated_since=): días que se guardan los tombstones;
+    # un updated_since más viejo responde 410 y el cliente hace una sincronización completa
+    SYNC_TOMBSTONE_DAYS = int(os.getenv("SYNC_TOMBSTONE_DAYS", 90))
+
+    # Compresión de respuestas (gzip, y br si está instalado brotli): tamaño mínimo
+    # del cuerpo, nivel y cada cuántos bytes se hace flush en las respuestas en streaming
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", 1024))
+    COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", 6))
+    COMPRESS_STREAM_FLUSH = int(os.getenv("COMPRESS_STREAM_FLUSH", 64 * 1024))
+    COMPRESS_ENCODINGS = tuple(os.getenv("COMPRESS_ENCODINGS", "br,gzip").split(","))
 
     # (Opcional, pero útil)
     JSON_AS_ASCII = False           # para acentos/ñ en JSON
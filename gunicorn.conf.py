@@ -0,0 +1,24 @@
+# gunicorn.conf.py
+# gunicorn -c gunicorn.conf.py
+#
+# La app se carga y se precalienta una sola vez en el master (preload_app) y
+# los workers la heredan al forkear; cada worker descarta el pool de conexiones
+# heredado (ver app/preload.py).
+import os
+
+from app.preload import warm_up, after_fork
+
+wsgi_app = "run:app"
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", 2 * (os.cpu_count() or 1) + 1))
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+preload_app = True
+
+
+def when_ready(server):
+    # con preload_app la app ya está cargada; todavía no hay workers
+    warm_up(server.app.wsgi())
+
+
+def post_fork(server, worker):
+    after_fork(worker.app.wsgi())
@@ -0,0 +1,46 @@
+"""indices consultas frecuentes
+
+Revision ID: 3c9a1f5e7b20
+Revises: 7dbad860eb23
+Create Date: 2026-10-18 10:12:41.503218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9a1f5e7b20'
+down_revision = '7dbad860eb23'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.create_index('ix_posts_published_fecha', ['is_published', 'fecha_creacion', 'id'], unique=False)
+
+    with op.batch_alter_table('comentarios', schema=None) as batch_op:
+        batch_op.create_index('ix_comentarios_post_visible_fecha', ['post_id', 'is_visible', 'fecha_creacion'], unique=False)
+        batch_op.create_index('ix_comentarios_fecha_creacion', ['fecha_creacion'], unique=False)
+
+    with op.batch_alter_table('usuarios', schema=None) as batch_op:
+        batch_op.create_index('ix_usuarios_created_at', ['created_at'], unique=False)
+
+    with op.batch_alter_table('user_credentials', schema=None) as batch_op:
+        batch_op.create_index('ix_user_credentials_user_id', ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user_credentials', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_credentials_user_id')
+
+    with op.batch_alter_table('usuarios', schema=None) as batch_op:
+        batch_op.drop_index('ix_usuarios_created_at')
+
+    with op.batch_alter_table('comentarios', schema=None) as batch_op:
+        batch_op.drop_index('ix_comentarios_fecha_creacion')
+        batch_op.drop_index('ix_comentarios_post_visible_fecha')
+
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_posts_published_fecha')
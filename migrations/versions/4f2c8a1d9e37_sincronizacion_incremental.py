@@ -0,0 +1,58 @@
+"""sincronizacion incremental
+
+Revision ID: 4f2c8a1d9e37
+Revises: d7a3e9c41f56
+Create Date: 2026-10-18 16:20:44.102938
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f2c8a1d9e37'
+down_revision = 'd7a3e9c41f56'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=10), nullable=False),
+    sa.Column('object_id', sa.Integer(), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('tombstones', schema=None) as batch_op:
+        batch_op.create_index('ix_tombstones_kind_deleted', ['kind', 'deleted_at'], unique=False)
+        batch_op.create_index('ix_tombstones_post_deleted', ['post_id', 'deleted_at'], unique=False)
+
+    with op.batch_alter_table('comentarios', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    # Los comentarios existentes no se editaron nunca con la columna: parten de su fecha de creación
+    op.execute("UPDATE comentarios SET updated_at = fecha_creacion")
+    op.execute("UPDATE posts SET updated_at = fecha_creacion WHERE updated_at IS NULL")
+
+    with op.batch_alter_table('comentarios', schema=None) as batch_op:
+        batch_op.create_index('ix_comentarios_post_updated', ['post_id', 'updated_at', 'id'], unique=False)
+
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.create_index('ix_posts_updated_at', ['updated_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_posts_updated_at')
+
+    with op.batch_alter_table('comentarios', schema=None) as batch_op:
+        batch_op.drop_index('ix_comentarios_post_updated')
+        batch_op.drop_column('updated_at')
+
+    with op.batch_alter_table('tombstones', schema=None) as batch_op:
+        batch_op.drop_index('ix_tombstones_post_deleted')
+        batch_op.drop_index('ix_tombstones_kind_deleted')
+
+    op.drop_table('tombstones')
@@ -0,0 +1,52 @@
+"""contadores stats
+
+Revision ID: 8e4d2b7a9c13
+Revises: 3c9a1f5e7b20
+Create Date: 2026-10-18 11:40:05.227914
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4d2b7a9c13'
+down_revision = '3c9a1f5e7b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('contadores',
+    sa.Column('nombre', sa.String(length=30), nullable=False),
+    sa.Column('valor', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('nombre')
+    )
+    op.create_table('posts_por_dia',
+    sa.Column('dia', sa.Date(), nullable=False),
+    sa.Column('cantidad', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('dia')
+    )
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.create_index('ix_posts_fecha_creacion', ['fecha_creacion'], unique=False)
+
+    # Carga inicial desde las tablas existentes
+    op.execute(
+        "INSERT INTO contadores (nombre, valor) "
+        "SELECT 'posts', COUNT(*) FROM posts "
+        "UNION ALL SELECT 'comentarios', COUNT(*) FROM comentarios "
+        "UNION ALL SELECT 'usuarios', COUNT(*) FROM usuarios"
+    )
+    op.execute(
+        "INSERT INTO posts_por_dia (dia, cantidad) "
+        "SELECT DATE(fecha_creacion), COUNT(*) FROM posts "
+        "WHERE fecha_creacion IS NOT NULL GROUP BY DATE(fecha_creacion)"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_posts_fecha_creacion')
+
+    op.drop_table('posts_por_dia')
+    op.drop_table('contadores')
@@ -0,0 +1,54 @@
+"""extracto posts
+
+Revision ID: a83e5c1f2d94
+Revises: 4f2c8a1d9e37
+Create Date: 2026-10-18 17:05:12.481203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a83e5c1f2d94'
+down_revision = '4f2c8a1d9e37'
+branch_labels = None
+depends_on = None
+
+# Copia de app.models.extracto_de al momento de esta migración
+EXTRACTO_LARGO = 200
+
+
+def _extracto(texto):
+    plano = " ".join((texto or "").split())
+    if len(plano) <= EXTRACTO_LARGO:
+        return plano
+    corte = plano.rfind(" ", 0, EXTRACTO_LARGO)
+    return plano[:corte if corte > 0 else EXTRACTO_LARGO - 1] + "…"
+
+
+def upgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('extracto', sa.String(length=200), nullable=True))
+
+    # Backfill en lotes por id
+    posts = sa.table('posts', sa.column('id', sa.Integer), sa.column('contenido', sa.Text),
+                     sa.column('extracto', sa.String))
+    conn = op.get_bind()
+    ultimo = 0
+    while True:
+        filas = conn.execute(
+            sa.select(posts.c.id, posts.c.contenido).where(posts.c.id > ultimo).order_by(posts.c.id).limit(1000)
+        ).all()
+        if not filas:
+            break
+        conn.execute(
+            posts.update().where(posts.c.id == sa.bindparam('b_id')).values(extracto=sa.bindparam('b_extracto')),
+            [{"b_id": id_, "b_extracto": _extracto(contenido)} for id_, contenido in filas],
+        )
+        ultimo = filas[-1][0]
+
+
+def downgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_column('extracto')
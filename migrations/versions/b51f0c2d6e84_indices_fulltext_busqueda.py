@@ -0,0 +1,33 @@
+"""indices fulltext busqueda
+
+Revision ID: b51f0c2d6e84
+Revises: 8e4d2b7a9c13
+Create Date: 2026-10-18 13:02:47.691350
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b51f0c2d6e84'
+down_revision = '8e4d2b7a9c13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # En MySQL son índices FULLTEXT; en SQLite (desarrollo) quedan como índices comunes
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.create_index('ft_posts_titulo_contenido', ['titulo', 'contenido'], unique=False, mysql_prefix='FULLTEXT')
+
+    with op.batch_alter_table('comentarios', schema=None) as batch_op:
+        batch_op.create_index('ft_comentarios_texto', ['texto'], unique=False, mysql_prefix='FULLTEXT')
+
+
+def downgrade():
+    with op.batch_alter_table('comentarios', schema=None) as batch_op:
+        batch_op.drop_index('ft_comentarios_texto')
+
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_index('ft_posts_titulo_contenido')
@@ -0,0 +1,28 @@
+"""token version usuarios
+
+Revision ID: c4e7a2b9d051
+Revises: a83e5c1f2d94
+Create Date: 2026-10-18 18:02:37.615420
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e7a2b9d051'
+down_revision = 'a83e5c1f2d94'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('usuarios', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+        batch_op.create_index('ix_usuarios_token_version', ['token_version'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('usuarios', schema=None) as batch_op:
+        batch_op.drop_index('ix_usuarios_token_version')
+        batch_op.drop_column('token_version')
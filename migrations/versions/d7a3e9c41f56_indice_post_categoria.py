@@ -0,0 +1,26 @@
+"""indice post_categoria
+
+Revision ID: d7a3e9c41f56
+Revises: b51f0c2d6e84
+Create Date: 2026-10-18 14:21:09.318427
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7a3e9c41f56'
+down_revision = 'b51f0c2d6e84'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('post_categoria', schema=None) as batch_op:
+        batch_op.create_index('ix_post_categoria_categoria', ['categoria_id', 'post_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('post_categoria', schema=None) as batch_op:
+        batch_op.drop_index('ix_post_categoria_categoria')
@@ -0,0 +1,43 @@
+"""actividad posts
+
+Revision ID: e2b6f8d4a317
+Revises: c4e7a2b9d051
+Create Date: 2026-10-18 21:14:52.308117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b6f8d4a317'
+down_revision = 'c4e7a2b9d051'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('last_comment_at', sa.DateTime(), nullable=True))
+
+    # Carga inicial desde los comentarios visibles existentes
+    op.execute(
+        "UPDATE posts SET "
+        "comment_count = (SELECT COUNT(*) FROM comentarios c "
+        "WHERE c.post_id = posts.id AND c.is_visible = 1), "
+        "last_comment_at = (SELECT MAX(c.fecha_creacion) FROM comentarios c "
+        "WHERE c.post_id = posts.id AND c.is_visible = 1)"
+    )
+
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.create_index('ix_posts_published_activity', ['is_published', 'last_comment_at', 'id'], unique=False)
+        batch_op.create_index('ix_posts_published_comments', ['is_published', 'comment_count', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_posts_published_comments')
+        batch_op.drop_index('ix_posts_published_activity')
+        batch_op.drop_column('last_comment_at')
+        batch_op.drop_column('comment_count')
@@ -1,7 +1,6 @@
 # seed.py
 from app import create_app, db
 from app.models import Categoria, Usuario, UserCredentials
-from passlib.hash import bcrypt
 
 # Crear contexto de aplicación
 app = create_app()
@@ -40,17 +39,43 @@ def cargar_usuarios():
         if not existe:
             u = Usuario(username=username, email=email, role=rol)
             password_segura = pwd[:72]
-            cred = UserCredentials(usuario=u, password_hash=bcrypt.hash(pwd))
+            cred = UserCredentials(usuario=u, password_hash=UserCredentials.hash_pwd(pwd))
             db.session.add_all([u, cred])
     db.session.commit()
     print("✅ Usuarios de prueba creados correctamente.")
 
 
+# ================================
+#  DATOS SINTÉTICOS (carga / benchmarks)
+# ================================
+def parse_args():
+    import argparse
+    parser = argparse.ArgumentParser(description="Carga inicial y datos sintéticos.")
+    parser.add_argument("--sintetico", action="store_true", help="genera un dataset grande además de la carga inicial")
+    parser.add_argument("--usuarios", type=int, default=1000)
+    parser.add_argument("--posts", type=int, default=5000)
+    parser.add_argument("--comentarios", type=int, default=20000)
+    parser.add_argument("--anios", type=int, default=3, help="años que abarcan las fechas")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--batch", type=int, default=10000, help="filas por insert/commit")
+    return parser.parse_args()
+
+
 # ================================
 # 🚀 EJECUCIÓN PRINCIPAL
 # ================================
 if __name__ == "__main__":
+    args = parse_args()
     cargar_categorias()
     cargar_usuarios()
+    if args.sintetico:
+        from app.synthetic import generate
+        print("⏳ Generando datos sintéticos...")
+        try:
+            generate(usuarios=args.usuarios, posts=args.posts, comentarios=args.comentarios,
+                     anios=args.anios, semilla=args.semilla, batch=args.batch)
+        except ValueError as err:
+            raise SystemExit(f"❌ {err}")
+        print("✅ Datos sintéticos generados.")
     print("\n🌱 Base de datos inicializada correctamente.")
 
@@ -0,0 +1,28 @@
+# tests/conftest.py
+import os
+import sys
+
+# Antes de importar config: base en memoria, sin caché de respuestas y bcrypt barato
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL", "sqlite:///:memory:")
+os.environ["CACHE_BACKEND"] = "none"
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from app import create_app, db
+
+
+@pytest.fixture(scope="session")
+def app():
+    app = create_app()
+    app.config["TESTING"] = True   # QUERY_BUDGET_MODE=raise
+    with app.app_context():
+        db.create_all()
+        yield app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
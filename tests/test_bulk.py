@@ -0,0 +1,37 @@
+# tests/test_bulk.py
+"""POST /api/categories:batch cuando otro request crea el mismo nombre en el medio."""
+import pytest
+from sqlalchemy import event, false
+
+from app import db
+from app.bulk import bulk_create_categories
+from app.models import Categoria
+
+
+@pytest.fixture
+def carrera(app):
+    """
+    "Existente" ya está en la base, pero la lectura previa de bulk_create_categories
+    no la ve (como si otro request la hubiera creado justo después).
+    """
+    db.session.add(Categoria(nombre="Existente"))
+    db.session.commit()
+
+    def ocultar(state):
+        if state.is_select and state.statement.column_descriptions[0]["expr"] is Categoria.nombre:
+            return state.invoke_statement(statement=state.statement.where(false()))
+    event.listen(db.session, "do_orm_execute", ocultar)
+    yield
+    event.remove(db.session, "do_orm_execute", ocultar)
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+
+
+def test_nombre_creado_por_otro_request(app, carrera):
+    with app.test_request_context():
+        creados, errors = bulk_create_categories([{"nombre": "Nueva"}, {"nombre": "Existente"}, {"nombre": "Otra"}])
+    assert creados == 2
+    assert errors == {1: {"nombre": ["La categoría ya existe"]}}
+    filas = db.session.execute(db.select(Categoria.id, Categoria.nombre)).all()
+    assert sorted(nombre for _, nombre in filas) == ["Existente", "Nueva", "Otra"]
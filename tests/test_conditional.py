@@ -0,0 +1,27 @@
+# tests/test_conditional.py
+"""Last-Modified en GMT aunque las columnas guarden la hora local del servidor."""
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from app.conditional import validator_headers
+
+
+@pytest.fixture
+def hora_argentina(monkeypatch):
+    monkeypatch.setenv("TZ", "America/Argentina/Buenos_Aires")   # UTC-3, sin horario de verano
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_last_modified_naive_es_hora_local(hora_argentina):
+    headers = validator_headers("abc", datetime(2025, 1, 1, 12, 0))
+    assert headers["Last-Modified"] == "Wed, 01 Jan 2025 15:00:00 GMT"
+
+
+def test_last_modified_con_zona(hora_argentina):
+    headers = validator_headers("abc", datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc))
+    assert headers["Last-Modified"] == "Wed, 01 Jan 2025 12:00:00 GMT"
@@ -0,0 +1,31 @@
+# tests/test_explain.py
+"""
+Mismo chequeo que `flask explain-check`: sobre una base poblada con
+app/synthetic.py (y ANALYZE, para que el planner decida con estadísticas),
+ninguna consulta frecuente recorre la tabla entera ni ordena sin índice.
+"""
+import pytest
+
+from app import db
+from app.commands import hot_queries, explain
+from app.synthetic import generate
+
+
+@pytest.fixture(scope="module")
+def seeded(app):
+    generate(usuarios=200, posts=2000, comentarios=8000, log=lambda *_: None)
+    with db.engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    yield
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+
+
+def test_consultas_frecuentes_usan_indice(seeded):
+    fallas = {}
+    for nombre, stmt in hot_queries().items():
+        plan, problema = explain(stmt)
+        if problema is not None:
+            fallas[nombre] = (problema, plan)
+    assert not fallas, fallas
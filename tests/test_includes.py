@@ -0,0 +1,83 @@
+# tests/test_includes.py
+"""
+?include= no hace N+1: cada expansión agrega exactamente una consulta, sea
+cual sea el tamaño de la página. Cuenta con el contador por request de
+app/metrics.py (header X-Query-Count).
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.includes import POST_INCLUDES
+from app.metrics import metrics
+from app.models import Usuario, Post, Comentario, Categoria
+
+COMBINADO = ",".join(POST_INCLUDES)
+CASOS = [(inc, 1) for inc in POST_INCLUDES] + [(COMBINADO, len(POST_INCLUDES))]
+
+
+@pytest.fixture(scope="module")
+def posts(app):
+    """30 posts publicados, cada uno con una o dos categorías y de 0 a 3 comentarios."""
+    autor = Usuario(username="autor", email="autor@mail.com", role="user")
+    cats = [Categoria(nombre=f"Categoría {i}") for i in range(3)]
+    db.session.add_all([autor, *cats])
+    base = datetime(2025, 1, 1)
+    for i in range(30):
+        post = Post(titulo=f"Post {i}", contenido=f"contenido {i}", autor=autor,
+                    fecha_creacion=base + timedelta(hours=i))
+        post.categorias.extend(cats[:1 + i % 2])
+        post.comentarios.extend(Comentario(texto=f"c{j}", autor=autor) for j in range(i % 4))
+        db.session.add(post)
+    db.session.commit()
+    ids = list(db.session.scalars(db.select(Post.id).order_by(Post.id)))
+    db.session.remove()
+    yield ids
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+
+
+@pytest.fixture
+def queries(client, monkeypatch):
+    monkeypatch.setattr(metrics, "debug_headers", True)
+
+    def get(path):
+        resp = client.get(path)
+        assert resp.status_code == 200, resp.get_json()
+        return resp, int(resp.headers["X-Query-Count"])
+    return get
+
+
+@pytest.mark.parametrize("limit", [5, 20])
+def test_listado_sin_include(queries, posts, limit):
+    resp, n = queries(f"/api/posts?limit={limit}")
+    assert len(resp.get_json()["items"]) == limit
+    assert n == 1
+
+
+@pytest.mark.parametrize("limit", [5, 20])
+@pytest.mark.parametrize("include, extra", CASOS)
+def test_listado_una_consulta_por_expansion(queries, posts, limit, include, extra):
+    resp, n = queries(f"/api/posts?limit={limit}&include={include}")
+    items = resp.get_json()["items"]
+    assert len(items) == limit
+    for nombre in include.split(","):
+        assert all(nombre in item for item in items)
+    assert n == 1 + extra
+
+
+@pytest.mark.parametrize("include, extra", CASOS)
+def test_detalle_una_consulta_por_expansion(queries, posts, include, extra):
+    resp, n = queries(f"/api/posts/{posts[7]}?include={include}")
+    assert all(nombre in resp.get_json() for nombre in include.split(","))
+    assert n == 1 + extra
+
+
+def test_expansiones_correctas(queries, posts):
+    resp, _ = queries(f"/api/posts/{posts[7]}?include={COMBINADO}")
+    post = resp.get_json()
+    assert [c["nombre"] for c in post["categories"]] == ["Categoría 0", "Categoría 1"]
+    assert post["author"]["username"] == "autor"
+    assert post["comment_count"] == 3
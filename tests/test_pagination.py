@@ -0,0 +1,40 @@
+# tests/test_pagination.py
+"""Cursores adulterados: 400 con el mensaje de siempre, nunca un error del driver."""
+import base64
+import json
+from datetime import datetime
+
+import pytest
+
+
+def cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("query", [
+    {"cursor": cursor(["2020-01-01T00:00:00", {"a": 1}])},
+    {"cursor": cursor([["2020-01-01T00:00:00"], 1])},
+    {"cursor": cursor(["2020-01-01T00:00:00", "1"])},
+    {"cursor": cursor(["2020-01-01T00:00:00", True])},
+    {"cursor": cursor(["2020-01-01T00:00:00", None])},
+    {"cursor": cursor([1577836800, 1])},
+    {"cursor": cursor(["2020-01-01T00:00:00"])},
+    {"cursor": "no-es-base64-ni-json"},
+    {"cursor": cursor(["3", 1]), "sort": "comments"},
+    {"cursor": cursor([{}, 1]), "sort": "activity"},
+    {"cursor": cursor([1, 1]), "updated_since": datetime.now().replace(microsecond=0).isoformat()},
+])
+def test_cursor_adulterado(client, query):
+    resp = client.get("/api/posts", query_string=query)
+    assert resp.status_code == 400
+    assert resp.get_json() == {"msg": "Cursor inválido."}
+
+
+@pytest.mark.parametrize("query", [
+    {"cursor": cursor(["2020-01-01T00:00:00", 1])},
+    {"cursor": cursor([3, 1]), "sort": "comments"},
+    {"cursor": cursor([None, 1]), "sort": "activity"},
+])
+def test_cursor_valido(client, query):
+    resp = client.get("/api/posts", query_string=query)
+    assert resp.status_code == 200, resp.get_json()
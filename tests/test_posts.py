@@ -0,0 +1,10 @@
+# tests/test_posts.py
+"""Validación de parámetros del feed de posts."""
+import pytest
+
+
+@pytest.mark.parametrize("category", ["abc", "-1", "1.5", "²", "١"])
+def test_category_no_numerica(client, category):
+    resp = client.get("/api/posts", query_string={"category": category})
+    assert resp.status_code == 400
+    assert resp.get_json() == {"msg": "El parámetro category debe ser un id numérico."}
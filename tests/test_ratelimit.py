@@ -0,0 +1,76 @@
+# tests/test_ratelimit.py
+"""
+Rate limiting de login y registro (app/ratelimit.py): pasado el límite se
+responde 429 con Retry-After entero, sin ninguna consulta a la base ni bcrypt.
+"""
+import pytest
+
+from app import db
+from app.metrics import metrics
+from app.models import Usuario, UserCredentials
+from app.passwords import passwords
+from app.ratelimit import ratelimit
+
+
+@pytest.fixture
+def cuenta(app, monkeypatch):
+    monkeypatch.setattr(ratelimit, "enabled", True)
+    monkeypatch.setattr(metrics, "debug_headers", True)
+    ratelimit.backend.clear()
+    u = Usuario(username="ana", email="ana@mail.com", role="user")
+    db.session.add_all([u, UserCredentials(usuario=u, password_hash=passwords.hash("clave123"))])
+    db.session.commit()
+    yield
+    ratelimit.backend.clear()
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+
+
+@pytest.fixture
+def verificaciones(monkeypatch):
+    """Cuenta las llamadas a bcrypt."""
+    llamadas = []
+    verify = passwords.verify
+    monkeypatch.setattr(passwords, "verify", lambda *a: llamadas.append(a) or verify(*a))
+    return llamadas
+
+
+def login(client, email, ip, password="incorrecta"):
+    return client.post("/api/login", json={"email": email, "password": password},
+                       environ_base={"REMOTE_ADDR": ip})
+
+
+def test_rafaga_por_email(client, cuenta, verificaciones):
+    capacidad, periodo = ratelimit.limits[("login", "email")]
+    for i in range(capacidad):
+        # cada intento desde otra IP: solo cuenta el balde del email
+        assert login(client, "ana@mail.com", f"10.0.0.{i}").status_code == 401
+    assert len(verificaciones) == capacidad
+
+    resp = login(client, "ANA@mail.com", "10.0.1.1", password="clave123")   # mismo balde, normalizado
+    assert resp.status_code == 429
+    retry_after = resp.headers["Retry-After"]
+    assert retry_after.isdigit() and 1 <= int(retry_after) <= periodo
+    assert resp.headers["X-Query-Count"] == "0"
+    assert len(verificaciones) == capacidad   # bcrypt tampoco corrió
+
+    # otro email desde la misma IP no está limitado
+    assert login(client, "otro@mail.com", "10.0.1.1").status_code == 401
+
+
+def test_rafaga_por_ip_en_registro(client, cuenta):
+    capacidad, _ = ratelimit.limits[("register", "ip")]
+    for i in range(capacidad):
+        resp = client.post("/api/register", json={"username": f"usuario{i}", "email": f"usuario{i}@mail.com",
+                                                  "password": "clave123"},
+                           environ_base={"REMOTE_ADDR": "10.0.2.1"})
+        assert resp.status_code == 201, resp.get_json()
+
+    resp = client.post("/api/register", json={"username": "extra", "email": "extra@mail.com",
+                                               "password": "clave123"},
+                       environ_base={"REMOTE_ADDR": "10.0.2.1"})
+    assert resp.status_code == 429
+    assert resp.headers["Retry-After"].isdigit()
+    assert resp.headers["X-Query-Count"] == "0"
+    assert db.session.scalar(db.select(db.func.count()).select_from(Usuario).where(Usuario.username == "extra")) == 0
@@ -0,0 +1,47 @@
+# tests/test_replicas.py
+"""Ruteo a réplicas (app/routing.py) y su interacción con la caché de respuestas."""
+import time
+
+import pytest
+
+from app import db, routing
+from app.cache import cache, MemoryBackend
+from app.models import Post
+
+
+@pytest.fixture
+def replicas(monkeypatch):
+    engines = [f"replica_{i}" for i in range(8)]   # get_bind solo las elige, no las usa
+    monkeypatch.setattr(routing, "replica_engines", lambda _: engines)
+    yield engines
+    db.session.remove()
+
+
+def test_una_replica_por_sesion(app, replicas):
+    with app.test_request_context("/api/posts"):
+        elegidas = {db.session.get_bind(clause=db.select(Post)) for _ in range(20)}
+        assert len(elegidas) == 1 and elegidas <= set(replicas)
+
+
+def test_despues_de_escribir_lee_del_primario(app, replicas):
+    with app.test_request_context("/api/posts"):
+        db.session.get_bind(clause=db.update(Post))
+        assert db.session.get_bind(clause=db.select(Post)) is db.engine
+
+
+@pytest.fixture
+def memoria(app, monkeypatch):
+    monkeypatch.setattr(cache, "backend", MemoryBackend(100, 60))
+    monkeypatch.setattr(cache, "replica_lag", 5)
+
+
+def test_no_cachea_lecturas_de_replica_recien_invalidadas(app, replicas, memoria, monkeypatch):
+    cache.invalidate("posts:list")
+    with app.test_request_context("/api/posts"):
+        assert not cache._maybe_stale(["posts:list"])        # todavía no leyó de una réplica
+        db.session.get_bind(clause=db.select(Post))
+        assert cache._maybe_stale(["posts:list"])
+        assert not cache._maybe_stale(["categories"])
+        ahora = time.time()
+        monkeypatch.setattr(time, "time", lambda: ahora + 6)
+        assert not cache._maybe_stale(["posts:list"])
@@ -0,0 +1,102 @@
+# tests/test_revocation.py
+"""
+Revocación de JWT (app/revocation.py): bajar de rol o desactivar a un usuario
+invalida sus tokens anteriores; el login siguiente da uno válido y un cambio
+que se deshace con rollback no revoca nada.
+"""
+import pytest
+
+from app import db
+from app.models import Usuario, UserCredentials
+from app.passwords import passwords
+from app.ratelimit import ratelimit
+from app.revocation import revocation, MemoryVersions
+
+REVOCADA = {"msg": "La sesión fue revocada. Volvé a iniciar sesión."}
+
+
+@pytest.fixture
+def usuarios(app, monkeypatch):
+    """id por username: un admin y una moderadora, con el store de versiones vacío."""
+    monkeypatch.setattr(revocation, "store", MemoryVersions())
+    monkeypatch.setattr(revocation, "_loaded_at", None)
+    ratelimit.backend.clear()
+    ids = {}
+    for username, role in (("admin", "admin"), ("ana", "moderator")):
+        u = Usuario(username=username, email=f"{username}@mail.com", role=role)
+        db.session.add_all([u, UserCredentials(usuario=u, password_hash=passwords.hash("clave123"))])
+        db.session.flush()
+        ids[username] = u.id
+    db.session.commit()
+    yield ids
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+
+
+def login(client, username):
+    resp = client.post("/api/login", json={"email": f"{username}@mail.com", "password": "clave123"})
+    assert resp.status_code == 200, resp.get_json()
+    return {"Authorization": f"Bearer {resp.get_json()['access_token']}"}
+
+
+def patch(client, admin, user_id, **body):
+    resp = client.patch(f"/api/users/{user_id}", json=body, headers=admin)
+    assert resp.status_code == 200, resp.get_json()
+
+
+def test_bajar_de_rol_revoca_el_token(client, usuarios):
+    admin, ana = login(client, "admin"), login(client, "ana")
+    assert client.get("/api/reviews", headers=ana).status_code == 200
+
+    patch(client, admin, usuarios["ana"], role="user")
+    for path in ("/api/reviews", "/api/me"):
+        resp = client.get(path, headers=ana)
+        assert (resp.status_code, resp.get_json()) == (401, REVOCADA)
+
+    nuevo = login(client, "ana")
+    assert client.get("/api/me", headers=nuevo).get_json()["role"] == "user"
+    assert client.get("/api/reviews", headers=nuevo).status_code == 403
+    assert client.get("/api/users", headers=admin).status_code == 200   # los demás siguen
+
+
+def test_desactivar_revoca_el_token(client, usuarios):
+    admin, ana = login(client, "admin"), login(client, "ana")
+    assert client.delete(f"/api/users/{usuarios['ana']}", headers=admin).status_code == 204
+
+    assert client.get("/api/me", headers=ana).status_code == 401
+    resp = client.post("/api/login", json={"email": "ana@mail.com", "password": "clave123"})
+    assert resp.status_code == 401
+
+    patch(client, admin, usuarios["ana"], is_active=True)
+    assert client.get("/api/me", headers=ana).status_code == 401     # reactivar no revive el token viejo
+    assert client.get("/api/me", headers=login(client, "ana")).status_code == 200
+
+
+def test_mismo_valor_no_revoca(client, usuarios):
+    admin, ana = login(client, "admin"), login(client, "ana")
+    patch(client, admin, usuarios["ana"], role="moderator", is_active=True)
+    assert client.get("/api/me", headers=ana).status_code == 200
+
+
+def test_rollback_no_sube_la_version(client, usuarios):
+    ana = login(client, "ana")
+    u = db.session.get(Usuario, usuarios["ana"])
+    u.role = "user"
+    db.session.flush()
+    db.session.rollback()
+
+    assert revocation.store.get(usuarios["ana"]) == 0
+    assert db.session.get(Usuario, usuarios["ana"]).token_version == 0
+    assert client.get("/api/me", headers=ana).status_code == 200
+
+
+def test_otro_worker_carga_la_version_de_la_base(client, usuarios, monkeypatch):
+    admin, ana = login(client, "admin"), login(client, "ana")
+    patch(client, admin, usuarios["ana"], role="user")
+
+    # worker que no confirmó el cambio: arranca sin versiones y las lee de la base
+    monkeypatch.setattr(revocation, "store", MemoryVersions())
+    monkeypatch.setattr(revocation, "_loaded_at", None)
+    assert client.get("/api/me", headers=ana).status_code == 401
+    assert client.get("/api/me", headers=admin).status_code == 200
@@ -0,0 +1,45 @@
+# tests/test_search.py
+"""
+El índice en memoria ve lo que escribe otro worker: un insert que no pasa por
+la sesión de este proceso aparece después de SEARCH_REFRESH segundos.
+"""
+import pytest
+
+from app import db
+from app.models import Usuario, Post
+from app.search import search_index
+
+
+@pytest.fixture
+def autor(app):
+    u = Usuario(username="autor", email="autor@mail.com", role="user")
+    db.session.add(u)
+    db.session.commit()
+    yield u.id
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+    search_index.reset()
+
+
+def otro_worker(autor, titulo):
+    """Insert en otra conexión: no dispara los listeners de la sesión."""
+    with db.engine.begin() as conn:
+        conn.execute(db.insert(Post), {"titulo": titulo, "contenido": "texto", "usuario_id": autor})
+
+
+def buscar(client, q):
+    resp = client.get(f"/api/search?q={q}")
+    assert resp.status_code == 200, resp.get_json()
+    return [(r["type"], r["data"]["titulo"]) for r in resp.get_json()["items"]]
+
+
+def test_reconstruye_con_cambios_de_otro_worker(client, autor, monkeypatch):
+    monkeypatch.setattr(search_index, "refresh", 30)
+    search_index.reset()
+    buscar(client, "zanahoria")
+    otro_worker(autor, "zanahoria")
+
+    assert buscar(client, "zanahoria") == []   # todavía dentro del intervalo
+    monkeypatch.setattr(search_index, "refresh", 0.0001)
+    assert buscar(client, "zanahoria") == [("post", "zanahoria")]
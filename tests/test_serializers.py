@@ -0,0 +1,91 @@
+# tests/test_serializers.py
+"""
+Paridad de los RowEncoder (app/serializers.py) con los Schema de marshmallow:
+mismo dict y mismos bytes de JSON que Schema().dump() sobre el objeto ORM.
+"""
+from datetime import datetime
+
+import pytest
+
+from app import db
+from app.models import Usuario, Post, Comentario, Categoria
+from app.schemas import UsuarioSchema, PostSchema, ComentarioSchema, CategoriaSchema
+from app.serializers import usuario_encoder, post_encoder, comentario_encoder, categoria_encoder
+
+TEXTO = "Ñandú en el café ☕ — “comillas”, \\barra\\ y salto\nde línea   😀"
+POST_OPCIONALES = ("extracto", "comment_count", "last_comment_at")
+
+
+@pytest.fixture(scope="module")
+def datos(app):
+    autor = Usuario(username="josé_ñ", email="jose@mail.com", role="moderator", is_active=True)
+    sin_fecha = Usuario(username="sin_fecha", email="sf@mail.com", role="user", is_active=False)
+    db.session.add_all([autor, sin_fecha, Categoria(nombre="Categoría ñ")])
+    db.session.flush()
+    posts = [
+        Post(titulo=TEXTO[:50], contenido=TEXTO * 20, usuario_id=autor.id,
+             fecha_creacion=datetime(2025, 3, 4, 5, 6, 7, 890123)),
+        Post(titulo="borrador", contenido="x", usuario_id=autor.id, is_published=False),
+    ]
+    db.session.add_all(posts)
+    db.session.flush()
+    db.session.add_all([
+        Comentario(texto=TEXTO, usuario_id=autor.id, post_id=posts[0].id),
+        Comentario(texto="oculto", usuario_id=sin_fecha.id, post_id=posts[0].id, is_visible=False),
+    ])
+    # fechas NULL (los defaults de columna se aplican aunque el atributo sea None)
+    db.session.execute(db.update(Usuario).where(Usuario.id == sin_fecha.id).values(created_at=None))
+    db.session.execute(db.update(Post).where(Post.id == posts[1].id).values(fecha_creacion=None, updated_at=None))
+    db.session.execute(db.update(Comentario).where(Comentario.texto == "oculto")
+                       .values(fecha_creacion=None, updated_at=None))
+    db.session.commit()
+    yield
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+
+
+def _rows(encoder, model):
+    return db.session.execute(encoder.select().order_by(model.id)).all()
+
+
+def _objs(model):
+    return db.session.scalars(db.select(model).order_by(model.id)).all()
+
+
+def _assert_parity(app, encoder, schema, model):
+    rows, objs = _rows(encoder, model), _objs(model)
+    assert rows, "sin filas para comparar"
+    esperado = schema.dump(objs, many=True)
+    assert encoder.dump_many(rows) == esperado
+    assert [encoder.dump(r) for r in rows] == esperado
+    assert app.json.dumps(encoder.dump_many(rows)) == app.json.dumps(esperado)
+
+
+@pytest.mark.parametrize("encoder, schema, model", [
+    (usuario_encoder, UsuarioSchema(), Usuario),
+    (post_encoder, PostSchema(exclude=POST_OPCIONALES), Post),
+    (post_encoder.only(post_encoder.available), PostSchema(), Post),
+    (post_encoder.only(("titulo", "extracto")), PostSchema(only=("id", "titulo", "extracto")), Post),
+    (post_encoder.only(("comment_count", "last_comment_at")),
+     PostSchema(only=("id", "comment_count", "last_comment_at")), Post),
+    (comentario_encoder, ComentarioSchema(), Comentario),
+    (comentario_encoder.only(("texto",)), ComentarioSchema(only=("id", "texto")), Comentario),
+    (categoria_encoder, CategoriaSchema(), Categoria),
+], ids=["usuario", "post", "post+opcionales", "post:extracto", "post:contadores",
+        "comentario", "comentario:texto", "categoria"])
+def test_encoder_igual_al_schema(app, datos, encoder, schema, model):
+    _assert_parity(app, encoder, schema, model)
+
+
+def test_casos_borde_presentes(app, datos):
+    # Las comparaciones de arriba cubren fechas None y texto no ASCII
+    assert db.session.scalar(db.select(Post.fecha_creacion).where(Post.titulo == "borrador")) is None
+    assert db.session.scalar(db.select(Usuario.created_at).where(Usuario.username == "sin_fecha")) is None
+    assert db.session.scalar(db.select(Post.last_comment_at).where(Post.titulo == "borrador")) is None
+    assert any(c.texto == TEXTO for c in _objs(Comentario))
+
+
+def test_default_del_post_excluye_opcionales():
+    assert not set(POST_OPCIONALES) & set(post_encoder.names)
+    assert set(POST_OPCIONALES) <= set(post_encoder.available)
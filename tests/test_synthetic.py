@@ -0,0 +1,44 @@
+# tests/test_synthetic.py
+"""app/synthetic.py: argumentos inválidos y corridas repetidas sobre la misma base."""
+import pytest
+
+from app import db
+from app.models import Usuario, Post, Comentario
+from app.synthetic import generate
+
+
+@pytest.fixture
+def base(app):
+    yield
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"usuarios": 5, "posts": 0, "comentarios": 10},
+    {"usuarios": 0, "posts": 5, "comentarios": 0},
+    {"usuarios": -1, "posts": 0, "comentarios": 0},
+    {"usuarios": 5, "posts": 5, "comentarios": 5, "batch": 0},
+])
+def test_argumentos_invalidos(base, kwargs):
+    with pytest.raises(ValueError):
+        generate(log=lambda *_: None, **kwargs)
+    assert db.session.scalar(db.select(db.func.count()).select_from(Usuario)) == 0
+
+
+def test_dos_corridas_no_chocan(base):
+    db.session.add(Usuario(username="user1", email="user1@example.com", role="user"))
+    db.session.commit()
+    for semilla in (1, 1):
+        generate(usuarios=5, posts=10, comentarios=20, semilla=semilla, log=lambda *_: None)
+    contar = lambda m: db.session.scalar(db.select(db.func.count()).select_from(m))
+    assert (contar(Usuario), contar(Post), contar(Comentario)) == (11, 20, 40)
+
+
+def test_prefijo_ocupado(base):
+    # el primer id libre es 2, así que esta corrida usaría sint2_0
+    db.session.add(Usuario(id=1, username="sint2_0", email="sint@mail.com", role="user"))
+    db.session.commit()
+    with pytest.raises(ValueError, match="sint2_"):
+        generate(usuarios=3, posts=0, comentarios=0, log=lambda *_: None)